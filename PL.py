@@ -1,5 +1,6 @@
 import streamlit as st
-from PIL import Image
+
+from analytics import warmup
 
 # Set page configuration
 st.set_page_config(
@@ -9,6 +10,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Load what the other pages need while the visitor is on the landing page
+# (a no-op after the first run; serve.py starts it before the first request)
+warmup.start()
+
 # Premier League colors
 PL_PRIMARY_COLOR = "#37003C"
 PL_HOVER_COLOR = "#500050"
@@ -47,6 +52,8 @@ with col1:
         st.switch_page("pages/Team_Dashboard.py")
     if st.button("🔍 Player Analysis"):
         st.switch_page("pages/Player_Analysis.py")
+    if st.button("💷 Market Analysis"):
+        st.switch_page("pages/Market_Analysis.py")
 
 
 
@@ -56,6 +63,8 @@ with col2:
 
     if st.button("📊 Player Comparison"):
         st.switch_page("pages/Player_Comparison.py")
+    if st.button("🏆 League Overview"):
+        st.switch_page("pages/League_Overview.py")
 
 
 
@@ -0,0 +1 @@
+# Shared data and analytics helpers used by the Streamlit pages and data scripts.
@@ -0,0 +1,315 @@
+"""
+Read-only JSON API over the analytics used by the pages.
+
+Serves the same numbers the dashboards show, computed by the same code
+(analytics/profiles.py, tots.py, team_data.py):
+
+    GET /v1/version                    dataset version
+    GET /v1/teams                      teams with their final KPIs
+    GET /v1/teams/<team>               KPIs and memorable match card
+    GET /v1/teams/<team>/rounds        per-round season frame
+    GET /v1/players?q=<name>&limit=10  fuzzy player search (limit 1-50)
+    GET /v1/players/<id>               key metrics with percentiles, radar
+    GET /v1/tots                       Team Of The Season
+    GET /v1/tots/scores                subgroup leaderboards (0-10 scores)
+    GET /v1/caches                     hit/miss/eviction counts of this server's caches
+
+<team> is any known spelling of a team name ("Arsenal", "manchester_united", ...).
+
+Every response carries an ETag tied to the data version (the content hashes
+of the input files, see analytics/manifest.py), so clients revalidate with
+If-None-Match and get 304 until the data changes. Successful responses are
+cached per data version, already serialised and gzipped, so a repeated
+lookup is a dictionary hit. The datasets come from the shared store when a
+current snapshot is published (see analytics/store.py), otherwise they are
+built from the CSVs; a rewritten input file or a newly published snapshot is
+picked up within a second.
+
+Usage:
+    python -m analytics.api [--host 127.0.0.1] [--port 8502]
+"""
+import argparse
+import gzip
+import json
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from analytics import caches, store, tots
+from analytics.export import json_default
+from analytics.profiles import player_profile
+from analytics.search import NameIndex
+from analytics.team_data import (
+    MEMORABLE_PATH, load_memorable, memorable_performance, season_frame, season_metrics, team_frame
+)
+from analytics.teams import TEAM_NAMES, team_name
+
+CACHE_ENTRIES = 4096
+GZIP_MIN_BYTES = 1024
+# How often a request may look for a newly published dataset version
+VERSION_CHECK_SECONDS = 1.0
+# Most results a `limit` query parameter can ask for
+MAX_LIMIT = 50
+
+
+class NotFound(Exception):
+    pass
+
+
+def _records(df):
+    """Rows as dicts with None for missing values (NaN is not JSON)."""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def _limit(query, default=10):
+    """The `limit` query parameter, 1 to MAX_LIMIT (ValueError, so a 400, otherwise)."""
+    value = query.get('limit', [str(default)])[0]
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError(f'limit must be an integer, got {value!r}') from None
+    if limit < 1:
+        raise ValueError(f'limit must be at least 1, got {limit}')
+    return min(limit, MAX_LIMIT)
+
+
+def data_version():
+    """Version of everything the API serves: the snapshot inputs and code, and the memorable matches."""
+    return store.input_version(store.input_paths() + store.SNAPSHOT_CODE + [MEMORABLE_PATH])
+
+
+class Engine:
+    """The datasets of one version and the lookups the API serves from them."""
+
+    def __init__(self, published=None):
+        if published is not None:
+            datasets = {name: store.attach(name, published) for name in ('players', 'teams', 'percentiles', 'tots_scores')}
+        else:
+            datasets, _ = store.build_datasets()
+        self.version = data_version()
+        self.players = players = datasets['players']
+        self.teams = datasets['teams']
+        self.pcts = datasets['percentiles']
+        self.tots_ranked = tots.ranked_scores(datasets['tots_scores'])
+        self.memorable = load_memorable()
+        self.index = NameIndex(players['Player Name'], players.index)
+
+    def _season(self, team):
+        try:
+            name = team_name(team)
+        except KeyError:
+            raise NotFound(f'Unknown team: {team}') from None
+        return name, season_frame(team_frame(self.teams, name))
+
+    def version_info(self):
+        return {'version': self.version, 'players': len(self.players), 'teams': len(TEAM_NAMES)}
+
+    def team_list(self):
+        out = []
+        for name in TEAM_NAMES:
+            _, df = self._season(name)
+            out.append({'team': name, **dict(season_metrics(df.iloc[-1]))})
+        return sorted(out, key=lambda t: t['League Position'])
+
+    def team(self, team):
+        name, df = self._season(team)
+        card = memorable_performance(self.memorable, name).drop(labels='TeamId').to_dict()
+        card['xgd'] = round(card['xg'] - card['xga'], 2)
+        return {'team': name, 'kpis': dict(season_metrics(df.iloc[-1])), 'memorable': card}
+
+    def team_rounds(self, team):
+        name, df = self._season(team)
+        return {'team': name, 'rounds': _records(df)}
+
+    def search(self, query, limit=10):
+        if limit < 1:
+            raise ValueError(f'limit must be at least 1, got {limit}')
+        ids = self.index.search(query, limit=min(limit, MAX_LIMIT))
+        rows = self.players.loc[ids]
+        return [
+            {'id': int(i), 'name': row['Player Name'], 'club': row['Club'], 'position': row['PosCat']}
+            for i, row in rows.iterrows()
+        ]
+
+    def player(self, player_id):
+        try:
+            row = self.players.loc[int(player_id)]
+        except (KeyError, ValueError):
+            raise NotFound(f'Unknown player: {player_id}') from None
+        return player_profile(row, self.pcts)
+
+    def tots_team(self):
+        roster = tots.pick_team(self.players, ranked=self.tots_ranked)
+        return {'formation': '4-2-3-1', 'roster': [{'role': role, 'player': name} for role, name in roster]}
+
+    def tots_scores(self, limit=10):
+        return {
+            group: [{'id': int(i), 'player': self.players.at[i, 'Player Name'], 'score': score} for i, score in ranked[:limit]]
+            for group, ranked in self.tots_ranked.items()
+        }
+
+
+# Path pattern -> handler(engine, match, query); paths are matched without a trailing slash
+ROUTES = [
+    (re.compile(r'/v1/version'), lambda e, m, q: e.version_info()),
+    (re.compile(r'/v1/teams'), lambda e, m, q: e.team_list()),
+    (re.compile(r'/v1/teams/([^/]+)'), lambda e, m, q: e.team(m[1])),
+    (re.compile(r'/v1/teams/([^/]+)/rounds'), lambda e, m, q: e.team_rounds(m[1])),
+    (re.compile(r'/v1/players'), lambda e, m, q: e.search(q.get('q', [''])[0], _limit(q))),
+    (re.compile(r'/v1/players/([^/]+)'), lambda e, m, q: e.player(m[1])),
+    (re.compile(r'/v1/tots'), lambda e, m, q: e.tots_team()),
+    (re.compile(r'/v1/tots/scores'), lambda e, m, q: e.tots_scores()),
+]
+
+
+class ResponseCache:
+    """LRU of serialised responses keyed by (version, path and query)."""
+
+    def __init__(self, entries=CACHE_ENTRIES):
+        self.entries = entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = caches.register('api:responses', 'response')
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+        self.stats.miss() if value is None else self.stats.hit()
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            evicted = 0
+            while len(self._data) > self.entries:
+                self._data.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self.stats.evict(evicted)
+
+
+class Service:
+    """The current engine (reloaded when a new version is published) and the response cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine = None
+        self._checked = 0.0
+        self.cache = ResponseCache()
+
+    def engine(self):
+        now = time.monotonic()
+        if self._engine is not None and now - self._checked < VERSION_CHECK_SECONDS:
+            return self._engine
+        with self._lock:
+            if self._engine is None or data_version() != self._engine.version:
+                # Attach the published snapshot if it is current, else build from the CSVs
+                self._engine = Engine(store.fresh_version())
+            self._checked = now
+            return self._engine
+
+    def respond(self, target):
+        """(status, etag, body, gzipped body or None) for a GET of `target`."""
+        engine = self.engine()
+        etag = f'"{engine.version}"'
+        key = (engine.version, target)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return (200, etag, *cached)
+
+        url = urlsplit(target)
+        path = unquote(url.path).rstrip('/')
+        for pattern, handler in ROUTES:
+            match = pattern.fullmatch(path)
+            if match:
+                break
+        else:
+            return 404, None, json.dumps({'error': f'No route for {path}'}).encode(), None
+        try:
+            payload = handler(engine, match, parse_qs(url.query))
+        except NotFound as e:
+            return 404, None, json.dumps({'error': str(e)}).encode(), None
+        except ValueError as e:
+            return 400, None, json.dumps({'error': str(e)}).encode(), None
+
+        body = json.dumps(payload, default=json_default, ensure_ascii=False).encode()
+        compressed = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+        self.cache.put(key, (body, compressed))
+        return 200, etag, body, compressed
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # keep-alive
+    # Headers and body are separate writes; with Nagle on, every keep-alive
+    # response waits ~40 ms for the client's delayed ACK
+    disable_nagle_algorithm = True
+    service = None
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, b'{"status": "ok"}')
+            return
+        if self.path == '/v1/caches':
+            # Live counters: never served from the response cache
+            self._send(200, json.dumps(caches.rows()).encode())
+            return
+        status, etag, body, compressed = self.service.respond(self.path)
+        if etag is not None and etag in self.headers.get('If-None-Match', ''):
+            self._send(304, b'', etag)
+        elif compressed is not None and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            self._send(status, compressed, etag, gzipped=True)
+        else:
+            self._send(status, body, etag)
+
+    def _send(self, status, body, etag=None, gzipped=False):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Vary', 'Accept-Encoding')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(host='127.0.0.1', port=8502):
+    """Loads the datasets, then starts the server in a background thread and returns it."""
+    service = Service()
+    service.engine()
+    handler = type('Handler', (APIHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args(argv)
+
+    server = serve(args.host, args.port)
+    print(f'Analytics API on http://{args.host}:{server.server_port}/v1')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Role archetypes: players clustered on their per-90 profile within a position.
+
+PosCat puts a ball-playing centre-back and a stopper in the same pool. This
+stage splits every position into a few archetypes by k-means on
+standardised per-90 features, so percentiles can also be
+ranked against players who play the same role. It runs offline in
+data/prepare_players_data.py and is stored as the Archetype column of the
+player table.
+
+The k-means is mini-batch (Sculley, "Web-scale k-means clustering", 2010):
+every step assigns a random batch to its nearest centres and moves each
+centre towards its batch mean with a step of 1 / (points it has seen). The
+cost per step does not grow with the table, so 100k players cluster in
+about a second (benchmarks/archetypes.py). Each archetype is named after
+the two features its centre stands out on most among the position's
+NAMING_STATS, the stats that describe a role in that position.
+
+Usage:
+    python -m analytics.archetypes      archetype sizes of the current player table
+"""
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analytics.percentiles import numeric_values
+
+# Per-90 counts each position is clustered on. Success rates are left out:
+# they say how well a player does things, not which things their role asks for.
+OUTFIELD_FEATURES = [
+    'Goals', 'Assists', 'Shots', 'Touches', 'Passes', 'Through Balls', 'Crosses', 'Progressive Carries',
+    'fThird Passes', 'Tackles', 'Interceptions', 'Blocks', 'Clearances', 'Possession Won',
+    'Ground Duels', 'Aerial Duels',
+]
+FEATURES = {
+    'Goalkeeper': ['Saves', 'Punches', 'High Claims', 'Goals Prevented'],
+    'Defender': OUTFIELD_FEATURES,
+    'Midfielder': OUTFIELD_FEATURES,
+    'Forward': OUTFIELD_FEATURES,
+}
+
+# Features an archetype of each position can be named after. Clustering
+# uses all of FEATURES, but a forward who clears a few more balls than the
+# other forwards is not a 'Clearances' forward.
+NAMING_STATS = {
+    'Goalkeeper': ['Saves', 'Punches', 'High Claims', 'Goals Prevented'],
+    'Defender': [
+        'Tackles', 'Interceptions', 'Blocks', 'Clearances', 'Aerial Duels', 'Possession Won',
+        'Passes', 'Progressive Carries', 'Crosses',
+    ],
+    'Midfielder': [
+        'Goals', 'Assists', 'Shots', 'Passes', 'Through Balls', 'fThird Passes', 'Progressive Carries',
+        'Tackles', 'Interceptions', 'Possession Won', 'Ground Duels',
+    ],
+    'Forward': [
+        'Goals', 'Assists', 'Shots', 'Through Balls', 'Crosses', 'Progressive Carries',
+        'Aerial Duels', 'Ground Duels', 'Possession Won',
+    ],
+}
+
+# The source only has passing, carrying and duel stats for some players
+# (the rest read 0). Outfield players without passes are not clustered:
+# their archetype is '<position>: Limited data'.
+PROFILE_STAT = 'Passes'
+
+# Archetypes per position
+CLUSTERS = {'Goalkeeper': 2, 'Defender': 4, 'Midfielder': 4, 'Forward': 3}
+
+# Only players with this many minutes shape the clusters (a few cameos are
+# not a profile); everyone is then assigned to the nearest archetype
+MIN_MINUTES = 450
+
+BATCH_SIZE = 1024
+STEPS = 100
+# Independent starts; the one with the lowest within-cluster distance wins
+STARTS = 3
+SEED = 0
+
+
+def feature_matrix(df, features):
+    """
+    log(1 + per-90 value) of `features` for every row of the player table.
+    The log keeps a few extreme rates (a goal in a ten-minute cameo) from
+    deciding the clusters.
+    """
+    minutes = df['Minutes'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        X = np.column_stack([numeric_values(df[f]).to_numpy(dtype=float) / minutes * 90 for f in features])
+    return np.log1p(np.where(np.isfinite(X), np.maximum(X, 0), 0.0))
+
+
+def _sq_distances(X, centers):
+    return (X * X).sum(1)[:, None] - 2 * X @ centers.T + (centers * centers).sum(1)[None, :]
+
+
+def _init_centers(X, k, rng):
+    """k-means++: each new centre drawn with probability proportional to squared distance."""
+    centers = [X[rng.integers(len(X))]]
+    for _ in range(1, k):
+        d = np.maximum(_sq_distances(X, np.array(centers)).min(1), 0)
+        centers.append(X[rng.choice(len(X), p=d / d.sum())] if d.sum() > 0 else X[rng.integers(len(X))])
+    return np.array(centers)
+
+
+def minibatch_kmeans(X, k, batch_size=BATCH_SIZE, steps=STEPS, starts=STARTS, seed=SEED):
+    """Centres (k x features) of `X` from mini-batch k-means; deterministic for a given seed."""
+    rng = np.random.default_rng(seed)
+    best, best_inertia = None, np.inf
+    for _ in range(starts):
+        sample = X[rng.choice(len(X), min(len(X), 10 * batch_size), replace=False)]
+        centers = _init_centers(sample, k, rng)
+        seen = np.zeros(k)
+        for _ in range(steps):
+            batch = X[rng.integers(0, len(X), min(batch_size, len(X)))]
+            labels = _sq_distances(batch, centers).argmin(1)
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, batch)
+            moved = counts > 0
+            seen[moved] += counts[moved]
+            # Same as one 1/seen step per point, applied to the batch mean at once
+            rate = counts[moved] / seen[moved]
+            centers[moved] += rate[:, None] * (sums[moved] / counts[moved, None] - centers[moved])
+        inertia = _sq_distances(sample, centers).min(1).sum()
+        if inertia < best_inertia:
+            best, best_inertia = centers, inertia
+    return best
+
+
+def _names(position, centers, features):
+    """
+    'Defender: Crosses & Tackles' for each centre: the two of the position's
+    NAMING_STATS it is highest on compared with the position's other centres.
+    """
+    naming = [i for i, f in enumerate(features) if f in NAMING_STATS[position]]
+    names = []
+    for center in centers - centers.mean(0):
+        top = [features[naming[i]] for i in np.argsort(-center[naming], kind='stable')[:2]]
+        name = f"{position}: {' & '.join(top)}"
+        names.append(name if name not in names else f'{name} ({len(names) + 1})')
+    return names
+
+
+def invalid_names(labels):
+    """
+    Archetype labels naming a stat outside their position's NAMING_STATS
+    (or an unknown position), e.g. from a player table built before the
+    naming rules changed.
+    """
+    bad = []
+    for label in pd.unique(pd.Series(labels, dtype=object)):
+        position, _, stats = str(label).partition(': ')
+        if label == 'Other' or stats == 'Limited data':
+            continue
+        stats = re.sub(r' \(\d+\)$', '', stats).split(' & ')
+        if position not in NAMING_STATS or not set(stats) <= set(NAMING_STATS[position]):
+            bad.append(label)
+    return bad
+
+
+def assign(df):
+    """
+    Archetype name of every player of the prepared player table (needs
+    PosCat and Minutes), as a Series on `df`'s index.
+    """
+    out = pd.Series('Other', index=df.index, dtype=object)
+    for position, k in CLUSTERS.items():
+        rows = (df['PosCat'] == position).to_numpy()
+        if PROFILE_STAT in FEATURES[position]:
+            limited = rows & (df[PROFILE_STAT] <= 0).to_numpy()
+            out[limited] = f'{position}: Limited data'
+            rows = rows & ~limited
+        if rows.sum() < k:
+            continue
+        features = FEATURES[position]
+        X = feature_matrix(df[rows], features)
+        regulars = (df.loc[rows, 'Minutes'] >= MIN_MINUTES).to_numpy()
+        fit = X[regulars] if regulars.sum() >= k else X
+
+        # Standardised on the regulars, so one unit is one spread of the position
+        mean, std = fit.mean(0), fit.std(0)
+        std[std == 0] = 1
+        Z, fit_z = (X - mean) / std, (fit - mean) / std
+
+        centers = minibatch_kmeans(fit_z, k)
+        names = np.array(_names(position, centers, features), dtype=object)
+        out[rows] = names[_sq_distances(Z, centers).argmin(1)]
+
+    bad = invalid_names(out)
+    if bad:
+        raise ValueError(f'Archetype names outside their position\'s NAMING_STATS: {", ".join(bad)}')
+    return out.astype('str')
+
+
+def main(argv):
+    if argv:
+        print(__doc__)
+        return 1
+    from analytics.players import load_players
+
+    df = load_players()
+    if 'Archetype' not in df:
+        print('The player table has no Archetype column yet: run data/prepare_players_data.py')
+        return 1
+    print(df.groupby(['PosCat', 'Archetype'], observed=True).size().to_string())
+    bad = invalid_names(df['Archetype'])
+    if bad:
+        print(f'\nNamed after stats outside NAMING_STATS (rerun data/prepare_players_data.py): {", ".join(bad)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
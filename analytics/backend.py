@@ -0,0 +1,29 @@
+"""
+Which library runs the shared data transforms.
+
+The player table preparation, the percentile matrix and the team and league
+tables are built with pandas by default. With PL_DATA_BACKEND=polars they
+are built with Polars instead (lazy, multi-threaded; see
+analytics/polars_backend.py), which scales the prep step across cores for
+multi-league tables. Either way the result is the same pandas frame, so the
+pages, the snapshot and the caches do not depend on the backend.
+
+Polars is optional: it is only imported when selected.
+"""
+import os
+
+BACKENDS = ('pandas', 'polars')
+
+DEFAULT = os.environ.get('PL_DATA_BACKEND', 'pandas')
+
+
+def resolve(backend=None):
+    """`backend`, or the configured default, checked against BACKENDS."""
+    backend = backend or DEFAULT
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown data backend {backend!r} (expected one of {", ".join(BACKENDS)})')
+    return backend
+
+
+def use_polars(backend=None):
+    return resolve(backend) == 'polars'
@@ -0,0 +1,139 @@
+"""
+Hit, miss and eviction counts for the app's caches.
+
+`cache_data` and `cache_resource` are drop-in replacements for the Streamlit
+decorators that also count how each call was served. A call that runs the
+function body is a miss; any other call is a hit. Evictions are counted
+against a mirror of the cache's LRU order, sized by `max_entries`. Caches
+that are not Streamlit caches (the report store, the API response cache)
+register a `CacheStats` of their own. `stats()` reports all of them.
+
+Counts are per process, since the caches are. Streamlit is only imported by
+the decorators, so the report store can register its counters without it.
+"""
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class CacheStats:
+    """Counters of one cache. `hit()`/`miss(key)` are thread-safe."""
+
+    def __init__(self, name, kind, max_entries=None):
+        self.name = name
+        self.kind = kind
+        self.max_entries = max_entries
+        self.hits = self.misses = self.evictions = 0
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key=None):
+        with self._lock:
+            self.hits += 1
+            if key in self._keys:
+                self._keys.move_to_end(key)
+
+    def miss(self, key=None):
+        with self._lock:
+            self.misses += 1
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._keys) > self.max_entries:
+                    self._keys.popitem(last=False)
+                    self.evictions += 1
+
+    def evict(self, n=1):
+        """Counts evictions of a cache that tracks its own entries."""
+        with self._lock:
+            self.evictions += n
+
+    def row(self):
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                'cache': self.name, 'kind': self.kind, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'hit_rate': self.hits / calls if calls else None,
+            }
+
+
+def register(name, kind, max_entries=None):
+    """The CacheStats registered under `name`, created on first use."""
+    with _registry_lock:
+        stats = _registry.get(name)
+        if stats is None:
+            stats = _registry[name] = CacheStats(name, kind, max_entries)
+        return stats
+
+
+def rows():
+    """Counters of every cache in this process, as one dict per cache."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return [c.row() for c in caches]
+
+
+def stats():
+    """Counters of every cache in this process, one row per cache."""
+    return pd.DataFrame(rows(), columns=[
+        'cache', 'kind', 'hits', 'misses', 'evictions', 'hit_rate'
+    ]).set_index('cache')
+
+
+# Which calls on this thread ran their function body (nested cached calls
+# each get their own frame)
+_calls = threading.local()
+
+
+def _counted(decorator, kind, func, options):
+    module = func.__module__
+    if module == '__main__':
+        # A page script: name it after its file
+        module = os.path.splitext(os.path.basename(func.__code__.co_filename))[0]
+    stats = register(f'{module}.{func.__qualname__}', kind, options.get('max_entries'))
+
+    @functools.wraps(func)
+    def body(*args, **kwargs):
+        _calls.frames[-1][0] = True
+        return func(*args, **kwargs)
+
+    cached = decorator(**options)(body)
+
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        frames = _calls.__dict__.setdefault('frames', [])
+        frames.append([False])
+        try:
+            return cached(*args, **kwargs)
+        finally:
+            ran = frames.pop()[0]
+            key = repr((args, sorted(kwargs.items())))
+            stats.miss(key) if ran else stats.hit(key)
+
+    call.clear = cached.clear
+    call.stats = stats
+    return call
+
+
+def cache_data(func=None, **options):
+    """`st.cache_data` with hit/miss/eviction counts; same arguments."""
+    import streamlit as st
+
+    if func is None:
+        return lambda f: _counted(st.cache_data, 'data', f, options)
+    return _counted(st.cache_data, 'data', func, options)
+
+
+def cache_resource(func=None, **options):
+    """`st.cache_resource` with hit/miss/eviction counts; same arguments."""
+    import streamlit as st
+
+    if func is None:
+        return lambda f: _counted(st.cache_resource, 'resource', f, options)
+    return _counted(st.cache_resource, 'resource', func, options)
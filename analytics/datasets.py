@@ -0,0 +1,223 @@
+import os
+
+import pandas as pd
+
+from analytics import caches, form, manifest, store, team_data, tots
+from analytics import percentiles as _percentiles
+from analytics import players as _players
+from analytics import search as _search
+from analytics import seasons as _seasons
+from analytics import shots as _shots
+from analytics import squads as _squads
+from analytics.teams import TEAM_NAMES, team_data_path
+
+# Input files of each dataset: rewriting one only invalidates what was built from it
+INPUTS = {
+    'players': [_players.PLAYERS_PATH],
+    'teams': [team_data_path(t) for t in TEAM_NAMES],
+    'percentiles': [_players.PLAYERS_PATH],
+    'archetype_percentiles': [_players.PLAYERS_PATH],
+    'tots_scores': [_players.PLAYERS_PATH],
+    'team_form': [team_data_path(t) for t in TEAM_NAMES],
+}
+
+
+def version(name='players'):
+    """
+    Cache key for data built from dataset `name`: the published snapshot
+    while it matches the current inputs, else the hash of the dataset's own
+    input files.
+    """
+    return store.fresh_version() or manifest.version(INPUTS[name])
+
+
+# Resources, not data: the frames are shared read-only between sessions
+# (and, when published, between processes through the memory-mapped store).
+# Room for every dataset of the current and the previous version.
+@caches.cache_resource(max_entries=2 * len(INPUTS), show_spinner=False)
+def _load(name, version):
+    try:
+        return _attach(name, version)
+    except FileNotFoundError:
+        pass
+    # Not a published version: build this process's own copy
+    if name == 'players':
+        return _players.load_players()
+    if name == 'teams':
+        return team_data.load_team_table()
+    if name == 'percentiles':
+        return _percentiles.percentile_matrix(_load('players', version))
+    if name == 'archetype_percentiles':
+        return _percentiles.percentile_matrix(_load('players', version), pool='archetype')
+    if name == 'tots_scores':
+        return tots.score_table(tots.high_usage_scores(_load('players', version)))
+    if name == 'team_form':
+        return form.rolling_team_form(_load('teams', version))
+    raise KeyError(name)
+
+
+def _attach(name, version):
+    df = store.attach(name, version)
+    if name in ('percentiles', 'archetype_percentiles'):
+        # One float block, so lookups index a single array without copying
+        df = pd.DataFrame(df.to_numpy(dtype=float), index=df.index, columns=df.columns)
+    return df
+
+
+def players():
+    """Prepared player table (read-only)."""
+    return _load('players', version('players'))
+
+
+def teams():
+    """Long team table with a TeamId column (read-only)."""
+    return _load('teams', version('teams'))
+
+
+def team_form():
+    """Rolling 5/10-round form of every team and round (see form.rolling_team_form), read-only."""
+    return _load('team_form', version('team_form'))
+
+
+@caches.cache_resource(max_entries=4, show_spinner=False)
+def _form_table(version, window):
+    return form.form_table(_load('team_form', version), window)
+
+
+def form_table(window):
+    """All teams ranked by their form over the last `window` rounds."""
+    return _form_table(version('team_form'), window)
+
+
+@caches.cache_resource(max_entries=2, show_spinner=False)
+def _squad_profiles(players_version, teams_version):
+    return _squads.SquadProfiles(_load('players', players_version), _load('teams', teams_version))
+
+
+def squad_profiles():
+    """Every club's squad panel (a SquadProfiles), built once per player and team table version."""
+    return _squad_profiles(version('players'), version('teams'))
+
+
+def percentiles(pool='position'):
+    """
+    Pool percentile of every player for every stat, aligned with players()
+    (read-only). `pool` is 'position' (position and usage) or 'archetype'.
+    """
+    if pool == 'archetype':
+        return _load('archetype_percentiles', version('archetype_percentiles'))
+    return _load('percentiles', version('percentiles'))
+
+
+@caches.cache_resource(max_entries=2, show_spinner=False)
+def _tots_team(version):
+    ranked = tots.ranked_scores(_load('tots_scores', version))
+    return tots.pick_team(_load('players', version), ranked=ranked)
+
+
+def tots_team():
+    """The Team Of The Season as ((role, player name), ...)."""
+    return _tots_team(version('tots_scores'))
+
+
+# mplsoccer (and matplotlib) are only imported when no snapshot has the image
+@caches.cache_resource(max_entries=2, show_spinner=False)
+def _tots_pitch(version):
+    try:
+        return store.attach_file('tots.png', version)
+    except FileNotFoundError:
+        return tots.draw_pitch(_tots_team(version))
+
+
+def tots_pitch():
+    """The Team Of The Season on a pitch, as PNG bytes."""
+    return _tots_pitch(version('tots_scores'))
+
+
+@caches.cache_resource(max_entries=2, show_spinner=False)
+def _player_index(version):
+    df = _load('players', version)
+    return _search.NameIndex(df['Player Name'], df.index)
+
+
+def player_index():
+    """Fuzzy name index over players(); search() returns its row labels."""
+    return _player_index(version('players'))
+
+
+@caches.cache_resource(max_entries=2, show_spinner=False)
+def _memorable(version):
+    return team_data.load_memorable()
+
+
+def memorable():
+    """Every team's ranked memorable matches (see analytics/memorable.py), read once per file version."""
+    return _memorable(manifest.version([team_data.MEMORABLE_PATH]))
+
+
+# Shots and appearances are optional (scraped separately) and not part of the snapshot
+def _optional_version(path):
+    return manifest.version([path]) if os.path.exists(path) else None
+
+
+def _shots_version():
+    return _optional_version(_shots.SHOTS_PATH)
+
+
+@caches.cache_resource(max_entries=2, show_spinner=False)
+def _shot_table(version):
+    return _shots.ShotTable(_shots.load_shots())
+
+
+def shots():
+    """The season's ShotTable, or None before the shots are scraped."""
+    version = _shots_version()
+    return None if version is None else _shot_table(version)
+
+
+# One image per entity and filter; a few hundred cover every team and filter
+@caches.cache_resource(max_entries=512, show_spinner=False)
+def _shot_map(version, column, key, situation):
+    return _shots.draw_shot_map(_shot_table(version).rows(column, key, situation))
+
+
+def shot_map(column, key, situation='All'):
+    """Shot map (PNG bytes) of the shots with `column` == `key`, e.g. ('TeamId', 3)."""
+    return _shot_map(_shots_version(), column, key, situation)
+
+
+@caches.cache_resource(max_entries=2, show_spinner=False)
+def _player_form(version):
+    return form.PlayerForm(form.load_appearances())
+
+
+def player_form():
+    """Every player's rolling per-90 form (a PlayerForm), or None before the appearances are scraped."""
+    version = _optional_version(form.APPEARANCES_PATH)
+    return None if version is None else _player_form(version)
+
+
+@caches.cache_resource(max_entries=2, show_spinner=False)
+def _season_deltas(version, previous):
+    index = _seasons.load_index()
+    current = players()
+    current_ids = _seasons.season_ids(index, _seasons.CURRENT_SEASON)
+    previous_ids = _seasons.season_ids(index, previous)
+    table = _players.load_players(_seasons.season_paths()[previous])
+    # An index that has not ingested both tables as they are now cannot join them
+    if len(current_ids) != len(current) or len(previous_ids) != len(table):
+        return None
+    return _seasons.SeasonDeltas(current, table, current_ids, previous_ids, current_pcts=percentiles(),
+                                 previous_season=previous)
+
+
+def season_deltas():
+    """
+    Every current player's change since the previous season (a
+    SeasonDeltas), or None with a single season or no identity index.
+    """
+    paths = _seasons.season_paths()
+    previous = _seasons.previous_season(_seasons.CURRENT_SEASON, paths)
+    if previous is None or not os.path.exists(_seasons.IDS_PATH):
+        return None
+    return _season_deltas(manifest.version([_players.PLAYERS_PATH, paths[previous], _seasons.IDS_PATH]), previous)
@@ -0,0 +1,369 @@
+"""
+Static export of the dashboards.
+
+Pre-renders every team dashboard, every player analysis, the Team Of The
+Season pitch and the AI reports already in the report store into a static
+site that any web server (or a CDN) can serve without running Streamlit:
+
+    <out>/index.html
+    <out>/teams/<team>.html   .json     charts drawn by vega-embed
+    <out>/players/<id>.html   .json     radar drawn by plotly.js
+    <out>/tots.html   tots.png   tots.json
+    <out>/logos/<team>.png
+    <out>/manifest.json
+
+Pages are rendered in a process pool; each worker loads the datasets once.
+The export is incremental: a page's fingerprint is the hash of the data it
+shows (its JSON, including the cached report) and of the rendering code, and
+pages whose fingerprint is unchanged since the last export are not rendered
+again. Re-running after a data refresh only rewrites what changed.
+
+Usage:
+    python -m analytics.export [--out site] [--workers N] [--force]
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from analytics import prompts, tots
+from analytics.jobs import REPORTS_DIR, stored_report
+from analytics.llm import prompt_key
+from analytics.store import input_version
+from analytics.teams import TEAM_NAMES, file_key, team_logo_path
+
+PRIMARY = '#37003C'
+OUT_DIR = 'site'
+MANIFEST = 'manifest.json'
+
+# Changing any of these changes what a page looks like, so they are part of
+# every fingerprint
+_CODE = [
+    'analytics/export.py', 'analytics/profiles.py', 'analytics/prompts.py', 'analytics/tots.py',
+    'analytics/team_charts.py', 'analytics/team_data.py', 'analytics/player_charts.py',
+    'analytics/percentiles.py', 'analytics/players.py',
+]
+
+VEGA_SCRIPTS = """
+<script src="https://cdn.jsdelivr.net/npm/vega@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-lite@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-embed@6"></script>
+"""
+
+STYLE = f"""
+<style>
+body {{ font-family: sans-serif; max-width: 1100px; margin: 0 auto; padding: 1em; color: #222; }}
+h1, h2, h3, h4 {{ color: {PRIMARY}; }}
+h1 {{ text-align: center; }}
+.kpis {{ display: flex; gap: 1em; flex-wrap: wrap; }}
+.kpi {{ background: #F5F5F5; border-radius: 8px; padding: 1em; flex: 1; min-width: 120px; }}
+.kpi span {{ display: block; font-size: 1.6em; }}
+.memory-card {{ background: #F0F0F0; padding: 1em; border-radius: 8px; margin-bottom: 2em; }}
+.report {{ white-space: pre-wrap; }}
+.bar {{ width: 500px; background: #e0e0e0; border-radius: 4px; overflow: hidden; height: 12px; }}
+.bar div {{ background: linear-gradient(90deg, #dc3545 0%, #ffc107 50%, #28a745 100%); height: 100%; }}
+footer {{ text-align: center; color: gray; margin-top: 50px; }}
+</style>
+"""
+
+
+def team_slug(name):
+    return file_key(name)
+
+
+def json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'Not JSON serializable: {type(value).__name__}')
+
+
+def _dumps(payload):
+    return json.dumps(payload, default=json_default, ensure_ascii=False, sort_keys=True)
+
+
+def _page(title, body, head='', root=''):
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+{STYLE}{head}
+</head>
+<body>
+<p><a href="{root}index.html">← All teams and players</a></p>
+{body}
+<footer>© 2025 Houssem Aridhi</footer>
+</body>
+</html>
+"""
+
+
+def _report_html(heading, report):
+    if report is None:
+        return f"<h3>{html.escape(heading)}</h3><p><em>No report generated yet.</em></p>"
+    return f"<h3>{html.escape(heading)}</h3><div class='report'>{html.escape(report)}</div>"
+
+
+def _report(messages, store_dir):
+    """Text of the stored report for `messages`, or None."""
+    job = stored_report(prompt_key(messages), store_dir)
+    return job.result if job is not None and job.status == 'done' else None
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mode = 'wb' if isinstance(content, bytes) else 'w'
+    with open(path, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as f:
+        f.write(content)
+
+
+# --- Worker side: datasets are loaded once per process by the initializer ---
+
+_data = {}
+
+
+def _init_worker(store_dir, code_version):
+    from analytics.percentiles import percentile_matrix
+    from analytics.players import load_players
+    from analytics.team_data import load_memorable, load_team_table
+
+    players = load_players()
+    _data.update(
+        players=players,
+        pcts=percentile_matrix(players),
+        teams=load_team_table(),
+        memorable=load_memorable(),
+        store_dir=store_dir,
+        code_version=code_version,
+    )
+
+
+def _fingerprint(payload):
+    return hashlib.sha1((_data['code_version'] + payload).encode()).hexdigest()[:16]
+
+
+def _team_task(name, out_dir, previous):
+    from analytics.team_charts import points_chart, position_chart, season_charts
+    from analytics.team_data import memorable_performance, metrics_block, season_frame, season_metrics, team_frame
+
+    df = season_frame(team_frame(_data['teams'], name))
+    metrics = season_metrics(df.iloc[-1])
+    memorable = memorable_performance(_data['memorable'], name)
+    messages = prompts.team_analysis(name, metrics_block(metrics))
+    payload = {
+        'team': name,
+        'metrics': dict(metrics),
+        'memorable': memorable.drop(labels='TeamId').to_dict(),
+        'report': _report(messages, _data['store_dir']),
+        'rounds': df.to_dict('records'),
+    }
+    data = _dumps(payload)
+    fingerprint = _fingerprint(data)
+    slug = team_slug(name)
+    files = [f'teams/{slug}.json', f'teams/{slug}.html', f'logos/{slug}.png']
+    if fingerprint == previous:
+        return fingerprint, files, False
+
+    charts = [("Points Over Season", points_chart(df)), ("League Position Over Season", position_chart(df))]
+    charts += season_charts(df)
+    sections, embeds = [], []
+    for i, (title, chart) in enumerate(charts):
+        sections.append(f"<h3>{html.escape(title)}</h3><div id='chart{i}'></div>")
+        spec = json.dumps(chart.properties(width='container').to_dict(), default=json_default)
+        embeds.append(f"vegaEmbed('#chart{i}', {spec}, {{actions: false}});")
+
+    kpis = ''.join(
+        f"<div class='kpi'>{html.escape(label)}<span>{html.escape(str(value))}</span></div>"
+        for label, value in metrics
+    )
+    row = memorable
+    card = f"""
+<div class='memory-card'>
+  <h3>{html.escape(str(row['description']))}</h3>
+  <p><strong>Date:</strong> {html.escape(str(row['date'])[:10])} &nbsp;
+     <strong>Opponent:</strong> {html.escape(str(row['opponent']).title())} ({html.escape(str(row['venue']).capitalize())}) &nbsp;
+     <strong>Score:</strong> {html.escape(str(row['score']))}</p>
+  <p>🎯 <strong>xG:</strong> {row['xg']} &nbsp; 🛡️ <strong>xGA:</strong> {row['xga']} &nbsp;
+     #️⃣ <strong>xGD:</strong> {round(row['xg'] - row['xga'], 2)}</p>
+  <p>⚽️ <strong>Shots:</strong> {row['shots']} ({row['shots_on_target']} on target) &nbsp;
+     🚫 <strong>Against:</strong> {row['shots_against']} ({row['shots_on_target_against']} on target) &nbsp;
+     ⏱️ <strong>Half time:</strong> {html.escape(str(row['ht_score']))} &nbsp; 📊 <strong>xPTS:</strong> {row['xpts']}</p>
+</div>"""
+    body = f"""
+<h1>📈 {html.escape(name)}</h1>
+<p style="text-align:center"><img src="../logos/{slug}.png" width="220" alt=""></p>
+<div class='kpis'>{kpis}</div>
+{''.join(sections)}
+<h3>Most Memorable Performance</h3>{card}
+{_report_html(f"{name} AI-Powered Analysis", payload['report'])}
+<script>{''.join(embeds)}</script>
+"""
+    _write(os.path.join(out_dir, files[0]), data)
+    _write(os.path.join(out_dir, files[1]), _page(name, body, VEGA_SCRIPTS, root='../'))
+    os.makedirs(os.path.join(out_dir, 'logos'), exist_ok=True)
+    shutil.copyfile(team_logo_path(name), os.path.join(out_dir, files[2]))
+    return fingerprint, files, True
+
+
+def _player_task(player_id, out_dir, previous):
+    from analytics.player_charts import radar_figure
+    from analytics.profiles import USAGE_LABELS, player_profile, radar_summary
+
+    row = _data['players'].loc[player_id]
+    pcts = _data['pcts']
+    profile = player_profile(row, pcts)
+    messages = prompts.player_analysis(profile['name'], profile['position'], radar_summary(row, pcts, profile['position']))
+    profile['report'] = _report(messages, _data['store_dir'])
+    data = _dumps(profile)
+    fingerprint = _fingerprint(data)
+    files = [f'players/{player_id}.json', f'players/{player_id}.html']
+    if fingerprint == previous:
+        return fingerprint, files, False
+
+    bucket, bucket_expl = USAGE_LABELS[profile['usage']]
+    metrics = ''.join(
+        f"<tr><td><strong>{html.escape(m['label'])}:</strong> {m['value']} (P{m['percentile'] if m['percentile'] is not None else 'N/A'})</td>"
+        f"<td><div class='bar'><div style='width: {m['percentile'] or 0}%'></div></div></td></tr>"
+        for m in profile['key_metrics']
+    )
+    radar = radar_figure(profile['radar'], PRIMARY).to_html(full_html=False, include_plotlyjs='cdn')
+    body = f"""
+<h1>🔍 {html.escape(profile['name'])} — {profile['position']}</h1>
+<p><strong>Club:</strong> {html.escape(profile['club'])} | <strong>Nationality:</strong> {html.escape(str(profile['nationality']))} |
+<strong>Appearances:</strong> {profile['appearances']} | <strong>Minutes:</strong> {profile['minutes']} |
+<strong>Yellow Cards:</strong> {profile['yellow_cards']} | <strong>Red Cards:</strong> {profile['red_cards']}</p>
+<h4>{html.escape(bucket)}</h4><p>{html.escape(bucket_expl)}</p>
+<h3>Key Metrics</h3><table>{metrics}</table>
+<h3>{html.escape(profile['name'])} Performance Radar</h3>{radar}
+{_report_html(f"{profile['name']} AI-Powered Analysis", profile['report'])}
+"""
+    _write(os.path.join(out_dir, files[0]), data)
+    _write(os.path.join(out_dir, files[1]), _page(profile['name'], body, root='../'))
+    return fingerprint, files, True
+
+
+def _tots_task(_, out_dir, previous):
+    roster = tots.pick_team(_data['players'])
+    messages = prompts.tots_summary(tots.roster_block(roster))
+    payload = {'roster': [{'role': role, 'player': name} for role, name in roster],
+               'report': _report(messages, _data['store_dir'])}
+    data = _dumps(payload)
+    fingerprint = _fingerprint(data)
+    files = ['tots.json', 'tots.png', 'tots.html']
+    if fingerprint == previous:
+        return fingerprint, files, False
+
+    body = f"""
+<h1>⚽️ 24/25 Team Of The Season</h1>
+<p><img src="tots.png" style="width: 100%" alt="Team Of The Season"></p>
+{_report_html("Team Of The Season AI-Powered Summary", payload['report'])}
+"""
+    _write(os.path.join(out_dir, files[0]), data)
+    _write(os.path.join(out_dir, files[1]), tots.draw_pitch(roster))
+    _write(os.path.join(out_dir, files[2]), _page('Team Of The Season', body))
+    return fingerprint, files, True
+
+
+_TASKS = {'team': _team_task, 'player': _player_task, 'tots': _tots_task}
+
+
+def _run_task(task):
+    key, kind, arg, out_dir, previous = task
+    fingerprint, files, rendered = _TASKS[kind](arg, out_dir, previous)
+    return key, fingerprint, files, rendered
+
+
+# --- Parent side ---
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'pages': {}}
+
+
+def _index_html(players):
+    teams = ''.join(f"<li><a href='teams/{team_slug(t)}.html'>{html.escape(t)}</a></li>" for t in TEAM_NAMES)
+    clubs = []
+    for club, group in players.sort_values('Player Name').groupby('Club', sort=True):
+        links = ', '.join(f"<a href='players/{i}.html'>{html.escape(n)}</a>" for i, n in group['Player Name'].items())
+        clubs.append(f"<h3>{html.escape(club)}</h3><p>{links}</p>")
+    body = f"""
+<h1>⚽ Premier League Analytics 2024-25</h1>
+<h2>📈 Teams</h2><ul>{teams}</ul>
+<h2>👥 <a href='tots.html'>Team Of The Season</a></h2>
+<h2>🔍 Players</h2>{''.join(clubs)}
+"""
+    return _page('Premier League Analytics', body)
+
+
+def export(out_dir=OUT_DIR, workers=None, force=False, store_dir=REPORTS_DIR):
+    """Renders the static site into `out_dir`; returns (rendered, unchanged, removed) page counts."""
+    from analytics.players import load_players
+
+    players = load_players()
+    manifest = {'pages': {}} if force else _load_manifest(out_dir)
+    previous = manifest.get('pages', {})
+
+    def entry(key):
+        old = previous.get(key)
+        # A page whose files were deleted by hand is rendered again
+        if old and all(os.path.exists(os.path.join(out_dir, f)) for f in old['files']):
+            return old['fingerprint']
+        return None
+
+    tasks = [(f'team:{t}', 'team', t, out_dir, entry(f'team:{t}')) for t in TEAM_NAMES]
+    tasks += [(f'player:{i}', 'player', i, out_dir, entry(f'player:{i}')) for i in players.index]
+    tasks.append(('tots', 'tots', None, out_dir, entry('tots')))
+
+    os.makedirs(out_dir, exist_ok=True)
+    pages, rendered = {}, 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(store_dir, input_version(_CODE))) as pool:
+        for key, fingerprint, files, was_rendered in pool.map(_run_task, tasks, chunksize=16):
+            pages[key] = {'fingerprint': fingerprint, 'files': files}
+            rendered += was_rendered
+
+    # Pages that no longer exist (e.g. a player left the dataset)
+    removed = 0
+    current = {f for page in pages.values() for f in page['files']}
+    for key, old in previous.items():
+        if key not in pages:
+            removed += 1
+            for f in old['files']:
+                if f not in current:
+                    try:
+                        os.remove(os.path.join(out_dir, f))
+                    except FileNotFoundError:
+                        pass
+
+    _write(os.path.join(out_dir, 'index.html'), _index_html(players))
+    _write(os.path.join(out_dir, MANIFEST), json.dumps({'generated': time.time(), 'pages': pages}, indent=1))
+    return rendered, len(pages) - rendered, removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', default=OUT_DIR, help='output directory (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='render every page even if unchanged')
+    parser.add_argument('--reports', default=REPORTS_DIR, help='AI report store (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rendered, unchanged, removed = export(args.out, args.workers, args.force, args.reports)
+    print(f'Exported to {args.out}: {rendered} pages rendered, {unchanged} unchanged, '
+          f'{removed} removed in {time.perf_counter() - started:.1f} s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Form over time: rolling windows of player and team match data.
+
+data/scrape_memorable_matchs_data.py writes one row per player and match
+played (from the Understat match rosters) with `write_appearances()`.
+`rolling_per90()` turns that into each player's per-90 rate of every form
+stat over their last 5 and 10 appearances, for all players at once: one
+grouped cumulative sum of every stat, minus the same sum N appearances
+earlier. `PlayerForm` holds the result with every player's row positions,
+so showing a player's form is a lookup.
+
+`rolling_team_form()` does the same for the teams from the long team table:
+xG, xGA, xGD, points, xPts and points over xPts summed over each team's last
+5 and 10 rounds, for all teams in one grouped rolling pass per window.
+`form_table()` ranks the teams by their current form.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from analytics.search import same_person
+from analytics.teams import ID_TO_NAME, team_ids
+
+APPEARANCES_PATH = 'data/players_data/epl_player_matches_2024_25.parquet'
+
+# Understat roster field -> column
+STAT_FIELDS = {
+    'goals': 'Goals', 'assists': 'Assists', 'shots': 'Shots', 'key_passes': 'Key Passes',
+    'xG': 'xG', 'xA': 'xA', 'xGChain': 'xGChain', 'xGBuildup': 'xGBuildup',
+}
+FORM_STATS = list(STAT_FIELDS.values())
+
+# Appearances per rolling window
+WINDOWS = (5, 10)
+
+# Windows with fewer minutes than this have no per-90 value (a cameo is not a rate)
+MIN_WINDOW_MINUTES = 90
+
+SORT_COLS = ['PlayerId', 'Date', 'MatchId']
+
+
+def appearances_frame(records):
+    """
+    The appearance table from Understat roster rows (`get_roster_data()`
+    of each match, with the match's match_id, date, h_team and a_team
+    added), in storage order and dtypes.
+    """
+    raw = pd.DataFrame.from_records(records)
+    home = raw['h_a'] == 'h'
+    team = raw['h_team'].where(home, raw['a_team'])
+    opponent = raw['a_team'].where(home, raw['h_team'])
+
+    df = pd.DataFrame({
+        'MatchId': raw['match_id'].astype('int32'),
+        'Date': pd.to_datetime(raw['date']),
+        'PlayerId': raw['player_id'].astype('int32'),
+        'Player': raw['player'].astype('category'),
+        'TeamId': team_ids(team).to_numpy(),
+        'OpponentId': team_ids(opponent).to_numpy(),
+        'Venue': pd.Categorical(np.where(home, 'home', 'away')),
+        'Position': raw['position'].astype('category'),
+        'Minutes': raw['time'].astype('int16'),
+        **{col: raw[field].astype('float32') for field, col in STAT_FIELDS.items()},
+        'Yellow Cards': raw['yellow_card'].astype('int8'),
+        'Red Cards': raw['red_card'].astype('int8'),
+    })
+    return df.sort_values(SORT_COLS, kind='stable', ignore_index=True)
+
+
+def write_appearances(df, path=APPEARANCES_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_parquet(path, index=False)
+
+
+def load_appearances(path=APPEARANCES_PATH):
+    return pd.read_parquet(path)
+
+
+def form_column(stat, window):
+    """Column of the rolling frame: 'xG per90 (5)'."""
+    return f'{stat} per90 ({window})'
+
+
+def rolling_per90(apps, stats=FORM_STATS, windows=WINDOWS):
+    """
+    One row per appearance (minutes > 0) with each stat's per-90 rate over
+    the player's last `window` appearances up to and including it. Early
+    windows cover the appearances so far.
+    """
+    apps = apps[apps['Minutes'] > 0].sort_values(SORT_COLS, kind='stable', ignore_index=True)
+    player = apps['PlayerId'].to_numpy()
+    # Running totals per player, in float64 so the differences stay exact enough
+    totals = apps[['Minutes'] + stats].astype('float64').groupby(player).cumsum()
+
+    out = apps[['PlayerId', 'Player', 'TeamId', 'OpponentId', 'MatchId', 'Date', 'Minutes']].copy()
+    for window in windows:
+        sums = totals - totals.groupby(player).shift(window, fill_value=0)
+        minutes = sums.pop('Minutes')
+        per90 = sums.div(minutes, axis=0).mul(90).where(minutes >= MIN_WINDOW_MINUTES)
+        for stat in stats:
+            out[form_column(stat, window)] = per90[stat].astype('float32')
+    return out
+
+
+class PlayerForm:
+    """Rolling form of every player (see rolling_per90) with each player's row positions."""
+
+    def __init__(self, apps):
+        self.frame = rolling_per90(apps)
+        self._rows = self.frame.groupby('PlayerId', sort=False).indices
+        self._players = self.frame[['TeamId', 'PlayerId', 'Player']].drop_duplicates(['TeamId', 'PlayerId'])
+
+    def rows(self, player_id):
+        """The player's appearances in date order."""
+        return self.frame.take(self._rows.get(player_id, np.empty(0, dtype=np.intp)))
+
+    def player_id(self, name, team_id):
+        """Understat id of the player called `name` (Premier League spelling) at team `team_id`, or None."""
+        players = self._players[self._players['TeamId'] == team_id]
+        pid = same_person(name, zip(players['PlayerId'], players['Player']))
+        return None if pid is None else int(pid)
+
+
+# Team form stat -> its per-match value in the long team table
+TEAM_FORM_STATS = {
+    'xG': lambda t: t['xg'],
+    'xGA': lambda t: t['xga'],
+    'xGD': lambda t: t['xg'] - t['xga'],
+    'Points': lambda t: t['MatchPoints'],
+    'xPts': lambda t: t['xpts'],
+    # Points won above (or below) what the chances created were worth
+    'Pts - xPts': lambda t: t['MatchPoints'] - t['xpts'],
+}
+
+
+def team_form_column(stat, window):
+    """Column of the team form frame: 'xG (last 5)'."""
+    return f'{stat} (last {window})'
+
+
+def rolling_team_form(table, windows=WINDOWS):
+    """
+    One row per team and round of the long team table with every team
+    form stat summed over the team's last `window` rounds up to and
+    including it. Early windows cover the rounds so far.
+    """
+    table = table.sort_values(['TeamId', 'Round'], kind='stable', ignore_index=True)
+    per_match = pd.DataFrame({stat: value(table) for stat, value in TEAM_FORM_STATS.items()})
+    grouped = per_match.groupby(table['TeamId'].to_numpy(), sort=False)
+
+    out = table[['TeamId', 'Team', 'Round']].copy()
+    for window in windows:
+        sums = grouped.rolling(window, min_periods=1).sum().reset_index(level=0, drop=True)
+        for stat in TEAM_FORM_STATS:
+            out[team_form_column(stat, window)] = sums[stat]
+    return out
+
+
+def form_table(team_form, window):
+    """
+    Every team's form after its latest round over the last `window`
+    rounds, ranked by points, then xGD. Indexed by rank (1 = best form).
+    """
+    latest = team_form.loc[team_form.groupby('TeamId', sort=False)['Round'].idxmax()]
+    out = pd.DataFrame({'Team': latest['TeamId'].map(ID_TO_NAME), 'Played': latest['Round']})
+    for stat in TEAM_FORM_STATS:
+        out[stat] = latest[team_form_column(stat, window)].round(2)
+    out['Points'] = out['Points'].astype('int64')
+    out = out.sort_values(['Points', 'xGD'], ascending=False, kind='stable', ignore_index=True)
+    out.index = pd.RangeIndex(1, len(out) + 1, name='Rank')
+    return out
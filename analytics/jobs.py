@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+from analytics import caches, llm
+
+REPORTS_DIR = os.environ.get('PL_REPORTS_DIR', '.cache/reports')
+WORKERS = int(os.environ.get('PL_REPORT_WORKERS', '4'))
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = 'queued'          # queued -> running -> done | error
+    result: str = None
+    error: str = None
+    submitted: float = field(default_factory=time.time)
+    started: float = None
+    finished: float = None
+
+    @property
+    def pending(self):
+        return self.status in ('queued', 'running')
+
+
+def report_path(job_id, store_dir=REPORTS_DIR):
+    return os.path.join(store_dir, f'{job_id}.json')
+
+
+def stored_report(job_id, store_dir=REPORTS_DIR):
+    """The finished job saved under `store_dir`, or None; readable without a queue."""
+    try:
+        with open(report_path(job_id, store_dir), encoding='utf-8') as f:
+            return Job(**json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError, TypeError):
+        return None
+
+
+class ReportQueue:
+    """
+    Background AI report generation owned by the server process.
+
+    Jobs run on a thread pool, not in the Streamlit script thread, so a page
+    stays interactive while a report is generated and the job keeps running
+    if the user navigates away. A job's id is the hash of its prompt: asking
+    for the same report again returns the same job, and finished reports are
+    written to `store_dir` so they survive restarts.
+    """
+
+    def __init__(self, workers=WORKERS, store_dir=REPORTS_DIR, history=500):
+        self.store_dir = store_dir
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ai-report')
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._latency = deque(maxlen=history)
+        self._failed = 0
+        # A report is keyed by its prompt, which carries the numbers it is
+        # about: new data means a new prompt, so the data version is already
+        # part of the key and unchanged reports stay valid
+        self.cache_stats = caches.register(f'reports:{store_dir}', 'store')
+
+    def _path(self, job_id):
+        return report_path(job_id, self.store_dir)
+
+    def _load(self, job_id):
+        return stored_report(job_id, self.store_dir)
+
+    def _save(self, job):
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp = self._path(job.id) + f'.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(asdict(job), f)
+        os.replace(tmp, self._path(job.id))
+
+    def get(self, job_id):
+        """The job with this id from memory or the report store, or None."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            job = self._load(job_id)
+            if job is not None:
+                with self._lock:
+                    job = self._jobs.setdefault(job_id, job)
+        return job
+
+    def submit(self, messages, model=llm.MODEL):
+        """Queues a chat completion and returns its job id (existing job if any)."""
+        job_id = llm.prompt_key(messages, model)
+        self.get(job_id)  # pulls a stored report into memory
+        with self._lock:
+            job = self._jobs.get(job_id)
+            # Finished and in-flight jobs are reused; failed ones are retried
+            if job is not None and job.status != 'error':
+                self.cache_stats.hit()
+                return job_id
+            job = self._jobs[job_id] = Job(job_id)
+        self.cache_stats.miss()
+        self._executor.submit(self._run, job, messages, model)
+        return job_id
+
+    def _run(self, job, messages, model):
+        job.started = time.time()
+        job.status = 'running'
+        try:
+            job.result = llm.chat(messages, model)
+            job.status = 'done'
+            self._save(job)
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'error'
+            with self._lock:
+                self._failed += 1
+        finally:
+            job.finished = time.time()
+            with self._lock:
+                self._latency.append(job.finished - job.submitted)
+
+    def stats(self):
+        """Queue depth, job counts and submit-to-finish latency percentiles in seconds."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            latency = list(self._latency)
+            failed = self._failed
+        return {
+            'queue_depth': sum(j.status == 'queued' for j in jobs),
+            'running': sum(j.status == 'running' for j in jobs),
+            'done': sum(j.status == 'done' for j in jobs),
+            'failed': failed,
+            'latency': llm.percentiles(latency),
+        }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """The report queue shared by every session in this process."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ReportQueue()
+    return _queue
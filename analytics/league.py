@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from analytics.backend import use_polars
+from analytics.teams import ID_TO_NAME, REGISTRY, TEAM_DTYPE
+
+SEASON = '2024-25'
+
+# Metric label -> column of the league frame
+METRICS = {
+    'Points': 'TotalPoints',
+    'League Position': 'Position',
+    'Cumulative xG': 'cum_xg',
+    'Cumulative xGA': 'cum_xga',
+    'Cumulative xPts': 'cum_xpts',
+}
+
+TEAM_LEAGUES = {tid: league for tid, league, _, _ in REGISTRY}
+
+
+def league_frame(table, season=SEASON, backend=None):
+    """
+    One row per team and round for every team in the long team table,
+    with the cumulative series the overview plots. Team-seasons are keyed
+    by (League, Season, TeamId) so frames for other seasons and leagues
+    can be concatenated and filtered without reshaping. `backend` picks the
+    library that runs the per-team totals (PL_DATA_BACKEND by default).
+    """
+    out = table[['TeamId', 'Team', 'Round', 'TotalPoints', 'Position', 'xg', 'xga', 'xpts']]
+    if use_polars(backend):
+        from analytics import polars_backend
+        out = polars_backend.cumulative_by_team(out, ['xg', 'xga', 'xpts'])
+    else:
+        out = out.sort_values(['TeamId', 'Round'], kind='stable')
+        grouped = out.groupby('TeamId', sort=False)
+        out = out.assign(cum_xg=grouped['xg'].cumsum(), cum_xga=grouped['xga'].cumsum(), cum_xpts=grouped['xpts'].cumsum())
+
+    out.insert(0, 'League', out['TeamId'].map(TEAM_LEAGUES).astype('category'))
+    out.insert(1, 'Season', pd.Categorical([season] * len(out)))
+    out['Team'] = out['TeamId'].map(ID_TO_NAME).astype(TEAM_DTYPE)
+    # Compact dtypes: the frame is what the charts serialise
+    for col in ['TeamId', 'Round', 'TotalPoints', 'Position']:
+        out[col] = out[col].astype(np.int16)
+    for col in ['xg', 'xga', 'xpts', 'cum_xg', 'cum_xga', 'cum_xpts']:
+        out[col] = out[col].astype(np.float32)
+    return out.reset_index(drop=True)
+
+
+def standings(frame):
+    """Final-round table per team-season, best position first."""
+    last = frame.groupby(['League', 'Season', 'TeamId'], observed=True, sort=False).tail(1)
+    last = last.astype({c: 'float64' for c in ['cum_xg', 'cum_xga', 'cum_xpts']})
+    table = last.assign(
+        xGD=(last['cum_xg'] - last['cum_xga']).round(2),
+        PtsVsXPts=(last['TotalPoints'] - last['cum_xpts']).round(2),
+    )
+    table = table.sort_values(['League', 'Season', 'Position'])
+    return table[['Position', 'Team', 'TotalPoints', 'cum_xpts', 'PtsVsXPts', 'cum_xg', 'cum_xga', 'xGD']].rename(columns={
+        'TotalPoints': 'Points', 'cum_xpts': 'xPts', 'PtsVsXPts': 'Pts - xPts', 'cum_xg': 'xG', 'cum_xga': 'xGA',
+    }).round(2)
+
+
+def metric_data(frame, column):
+    """The columns a chart of `column` per team and round needs."""
+    return frame[['Team', 'Round', column]]
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+API_BASE_URL = "https://openrouter.ai/api/v1"
+MODEL = "deepseek/deepseek-r1:free"
+
+# Upstream requests allowed at once per process; further requests wait in line
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+
+
+def prompt_key(messages, model=MODEL):
+    """Stable key for a prompt, used to coalesce identical requests."""
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMGateway:
+    """
+    Process-wide access point for chat completions.
+
+    - one OpenAI client (and so one pooled HTTP connection pool) for every
+      session in the process, created on first use;
+    - identical prompts already in flight share a single upstream call;
+    - at most `max_concurrency` upstream calls run at once, the rest queue;
+    - latency and queue metrics are available from `stats()`.
+    """
+
+    def __init__(self, api_key=None, base_url=None, model=MODEL,
+                 max_concurrency=MAX_CONCURRENCY, timeout=120, history=500):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self._client = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self._inflight = {}
+
+        self._counts = dict(requests=0, upstream=0, coalesced=0, errors=0)
+        self._queued = 0
+        self._running = 0
+        self._latency = deque(maxlen=history)
+        self._upstream_latency = deque(maxlen=history)
+        self._wait = deque(maxlen=history)
+
+    @property
+    def client(self):
+        # `openai` and `dotenv` are imported here rather than at page level so
+        # a page only pays for them once somebody asks for an AI report
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from dotenv import load_dotenv
+                    from openai import OpenAI
+
+                    # Load .env file from current directory
+                    load_dotenv()
+                    self._client = OpenAI(
+                        api_key=self.api_key or os.getenv("API_KEY"),
+                        base_url=self.base_url or os.getenv("LLM_BASE_URL", API_BASE_URL),
+                        timeout=self.timeout,
+                    )
+        return self._client
+
+    def chat(self, messages, model=None):
+        """Runs one chat completion and returns the stripped reply text."""
+        model = model or self.model
+        key = prompt_key(messages, model)
+        started = time.perf_counter()
+
+        with self._lock:
+            self._counts['requests'] += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self._counts['coalesced'] += 1
+
+        if leader:
+            try:
+                future.set_result(self._call(messages, model))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+        try:
+            return future.result()
+        finally:
+            with self._lock:
+                self._latency.append(time.perf_counter() - started)
+
+    def _call(self, messages, model):
+        queued_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+        with self._slots:
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait.append(started - queued_at)
+            try:
+                resp = self.client.chat.completions.create(model=model, messages=messages)
+                return resp.choices[0].message.content.strip()
+            except Exception:
+                with self._lock:
+                    self._counts['errors'] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._counts['upstream'] += 1
+                    self._upstream_latency.append(time.perf_counter() - started)
+
+    def stats(self):
+        """Counters, current queue state and latency percentiles in seconds."""
+        with self._lock:
+            out = dict(self._counts)
+            out.update(
+                queued=self._queued,
+                running=self._running,
+                inflight_prompts=len(self._inflight),
+                max_concurrency=self.max_concurrency,
+            )
+            series = {
+                'latency': list(self._latency),
+                'upstream_latency': list(self._upstream_latency),
+                'queue_wait': list(self._wait),
+            }
+        for name, values in series.items():
+            out[name] = percentiles(values)
+        return out
+
+
+def percentiles(values):
+    """p50/p95/p99/max of a list of latencies."""
+    if not values:
+        return {}
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'max': values[-1]}
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """The gateway shared by every session in this process."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway()
+    return _gateway
+
+
+def chat(messages, model=MODEL):
+    """Runs one chat completion through the shared gateway."""
+    return get_gateway().chat(messages, model)
@@ -0,0 +1,117 @@
+"""
+Content hashes of the data files the app reads, for use in cache keys.
+
+data/manifest.json maps every input file to the hash of its contents and the
+size and mtime it had when hashed:
+
+    {"data/E0.csv": {"sha1": "...", "size": 181344, "mtime_ns": ...}, ...}
+
+The data scripts update their entries after writing a file (`update()`).
+Caches put `version(paths)`, a short stamp of the files they were built from,
+in their keys, so rewriting one CSV invalidates only what depends on it. A
+file whose size or mtime no longer matches its entry (edited by hand,
+checked out from git) is re-hashed when asked for, so a stale manifest costs
+one hash, never a stale cache.
+
+Usage:
+    python -m analytics.manifest        re-hash every input and rewrite the manifest
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+
+MANIFEST_PATH = 'data/manifest.json'
+
+_lock = threading.Lock()
+_entries = None
+
+
+def input_files():
+    """Every data file the pages read."""
+    from analytics.form import APPEARANCES_PATH
+    from analytics.market import E0_PATH
+    from analytics.players import PLAYERS_PATH
+    from analytics.seasons import IDS_PATH, season_paths
+    from analytics.shots import SHOTS_PATH
+    from analytics.team_data import MEMORABLE_PATH
+    from analytics.teams import TEAM_NAMES, team_data_path
+
+    # The shot and appearance files only exist once they have been scraped,
+    # earlier seasons and their identity index once they have been added
+    optional = [path for path in [SHOTS_PATH, APPEARANCES_PATH, IDS_PATH] if os.path.exists(path)]
+    optional += [path for path in season_paths().values() if path != PLAYERS_PATH]
+    return [PLAYERS_PATH] + [team_data_path(t) for t in TEAM_NAMES] + [MEMORABLE_PATH, E0_PATH] + optional
+
+
+def _hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _read(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def file_hash(path):
+    """Content hash of `path`, from the manifest while the file is unchanged on disk."""
+    global _entries
+    st = os.stat(path)
+    with _lock:
+        if _entries is None:
+            _entries = _read()
+        entry = _entries.get(path)
+    if entry is not None and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+        return entry['sha1']
+    entry = {'sha1': _hash(path), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    with _lock:
+        _entries[path] = entry
+    return entry['sha1']
+
+
+def version(paths):
+    """Short stamp of the contents of `paths`; changes when any of them does."""
+    h = hashlib.sha1()
+    for path in sorted(paths):
+        h.update(path.encode())
+        h.update(file_hash(path).encode())
+    return h.hexdigest()[:12]
+
+
+def update(paths=None, manifest_path=MANIFEST_PATH):
+    """Re-hashes `paths` (every input by default) and writes their entries to the manifest."""
+    global _entries
+    entries = _read(manifest_path)
+    for path in paths or input_files():
+        st = os.stat(path)
+        entries[path] = {'sha1': _hash(path), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    entries = dict(sorted(entries.items()))
+    tmp = f'{manifest_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=1)
+        f.write('\n')
+    os.replace(tmp, manifest_path)
+    with _lock:
+        _entries = None
+    return entries
+
+
+def main(argv):
+    if argv:
+        print(__doc__)
+        return 1
+    entries = update()
+    print(f'Hashed {len(entries)} files into {MANIFEST_PATH}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+
+from analytics.teams import team_id, team_ids, team_names
+
+E0_PATH = 'data/E0.csv'
+
+# Bookmaker prefixes used by football-data.co.uk in E0.csv
+BOOKMAKERS = {
+    'B365': 'Bet365',
+    'BW': 'Bet&Win',
+    'BF': 'Betfair',
+    'PS': 'Pinnacle',
+    'WH': 'William Hill',
+    '1XB': '1xBet',
+    'Max': 'Market Maximum',
+    'Avg': 'Market Average',
+    'BFE': 'Betfair Exchange',
+}
+
+# Over/under and Asian handicap columns use a shorter prefix for Pinnacle
+_SIDE_MARKET_PREFIX = {'PS': 'P'}
+
+# Outcomes per market, in the order they are stacked
+MARKETS = {
+    '1X2': ['H', 'D', 'A'],
+    'OU25': ['>2.5', '<2.5'],
+    'AH': ['AHH', 'AHA'],
+}
+
+MATCH_COLS = ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR']
+
+
+def odds_columns(book, market='1X2', closing=False):
+    """Column names holding `book`'s odds for `market`, one per outcome."""
+    if market == '1X2':
+        prefix = book + ('C' if closing else '')
+    else:
+        prefix = _SIDE_MARKET_PREFIX.get(book, book) + ('C' if closing else '')
+    return [prefix + outcome for outcome in MARKETS[market]]
+
+
+def available_bookmakers(path=E0_PATH, market='1X2', closing=False):
+    """
+    Bookmakers with a full set of columns for `market` in the file header.
+
+    A column can be in the header and still be blank for part of the season
+    (a bookmaker football-data.co.uk stopped collecting); `odds_coverage()`
+    counts the matches each one actually priced.
+    """
+    header = set(pd.read_csv(path, nrows=0).columns)
+    return [b for b in BOOKMAKERS if set(odds_columns(b, market, closing)) <= header]
+
+
+def odds_coverage(books, market='1X2', closing=False, path=E0_PATH):
+    """{bookmaker: matches with odds for every outcome} of `books`, and the number of matches."""
+    cols = {b: odds_columns(b, market, closing) for b in books}
+    df = pd.read_csv(path, usecols=[c for cs in cols.values() for c in cs])
+    return {b: int(df[cs].notna().all(axis=1).sum()) for b, cs in cols.items()}, len(df)
+
+
+def load_matches(path=E0_PATH):
+    """Fixture and result columns only, one row per match."""
+    df = pd.read_csv(path, usecols=MATCH_COLS, parse_dates=['Date'], dayfirst=True)
+    return df[MATCH_COLS]
+
+
+def load_bookmaker_odds(book, market='1X2', closing=False, path=E0_PATH):
+    """
+    Reads only one bookmaker's columns for one market.
+
+    Odds are kept as float32 columns so that loading more bookmakers or more
+    seasons only costs the columns that are actually requested.
+    """
+    cols = odds_columns(book, market, closing)
+    df = pd.read_csv(path, usecols=cols)
+    return df[cols].astype(np.float32)
+
+
+def implied_probabilities(odds):
+    """
+    Converts decimal odds into margin-free implied probabilities.
+
+    `odds` is an array of shape (matches, bookmakers, outcomes). Raw implied
+    probabilities (1 / odds) are normalised so each bookmaker's outcomes sum
+    to one, which removes the overround proportionally. Missing odds give NaN
+    for the whole bookmaker/match slice.
+    """
+    raw = 1.0 / np.asarray(odds, dtype=np.float32)
+    return raw / raw.sum(axis=-1, keepdims=True)
+
+
+def overround(odds):
+    """Bookmaker margin per match and bookmaker (sum of 1/odds minus one)."""
+    return (1.0 / np.asarray(odds, dtype=np.float32)).sum(axis=-1) - 1.0
+
+
+def stack_odds(frames):
+    """Stacks per-bookmaker odds frames into a (matches, bookmakers, outcomes) array."""
+    return np.stack([f.to_numpy() for f in frames], axis=1)
+
+
+def market_probabilities(books, market='1X2', closing=False, loader=load_bookmaker_odds):
+    """
+    Implied probabilities for several bookmakers at once.
+
+    Returns a long frame with one row per match and bookmaker and one column
+    per outcome, plus the bookmaker's margin on that match.
+    """
+    frames = [loader(b, market, closing) for b in books]
+    odds = stack_odds(frames)
+    probs = implied_probabilities(odds)
+    margin = overround(odds)
+
+    n_matches = odds.shape[0]
+    out = pd.DataFrame(
+        probs.reshape(-1, probs.shape[-1]),
+        columns=[f'p{o}' for o in MARKETS[market]]
+    )
+    out.insert(0, 'Bookmaker', np.tile(np.asarray(books, dtype=object), n_matches))
+    out.insert(0, 'Match', np.repeat(np.arange(n_matches), len(books)))
+    out['Margin'] = margin.reshape(-1)
+    return out
+
+
+def team_market_frame(matches, probs):
+    """
+    Long format with one row per team per match and bookmaker.
+
+    Rounds are assigned the same way as `data/teams_data.py` (per-team match
+    order by date) so the result lines up with the team_data files. Matches
+    that any of the bookmakers did not price are then dropped, for every
+    bookmaker: points and expectations are only compared over matches that
+    all of them have odds for.
+    """
+    m = matches.reset_index(drop=True).copy()
+    m['Match'] = np.arange(len(m))
+    m = m.merge(probs, on='Match')
+
+    home = pd.DataFrame({
+        'Match': m['Match'], 'Date': m['Date'], 'Bookmaker': m['Bookmaker'],
+        'Team': m['HomeTeam'], 'Opponent': m['AwayTeam'], 'Venue': 'home',
+        'GF': m['FTHG'], 'GA': m['FTAG'],
+        'pWin': m['pH'], 'pDraw': m['pD'], 'pLoss': m['pA'], 'Margin': m['Margin'],
+    })
+    away = pd.DataFrame({
+        'Match': m['Match'], 'Date': m['Date'], 'Bookmaker': m['Bookmaker'],
+        'Team': m['AwayTeam'], 'Opponent': m['HomeTeam'], 'Venue': 'away',
+        'GF': m['FTAG'], 'GA': m['FTHG'],
+        'pWin': m['pA'], 'pDraw': m['pD'], 'pLoss': m['pH'], 'Margin': m['Margin'],
+    })
+    long = pd.concat([home, away], ignore_index=True)
+    # E0.csv short names ("Man City", "Wolves") resolved through the registry
+    long['TeamId'] = team_ids(long['Team'])
+    long['Team'] = team_names(long['Team'])
+    long['Opponent'] = team_names(long['Opponent'])
+
+    long['Points'] = np.select(
+        [long['GF'] > long['GA'], long['GF'] == long['GA']], [3, 1], 0
+    )
+    long['MarketXPts'] = 3 * long['pWin'] + long['pDraw']
+
+    long = long.sort_values(['Bookmaker', 'TeamId', 'Date']).reset_index(drop=True)
+    long['Round'] = long.groupby(['Bookmaker', 'TeamId']).cumcount() + 1
+    # Rounds are numbered over the whole season before unpriced matches go
+    unpriced = long['pWin'].isna().groupby(long['Match']).transform('any')
+    return long[~unpriced].reset_index(drop=True)
+
+
+def compare_with_understat(long, team_frames):
+    """
+    Joins market expectations with Understat xPts and actual points.
+
+    `team_frames` maps team name to its team_data frame (Round, xpts, ...).
+    Adds cumulative market xPts, Understat xPts and points per bookmaker.
+    """
+    understat = pd.concat(
+        [f[['Round', 'xpts']].assign(TeamId=team_id(team)) for team, f in team_frames.items()],
+        ignore_index=True
+    )
+    out = long.merge(understat, on=['TeamId', 'Round'], how='left')
+    out = out.sort_values(['Bookmaker', 'TeamId', 'Round']).reset_index(drop=True)
+    grouped = out.groupby(['Bookmaker', 'TeamId'])
+    out['cum_points'] = grouped['Points'].cumsum()
+    out['cum_market_xpts'] = grouped['MarketXPts'].cumsum()
+    out['cum_xpts'] = grouped['xpts'].cumsum()
+    return out
+
+
+def season_summary(compared):
+    """
+    Per team and bookmaker: points against market and Understat expectations,
+    over the matches `compared` kept (those every bookmaker priced).
+    """
+    summary = compared.groupby(['Bookmaker', 'Team'], observed=True).agg(
+        Points=('Points', 'sum'),
+        MarketXPts=('MarketXPts', 'sum'),
+        UnderstatXPts=('xpts', 'sum'),
+    ).reset_index()
+    summary['vsMarket'] = summary['Points'] - summary['MarketXPts']
+    summary['vsUnderstat'] = summary['Points'] - summary['UnderstatXPts']
+    return summary.round(2)
@@ -0,0 +1,214 @@
+"""
+Memorable matches, detected for every team from the season's match data.
+
+`match_frame()` turns E0.csv into one row per team and match (rounds
+numbered as in data/teams_data.py) and joins the team table's Understat xG
+and xPts on (TeamId, Round). `score_matches()` then scores every row at once,
+from whole columns of that frame:
+
+    margin     goal difference, capped at -3 and 6
+    surprise   points won minus xPts: a result the chances did not promise
+    opponent   the opponent's points per game that season against the league
+               average, scaled by the share of the points taken from them
+    comeback   how much the result improved on the half-time score
+    late       goals from the 80th minute on that changed the result (from
+               the shot data when it has been scraped, else 0)
+
+The memorable score is their weighted sum (WEIGHTS). `memorable_matches()`
+keeps each team's top N of every season, ranked, with a description of what
+made them stand out. Scoring is column arithmetic plus one grouped sort, so
+dozens of seasons take well under a second (benchmarks/memorable.py).
+
+Usage:
+    python -m analytics.memorable [--top N]     write MEMORABLE_PATH from the current data
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analytics.teams import ID_TO_NAME, team_ids
+
+SEASON = '2024-25'
+
+# E0.csv columns of the home and away side: GF, GA, HT GF, HT GA, shots, shots against, on target, against
+E0_SIDES = {
+    'home': ['FTHG', 'FTAG', 'HTHG', 'HTAG', 'HS', 'AS', 'HST', 'AST'],
+    'away': ['FTAG', 'FTHG', 'HTAG', 'HTHG', 'AS', 'HS', 'AST', 'HST'],
+}
+SIDE_COLS = ['GF', 'GA', 'HTGF', 'HTGA', 'Shots', 'ShotsAgainst', 'ShotsOnTarget', 'ShotsOnTargetAgainst']
+
+WEIGHTS = {'margin': 1.0, 'surprise': 0.75, 'opponent': 3.0, 'comeback': 1.5, 'late': 1.5}
+
+# Goals from this minute on count as late
+LATE_MINUTE = 80
+
+# Memorable matches kept per team and season
+TOP_N = 3
+
+# xG deficit from which a win or draw is described as against the chances
+XG_GAP = 0.3
+
+
+def match_frame(e0, team_table, season=SEASON):
+    """
+    One row per team and match of E0.csv (read with Date parsed), with the
+    team table's xg, xga and xpts joined on (TeamId, Round).
+    """
+    sides = []
+    for venue, cols in E0_SIDES.items():
+        team, opponent = ('HomeTeam', 'AwayTeam') if venue == 'home' else ('AwayTeam', 'HomeTeam')
+        side = e0[cols].set_axis(SIDE_COLS, axis=1)
+        side.insert(0, 'Date', e0['Date'])
+        side.insert(1, 'TeamId', team_ids(e0[team]).to_numpy())
+        side.insert(2, 'OpponentId', team_ids(e0[opponent]).to_numpy())
+        side.insert(3, 'Venue', venue)
+        sides.append(side)
+    long = pd.concat(sides, ignore_index=True).sort_values(['TeamId', 'Date'], kind='stable', ignore_index=True)
+    long['Round'] = long.groupby('TeamId').cumcount() + 1
+    long.insert(0, 'Season', season)
+
+    understat = team_table[['TeamId', 'Round', 'xg', 'xga', 'xpts']]
+    return long.merge(understat, on=['TeamId', 'Round'], how='left')
+
+
+def late_goals(shots, minute=LATE_MINUTE):
+    """
+    Goals from `minute` on that turned a defeat into a draw or a draw into a
+    win for the scoring team, counted per (Date, TeamId) (Date is the day).
+    """
+    goals = shots[shots['Result'].isin(['Goal', 'OwnGoal'])]
+    goals = goals.sort_values(['MatchId', 'Minute', 'ShotId'], kind='stable')
+    # Running score from the point of view of the lower team id of each match
+    sign = np.where(goals['TeamId'] < goals['OpponentId'], 1, -1)
+    after = pd.Series(sign, index=goals.index).groupby(goals['MatchId'].to_numpy()).cumsum().to_numpy()
+    before = (after - sign) * sign   # the scorer's goal difference before the goal
+    late = (goals['Minute'].to_numpy() >= minute) & (before <= 0) & (before >= -1)
+    keys = pd.DataFrame({'Date': goals['Date'].dt.normalize().to_numpy(), 'TeamId': goals['TeamId'].to_numpy()})
+    return keys[late].value_counts().rename('Late')
+
+
+def score_matches(matches, shots=None, weights=WEIGHTS):
+    """`matches` (match_frame rows, any number of seasons) with every component and the Score."""
+    out = matches.copy()
+    gd = out['GF'] - out['GA']
+    points = np.select([gd > 0, gd == 0], [3, 1], 0)
+    out['Points'] = points
+
+    # Opponent strength: points per game in the same season, against that season's average
+    ppg = out.groupby(['Season', 'TeamId'])['Points'].transform('mean')
+    strength = pd.DataFrame({'Season': out['Season'], 'OpponentId': out['TeamId'], 'OpponentPPG': ppg})
+    strength = strength.drop_duplicates(['Season', 'OpponentId'])
+    out = out.merge(strength, on=['Season', 'OpponentId'], how='left')
+    league_ppg = out.groupby('Season')['Points'].transform('mean')
+
+    components = pd.DataFrame({
+        'margin': gd.clip(-3, 6).to_numpy(),
+        'surprise': (points - out['xpts']).fillna(0).to_numpy(),
+        'opponent': ((out['OpponentPPG'] - league_ppg) * points / 3).to_numpy(),
+        'comeback': np.maximum(np.sign(gd) - np.sign(out['HTGF'] - out['HTGA']), 0).to_numpy(),
+        'late': 0.0,
+    }, index=out.index)
+    if shots is not None:
+        late = late_goals(shots)
+        keys = pd.MultiIndex.from_arrays([out['Date'].dt.normalize(), out['TeamId']])
+        components['late'] = late.reindex(keys).fillna(0).to_numpy()
+
+    out = pd.concat([out, components], axis=1)
+    out['Score'] = sum(weights[c] * components[c] for c in weights)
+    return out
+
+
+def _ordinal(n):
+    return f"{n}{'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')}"
+
+
+def describe(row, opponent_rank, best_margin):
+    """'5–1 win over Manchester City at home — against the 2nd best side, came from behind at half time'."""
+    gd = row['GF'] - row['GA']
+    result = 'win over' if gd > 0 else 'draw with' if gd == 0 else 'defeat to'
+    text = f"{row['GF']}–{row['GA']} {result} {ID_TO_NAME[row['OpponentId']]} {'at home' if row['Venue'] == 'home' else 'away'}"
+
+    reasons = []
+    if row['late'] > 0:
+        reasons.append(f'decided after the {_ordinal(LATE_MINUTE)} minute')
+    if row['HTGF'] < row['HTGA'] and gd >= 0:
+        reasons.append(f"came from {row['HTGF']}–{row['HTGA']} down at half time")
+    if row['opponent'] > 0 and opponent_rank <= 6:
+        reasons.append(f"against the {_ordinal(opponent_rank) + ' ' if opponent_rank > 1 else ''}best side of the season")
+    if gd >= 3 and gd == best_margin:
+        reasons.append('biggest win of the season')
+    if row['surprise'] >= 1 and row['xga'] - row['xg'] >= XG_GAP:
+        reasons.append(f"only {row['xg']:.1f}–{row['xga']:.1f} on xG")
+    return text + (' — ' + ', '.join(reasons) if reasons else '')
+
+
+def memorable_matches(scored, n=TOP_N):
+    """
+    Each team's `n` highest-scoring matches of every season, in the memory
+    card format, ranked 1..n per team and season.
+    """
+    top = scored.sort_values(['Season', 'TeamId', 'Score'], ascending=[True, True, False], kind='stable')
+    top = top.groupby(['Season', 'TeamId'], sort=False).head(n).reset_index(drop=True)
+    top['rank'] = top.groupby(['Season', 'TeamId']).cumcount() + 1
+
+    # Context for the descriptions: league rank by points per game, each team's biggest win
+    ppg = scored.groupby(['Season', 'TeamId'])['Points'].mean()
+    rank = ppg.groupby(level='Season').rank(ascending=False, method='min').astype(int)
+    best = scored.assign(GD=scored['GF'] - scored['GA']).groupby(['Season', 'TeamId'])['GD'].max()
+    descriptions = [
+        describe(row, rank[(row['Season'], row['OpponentId'])], best[(row['Season'], row['TeamId'])])
+        for _, row in top.iterrows()
+    ]
+
+    return pd.DataFrame({
+        'season': top['Season'],
+        'rank': top['rank'],
+        'team': top['TeamId'].map(ID_TO_NAME),
+        'opponent': top['OpponentId'].map(ID_TO_NAME),
+        'venue': top['Venue'],
+        'date': top['Date'].dt.strftime('%Y-%m-%d'),
+        'score': top['GF'].astype(str) + '–' + top['GA'].astype(str),
+        'ht_score': top['HTGF'].astype(str) + '–' + top['HTGA'].astype(str),
+        'xg': top['xg'].round(3),
+        'xga': top['xga'].round(3),
+        'xpts': top['xpts'].round(2),
+        'shots': top['Shots'],
+        'shots_against': top['ShotsAgainst'],
+        'shots_on_target': top['ShotsOnTarget'],
+        'shots_on_target_against': top['ShotsOnTargetAgainst'],
+        'memorable_score': top['Score'].round(2),
+        'description': descriptions,
+    })
+
+
+def detect(n=TOP_N):
+    """Memorable matches of the current season from E0.csv, the team table and (if scraped) the shots."""
+    import os
+
+    from analytics import market, shots, team_data
+
+    e0 = pd.read_csv(market.E0_PATH, parse_dates=['Date'], dayfirst=True)
+    matches = match_frame(e0, team_data.load_team_table())
+    shot_table = shots.load_shots() if os.path.exists(shots.SHOTS_PATH) else None
+    return memorable_matches(score_matches(matches, shot_table), n)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=TOP_N, help='memorable matches kept per team')
+    args = parser.parse_args(argv)
+
+    from analytics import manifest
+    from analytics.team_data import MEMORABLE_PATH
+
+    df = detect(args.top)
+    df.to_csv(MEMORABLE_PATH, index=False)
+    manifest.update([MEMORABLE_PATH])
+    print(df[df['rank'] == 1][['team', 'memorable_score', 'description']].to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
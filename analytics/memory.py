@@ -0,0 +1,88 @@
+"""
+Memory footprint of the player table, per column and per page.
+
+Usage:
+    python -m analytics.memory [--copies N]
+
+Prints the footprint of the table as loaded (compact dtypes) next to the
+plain pandas dtypes it replaced. --copies stacks N copies of the season to
+stand in for a multi-league table.
+"""
+import argparse
+import sys
+
+import pandas as pd
+
+from analytics import players as _players
+from analytics.profiles import RADAR_STATS_MAP, STATS_MAP
+from analytics.tots import METRIC_GROUPS
+
+_IDENTITY = ['Player Name', 'Club', 'PosCat', 'Minutes']
+
+
+def _stats(stat_maps):
+    return [stat for stat_map in stat_maps for stats in stat_map.values() for stat in stats]
+
+
+# Columns of the player table each page reads (per90 values on Player
+# Analysis / Comparison are derived from the counts, see stat_values)
+PAGE_COLUMNS = {
+    'Player Analysis': _IDENTITY + ['Nationality', 'Appearances', 'Yellow Cards', 'Red Cards']
+                       + _stats([STATS_MAP, RADAR_STATS_MAP]),
+    'Player Comparison': _IDENTITY + _stats([RADAR_STATS_MAP]),
+    'Team Of The Season': ['Player Name', 'PosCat', 'Minutes']
+                          + [stat for groups in METRIC_GROUPS.values() for metrics in groups.values() for stat in metrics],
+    'Player search': ['Player Name', 'Club', 'PosCat'],
+}
+
+
+def memory_report(df=None):
+    """
+    (per column, per page) memory of the player table (`players()` by
+    default): dtype and bytes of every column, largest first, and the bytes
+    of the columns each page reads.
+    """
+    if df is None:
+        from analytics import datasets
+        df = datasets.players()
+    usage = df.memory_usage(deep=True, index=False)
+    columns = pd.DataFrame({'dtype': df.dtypes.astype(str), 'bytes': usage}).sort_values('bytes', ascending=False)
+
+    pages = []
+    for page, cols in PAGE_COLUMNS.items():
+        cols = [c for c in dict.fromkeys(cols) if c in df.columns]
+        pages.append({'page': page, 'columns': len(cols), 'bytes': int(usage[cols].sum())})
+    pages.append({'page': 'Whole table', 'columns': df.shape[1], 'bytes': int(usage.sum())})
+    return columns, pd.DataFrame(pages).set_index('page')
+
+
+def _load(copies, compact):
+    raw = pd.read_csv(_players.PLAYERS_PATH)
+    raw = pd.concat([raw] * copies, ignore_index=True)
+    return _players.prepare_players(raw, compact=compact)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--copies', type=int, default=1, help='stack N copies of the season (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    plain_cols, plain_pages = memory_report(_load(args.copies, compact=False))
+    cols, pages = memory_report(_load(args.copies, compact=True))
+
+    kib = lambda b: f'{b / 1024:,.1f} KiB'
+    print(f'Player table, {args.copies} season(s):\n')
+    print(f'{"page":22s} {"columns":>7s} {"plain dtypes":>14s} {"compact":>12s} {"ratio":>6s}')
+    for page, row in pages.iterrows():
+        before = plain_pages.at[page, 'bytes']
+        print(f'{page:22s} {row["columns"]:7d} {kib(before):>14s} {kib(row["bytes"]):>12s} {before / row["bytes"]:5.1f}x')
+
+    print(f'\n{"largest columns":32s} {"dtype":>10s} {"bytes":>12s} {"was":>22s}')
+    for col, row in cols.head(15).iterrows():
+        print(f'{col:32s} {row["dtype"]:>10s} {kib(row["bytes"]):>12s} '
+              f'{plain_cols.at[col, "dtype"]:>10s} {kib(plain_cols.at[col, "bytes"]):>11s}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from analytics.backend import use_polars
+from analytics.players import stat_values
+
+# Stats where a low value is the good one; their percentiles are flipped
+LOWER_IS_BETTER = {'Goals Conceded', 'Own Goals', 'Fouls', 'Hit Woodwork', 'Big Chances Missed'}
+
+# A (position, usage) or archetype pool smaller than this is ranked against the whole position
+MIN_POOL = 5
+
+# Columns that describe a player rather than measure them
+_NOT_STATS = {'Player Name', 'Club', 'ClubId', 'Nationality', 'Position', 'PosCat', 'Archetype', 'Minutes', 'Appearances'}
+
+# Who a player is ranked against: players of the same position and usage
+# bucket, or of the same role archetype (analytics/archetypes.py)
+POOLS = ('position', 'archetype')
+
+
+def usage_bucket(minutes):
+    """'high' (> 1500 min), 'mid' (700-1500) or 'low' (< 700) for each player."""
+    minutes = np.asarray(minutes)
+    return np.select([minutes > 1500, minutes >= 700], ['high', 'mid'], 'low')
+
+
+def numeric_values(s):
+    """Stat values as floats; '72%' style strings become 72.0."""
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+    return pd.to_numeric(s.astype(str).str.rstrip('%'), errors='coerce')
+
+
+def stat_names(df):
+    """Every raw stat of the player table (per90 variants are derived by stat_values)."""
+    return [c for c in df.columns if c not in _NOT_STATS and not c.endswith(' per90')]
+
+
+def pool_keys(df, pool='position'):
+    """Second key of each player's pool within their position: usage bucket or archetype."""
+    if pool not in POOLS:
+        raise ValueError(f'Unknown percentile pool {pool!r} (expected one of {", ".join(POOLS)})')
+    if pool == 'archetype':
+        return df['Archetype'].astype(str).to_numpy()
+    return usage_bucket(df['Minutes'])
+
+
+def percentile_matrix(df, stats=None, backend=None, pool='position'):
+    """
+    Percentile rank (0-1, ascending) of every player for every stat, within
+    the pool of players with the same position and usage bucket (or, with
+    pool='archetype', the same role archetype). Rows follow `df`'s index,
+    columns are stat names; per90 stats are ranked on their per90 values.
+    Built once, so looking up any number of players is an indexing
+    operation rather than a ranking pass per player and stat. `backend`
+    picks the library that ranks (PL_DATA_BACKEND by default).
+    """
+    stats = stat_names(df) if stats is None else stats
+    values = pd.DataFrame({stat: numeric_values(stat_values(df, stat)) for stat in stats}, index=df.index)
+
+    pos = df['PosCat']
+    bucket = pd.Series(pool_keys(df, pool), index=df.index)
+    if use_polars(backend):
+        from analytics import polars_backend
+        return polars_backend.pooled_ranks(values, pos, bucket.to_numpy(), MIN_POOL)
+    pooled = values.groupby([pos, bucket]).rank(pct=True)
+
+    pool_size = pos.groupby([pos, bucket]).transform('size')
+    small = (pool_size < MIN_POOL).to_numpy()
+    if small.any():
+        whole_position = values.groupby(pos).rank(pct=True)
+        pooled[small] = whole_position[small]
+    # One float block, so lookups index a single array without copying
+    return pd.DataFrame(pooled.to_numpy(dtype=float), index=pooled.index, columns=pooled.columns)
+
+
+def lookup(matrix, players, stats):
+    """
+    Percentiles (0-1, higher is better) for `players` (index labels) x `stats`
+    in one vectorized lookup; stats where less is better are flipped and
+    missing values are 0.
+    """
+    rows = matrix.index.get_indexer(players)
+    cols = matrix.columns.get_indexer(stats)
+    if (rows < 0).any() or (cols < 0).any():
+        raise KeyError('Unknown player or stat')
+    ranks = matrix.to_numpy()[np.ix_(rows, cols)]
+    flip = np.array([s in LOWER_IS_BETTER for s in stats])
+    return np.nan_to_num(np.where(flip, 1 - ranks, ranks))
@@ -0,0 +1,56 @@
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from analytics.form import form_column
+
+
+def radar_figure(radar_vals, color):
+    """Filled polar chart of a player's radar percentiles (0-1)."""
+    # Build a small DataFrame for the radar
+    categories = list(radar_vals.keys())
+    values = list(radar_vals.values())
+
+    # Close the loop for radar
+    categories += [categories[0]]
+    values += [values[0]]
+
+    radar_df = pd.DataFrame({
+        'Metric': categories,
+        'Percentile': values
+    })
+
+    fig = px.line_polar(
+        radar_df,
+        r='Percentile',
+        theta='Metric',
+        line_close=True,
+        template=None
+    )
+    fig.update_traces(fill='toself', line_color=color)
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(range=[0,1], showticklabels=False, ticks=''),
+            angularaxis=dict(tickfont_size=14)
+        ),
+        showlegend=False,
+        margin=dict(l=120, r=120, t=100, b=100),
+        width=600,
+        height=600
+    )
+    return fig
+
+
+def form_figure(rows, stat, windows, color):
+    """A player's rolling per-90 `stat` over each window, by match date."""
+    fig = go.Figure()
+    for window, dash in zip(windows, ['solid', 'dot']):
+        fig.add_trace(go.Scatter(
+            x=rows['Date'], y=rows[form_column(stat, window)], mode='lines+markers',
+            name=f'Last {window}', line=dict(color=color, dash=dash)
+        ))
+    fig.update_layout(
+        yaxis_title=f'{stat} per 90', hovermode='x unified', template=None,
+        legend=dict(orientation='h', y=1.1), margin=dict(l=40, r=20, t=40, b=40), height=380
+    )
+    return fig
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+from analytics.backend import use_polars
+from analytics.teams import team_ids, team_names
+
+PLAYERS_PATH = 'data/players_data/epl_player_stats_2024_25.csv'
+
+# Stats shown per 90 minutes on Player Analysis and Player Comparison
+PER90_COLS = [
+    'Goals','Assists','Shots','Touches','Passes','Successful Passes','Through Balls',
+    'Progressive Carries','fThird Passes','Successful fThird Passes','Tackles','Interceptions',
+    'Blocks','Clearances','Clearances Off Line','Possession Won','Ground Duels','Aerial Duels',
+    'Fouls','Saves','Penalties Saved','Own Goals','Goals Conceded','Punches','High Claims'
+]
+
+# TOTS scoring also uses per-90 goals prevented and big chances missed
+TOTS_PER90_COLS = [
+    'Goals','Assists','Shots','Touches','Passes','Successful Passes',
+    'Through Balls','Progressive Carries','fThird Passes',
+    'Successful fThird Passes','Tackles','Interceptions',
+    'Blocks','Clearances','Possession Won','Ground Duels',
+    'Aerial Duels','Fouls','Saves','Penalties Saved',
+    'Goals Conceded','Own Goals','Punches','High Claims','Goals Prevented','Big Chances Missed'
+]
+
+# Every per90 column the prepared table carries
+ALL_PER90_COLS = list(dict.fromkeys(PER90_COLS + TOTS_PER90_COLS))
+
+
+# Position code -> category, first match wins
+POSITION_CODES = [('GKP', 'Goalkeeper'), ('DEF', 'Defender'), ('MID', 'Midfielder'), ('FWD', 'Forward')]
+
+
+def map_pos(p):
+    """Map detailed positions to categories."""
+    p = str(p).upper()
+    for code, category in POSITION_CODES:
+        if code in p:
+            return category
+    return 'Other'
+
+
+def position_categories(positions):
+    """map_pos() of a whole Series, as one string match per code instead of a call per row."""
+    upper = positions.astype(str).str.upper()
+    matches = [upper.str.contains(code, regex=False, na=False).to_numpy() for code, _ in POSITION_CODES]
+    categories = np.select(matches, [category for _, category in POSITION_CODES], 'Other')
+    return pd.Series(categories, index=positions.index, dtype='str')
+
+
+# Text columns with few distinct values, stored as categoricals
+CATEGORY_COLS = ['Club', 'Nationality', 'Position', 'PosCat', 'Archetype']
+
+
+def is_percent(col):
+    """Columns like 'Saves %' / 'Passes%' hold percentages (stored as numbers, shown with '%')."""
+    return col.endswith('%')
+
+
+def compact_dtypes(df):
+    """
+    The table with the smallest dtypes that hold its values: counts as
+    int8/int16, other floats (per90s included) as float32, '31%' strings as
+    numbers and repeated text as categoricals.
+    """
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col in CATEGORY_COLS:
+            s = s.astype('category')
+        elif is_percent(col) and not pd.api.types.is_numeric_dtype(s):
+            s = pd.to_numeric(s.astype(str).str.rstrip('%'), errors='coerce', downcast='integer')
+        elif pd.api.types.is_integer_dtype(s):
+            s = pd.to_numeric(s, downcast='integer')
+        if pd.api.types.is_float_dtype(s):
+            s = s.astype(np.float32)
+        out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+def prepare_players(df, compact=True, backend=None):
+    """
+    Adds PosCat, ClubId and the per90 columns used by the pages, in compact
+    dtypes. `backend` ('pandas' or 'polars', PL_DATA_BACKEND by default)
+    only changes how the columns are computed, not the result.
+    """
+    if use_polars(backend):
+        from analytics import polars_backend
+        return _finish(df, polars_backend.prepare_players(df, ALL_PER90_COLS, POSITION_CODES), compact)
+
+    # Per90s are computed in float64 and only then stored as float32
+    derived = pd.DataFrame({'PosCat': position_categories(df['Position'])}, index=df.index)
+    per90 = {col + ' per90': df[col] / df['Minutes'] * 90 for col in ALL_PER90_COLS if col in df.columns}
+    return _finish(df, pd.concat([derived, pd.DataFrame(per90, index=df.index)], axis=1), compact)
+
+
+def _finish(df, derived, compact):
+    """`df` with the derived columns (PosCat, then the per90s) and ClubId."""
+    df = df.assign(PosCat=derived['PosCat'])
+    if 'ClubId' not in df.columns:
+        df['ClubId'] = team_ids(df['Club'])
+        df['Club'] = team_names(df['Club']).astype(str)
+    df = pd.concat([df, derived.drop(columns='PosCat')], axis=1)
+    return compact_dtypes(df) if compact else df
+
+
+def load_players(path=PLAYERS_PATH, compact=True, backend=None):
+    if use_polars(backend):
+        from analytics import polars_backend
+        df, derived = polars_backend.load_players(path, ALL_PER90_COLS, POSITION_CODES)
+        return _finish(df, derived, compact)
+    return prepare_players(pd.read_csv(path), compact, backend)
+
+
+def stat_column(stat, per90_cols=PER90_COLS):
+    """Per90 column for `stat` if the page shows it per 90, else the raw column."""
+    return stat + ' per90' if stat in per90_cols else stat
+
+
+def stat_values(data, stat, per90_cols=PER90_COLS):
+    """
+    Values of `stat` as the pages show them, for a table or a single row.
+    Per90s are recomputed in float64 from the count and the minutes: the
+    stored float32 per90 columns can land on the other side of a rounding
+    boundary ('0.22' instead of '0.23') or tie two players that differ.
+    """
+    if stat in per90_cols:
+        return data[stat] / data['Minutes'] * 90
+    return data[stat]
@@ -0,0 +1,110 @@
+"""
+Polars implementations of the shared data transforms (PL_DATA_BACKEND=polars).
+
+Each function takes and returns the same pandas objects as its pandas
+counterpart, so callers never see a Polars frame: the work in between runs
+as one lazy Polars query, which evaluates independent columns and groups on
+all cores. Results match the pandas backend (benchmarks/data_backend.py checks
+this): the same float64 arithmetic in the same order and the same dtypes on
+the way out. The one difference is CSV parsing: Polars rounds every decimal
+correctly, while pandas' default parser can be one ulp off on long decimals
+(the cumulative xG columns of the team CSVs), far below anything displayed.
+"""
+import pandas as pd
+import polars as pl
+
+
+# Rows read to infer column types. Inferring from the whole file is the
+# slowest part of a read; a sample is enough unless a later row fails to
+# parse as the sampled type, in which case the file is read again.
+SCHEMA_SAMPLE = 10_000
+
+
+def _collect_csv(paths, query=lambda lf, path: lf):
+    """query(scan of each path) collected in parallel, re-inferring types from whole files if needed."""
+    for infer in (SCHEMA_SAMPLE, None):
+        try:
+            return pl.collect_all([query(pl.scan_csv(path, infer_schema_length=infer), path) for path in paths])
+        except pl.exceptions.ComputeError:
+            if infer is None:
+                raise
+
+
+def position_categories(position, codes):
+    """Expression: first category of `codes` ((code, category), ...) found in the upper-cased position."""
+    upper = position.cast(pl.String).str.to_uppercase()
+    expr = pl
+    for code, category in codes:
+        expr = expr.when(upper.str.contains(code, literal=True)).then(pl.lit(category))
+    return expr.otherwise(pl.lit('Other'))
+
+
+def _derived(lf, columns, per90_cols, codes):
+    """`lf` with PosCat and the per90 columns appended, in the pandas backend's column order."""
+    return lf.with_columns(
+        position_categories(pl.col('Position'), codes).alias('PosCat'),
+        *[(pl.col(col) / pl.col('Minutes') * 90).alias(col + ' per90') for col in per90_cols if col in columns],
+    )
+
+
+def prepare_players(df, per90_cols, codes):
+    """PosCat and the per90 columns of `df`, as a frame on `df`'s index."""
+    lf = _derived(pl.from_pandas(df, include_index=False).lazy(), df.columns, per90_cols, codes)
+    new = lf.drop(list(df.columns)).collect().to_pandas()
+    new.index = df.index
+    return new
+
+
+def load_players(path, per90_cols, codes):
+    """
+    (the table pd.read_csv(path) reads, prepare_players() of it), read and
+    derived in one query so the table is only converted to pandas once.
+    """
+    columns = []
+
+    def query(lf, path):
+        columns[:] = lf.collect_schema().names()
+        return _derived(lf, columns, per90_cols, codes)
+
+    out = _collect_csv([path], query)[0].to_pandas()
+    # pandas' name for an unnamed (index) column
+    df = out.iloc[:, :len(columns)].rename(columns={'': 'Unnamed: 0'})
+    return df, out.iloc[:, len(columns):]
+
+
+def pooled_ranks(values, pos, bucket, min_pool):
+    """
+    Percentile rank (pct=True, average ties) of every column of `values`
+    within its (pos, bucket) pool, or within the whole position where the
+    pool has fewer than `min_pool` players.
+    """
+    stats = list(values.columns)
+    frame = pl.from_pandas(values.reset_index(drop=True), nan_to_null=True).with_columns(
+        pl.Series('_pos', pos.astype(str).to_numpy()),
+        pl.Series('_bucket', bucket),
+    )
+    pool = ['_pos', '_bucket']
+    small = pl.len().over(pool) < min_pool
+
+    def pct(col, group):
+        return pl.col(col).rank('average').over(group) / pl.col(col).count().over(group)
+
+    ranked = frame.lazy().select([
+        pl.when(small).then(pct(col, '_pos')).otherwise(pct(col, pool)).cast(pl.Float64).alias(col) for col in stats
+    ]).collect()
+    return pd.DataFrame(ranked.to_numpy(), index=values.index, columns=stats)
+
+
+def cumulative_by_team(table, columns):
+    """`table` sorted by (TeamId, Round) with a running total of each column per team, as cum_<col>."""
+    out = pl.from_pandas(table, include_index=False).lazy().sort(['TeamId', 'Round'], maintain_order=True)
+    out = out.with_columns([pl.col(col).cum_sum().over('TeamId').alias(f'cum_{col}') for col in columns])
+    return out.collect().to_pandas()
+
+
+def load_team_table(paths):
+    """{team id: csv path} read in parallel and stacked with a TeamId column, as load_team_table()."""
+    ids = {path: tid for tid, path in paths.items()}
+    frames = _collect_csv(paths.values(), lambda lf, path: lf.with_columns(pl.lit(ids[path], pl.Int64).alias('TeamId')))
+    frames = [f.select(['TeamId'] + [c for c in f.columns if c != 'TeamId']) for f in frames]
+    return pl.concat(frames, how='diagonal_relaxed').to_pandas()
@@ -0,0 +1,128 @@
+from analytics.percentiles import LOWER_IS_BETTER, usage_bucket
+from analytics.players import is_percent, stat_column, stat_values
+
+# Stats shown per position on Player Analysis (key metrics)
+STATS_MAP = {
+    'Goalkeeper': [
+        'Saves','Saves %','Penalties Saved','Goals Prevented',
+        'Clean Sheets','Punches','High Claims','Goals Conceded','Own Goals'
+    ],
+    'Defender': [
+        'Tackles','Interceptions','Blocks','Clearances','Possession Won',
+        'gDuels %','aDuels %','Goals','Assists','Passes','Passes%','Own Goals'
+    ],
+    'Midfielder': [
+        'Goals','Assists','Touches','Shots','Passes','Passes%',
+        'Through Balls','Progressive Carries','fThird Passes','fThird Passes %',
+        'Tackles','Interceptions','gDuels %','aDuels %','Fouls'
+    ],
+    'Forward': [
+        'Goals','Assists','Shots','Conversion %','Big Chances Missed','Hit Woodwork',
+        'Passes','Passes%','fThird Passes','fThird Passes %'
+    ]
+}
+
+# Radar (and AI summary) stats per position
+RADAR_STATS_MAP = {
+    'Goalkeeper': ['Saves %', 'Clean Sheets', 'Goals Prevented', 'Goals Conceded', 'High Claims'],
+    'Defender':   ['Tackles', 'Interceptions', 'Blocks', 'gDuels %', 'aDuels %','Passes%','Goals','Assists'],
+    'Midfielder': ['Goals', 'Assists','Shots','fThird Passes', 'Passes%', 'Touches', 'Progressive Carries', 'Through Balls','Fouls'],
+    'Forward':    ['Goals', 'Shots', 'Assists','Passes%', 'Big Chances Missed']
+}
+
+# Usage bucket heading and explanation shown with a player's percentiles
+USAGE_LABELS = {
+    'high': ("🔴 High‑usage (> 1500 min)",
+             "This player is a regular starter—percentiles compare to other > 1500 min players."),
+    'mid': ("🟡 Medium‑usage (700–1500 min)",
+            "This player is a semi‑regular—percentiles compare to other 700–1500 min players."),
+    'low': ("🟢 Low‑usage (< 700 min)",
+            "This player is a rotational/young player/got injured—percentiles compare to other < 700 min players."),
+}
+
+
+# Percentile pools offered on the player pages (see percentiles.POOLS)
+POOL_LABELS = {'position': "Position & usage", 'archetype': "Role archetype"}
+
+
+def format_value(val, col=None):
+    """Numbers with two decimals ('72%' for a percentage column), anything else as text."""
+    try:
+        val = float(val)
+    except:
+        return str(val)
+    if col is not None and is_percent(col) and val == val:
+        return f"{val:g}%"
+    return f"{val:.2f}"
+
+
+def stat_value(row, stat):
+    """The value shown for `stat`: per90 where the pages use it, formatted."""
+    return format_value(stat_values(row, stat), stat)
+
+
+def stat_percentile(pcts, player, stat):
+    """
+    0-100 percentile of `player` (row label) for `stat` within their position
+    and usage pool, inverted for "less is better" stats; None if unknown.
+    """
+    try:
+        rank = pcts.at[player, stat]
+        if stat in LOWER_IS_BETTER:
+            return 100 - int(rank * 100)
+        return int(rank * 100)
+    except:
+        return None
+
+
+def fmt_val(row, pcts, stat):
+    """Value (per90 where the pages use it) and percentile, as 'X.XX (PYY)'."""
+    pct = stat_percentile(pcts, row.name, stat)
+    return f"{stat_value(row, stat)} (P{pct if pct is not None else 'N/A'})"
+
+
+def stat_label(stat):
+    return f"{stat} (per90)" if stat_column(stat) != stat else stat
+
+
+def key_metrics(row, pcts, pos):
+    """{label: 'X.XX (PYY)'} for the position's key metrics, in display order."""
+    return {stat_label(stat): fmt_val(row, pcts, stat) for stat in STATS_MAP.get(pos, [])}
+
+
+def radar_values(row, pcts, pos):
+    """{stat: percentile 0-1} for the position's radar, 0 where unknown."""
+    return {stat: (stat_percentile(pcts, row.name, stat) or 0) / 100 for stat in RADAR_STATS_MAP.get(pos, [])}
+
+
+def radar_summary(row, pcts, pos):
+    """The radar stats as 'stat: X.XX (PYY)' lines, as given to the AI report."""
+    return "\n".join(f"{stat}: {fmt_val(row, pcts, stat)}" for stat in RADAR_STATS_MAP.get(pos, []))
+
+
+def player_profile(row, pcts):
+    """Everything Player Analysis shows about one player, as plain data."""
+    pos = row['PosCat']
+    bucket = str(usage_bucket([row['Minutes']])[0])
+    return {
+        'id': int(row.name),
+        'name': row['Player Name'],
+        'club': row['Club'],
+        'position': pos,
+        'nationality': row['Nationality'],
+        'appearances': int(row['Appearances']),
+        'minutes': int(row['Minutes']),
+        'yellow_cards': int(row['Yellow Cards']),
+        'red_cards': int(row['Red Cards']),
+        'usage': bucket,
+        'key_metrics': [
+            {
+                'stat': stat,
+                'label': stat_label(stat),
+                'value': stat_value(row, stat),
+                'percentile': stat_percentile(pcts, row.name, stat),
+            }
+            for stat in STATS_MAP.get(pos, [])
+        ],
+        'radar': radar_values(row, pcts, pos),
+    }
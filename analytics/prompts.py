@@ -0,0 +1,41 @@
+# Chat messages for the AI reports. A report's cache key is the hash of its
+# messages, so the pages, the static export and the API must build them
+# here, identically, to find each other's reports.
+
+
+def team_analysis(team, metrics_block):
+    return [
+        {"role": "system", "content": "You are an expert football analyst and scout."},
+        {"role": "user", "content": (
+            f"Here are the key season stats for {team} in 2024‑25:\n\n"
+            f"{metrics_block}\n\n"
+            "Write a concise scouting report (3 paragraphs of 2-3 sentences) highlighting strengths, style of play, and areas to improve."
+        )}
+    ]
+
+
+def player_analysis(player, pos, stats_summary):
+    return [
+        {"role": "system", "content": "You are an expert football analyst and scout."},
+        {"role": "user", "content": f"Here are percentile stats for {player}, a {pos}:\n\n{stats_summary}\n\nWrite a 3‑4 sentence analysis and scouting report."}
+    ]
+
+
+def player_comparison(names, pos, summaries):
+    return [
+        {"role": "system", "content": "You are a professional football analyst."},
+        {"role": "user", "content": f"Compare these {len(names)} {pos}s based on their stats:\n\n{summaries}\n\nWrite a 3-5 sentence comparative report outlining strengths, differences, and who may fit better in a high-intensity pressing team."}
+    ]
+
+
+def tots_summary(roster_block):
+    prompt = (
+        "You are a football analyst. Here is our 4-2-3-1 Team of the Season:\n\n"
+        f"{roster_block}\n\n"
+        "Write a concise 3–4 sentence summary explaining why each position was filled by these players—"
+        "highlight their key strengths."
+    )
+    return [
+        {"role": "system", "content": "You are an expert football scout."},
+        {"role": "user",   "content": prompt}
+    ]
@@ -0,0 +1,57 @@
+import streamlit as st
+
+from analytics.jobs import get_queue
+from analytics.llm import prompt_key
+
+
+def request_report(messages):
+    """Queues an AI report for this session; returns immediately."""
+    job_id = get_queue().submit(messages)
+    st.session_state.setdefault('ai_jobs', set()).add(job_id)
+    return job_id
+
+
+def show_report(messages, pending_text="Generating..."):
+    """
+    Shows the report for `messages` if this session asked for it.
+
+    While the job is queued or running only a small fragment polls for it,
+    so the rest of the page stays interactive, and the report replaces the
+    placeholder when it is ready. Because the session keeps the job id, the report
+    is still there after navigating to another page and back.
+    """
+    job_id = prompt_key(messages)
+    if job_id not in st.session_state.get('ai_jobs', ()):
+        return
+    job = get_queue().get(job_id)
+    if job is None:
+        return
+    if job.pending:
+        _poll(job_id, pending_text)
+    elif job.status == 'done':
+        st.write(job.result)
+    else:
+        st.error(f"Failed to generate report: {job.error}")
+
+
+@st.fragment
+def report_section(messages, button_label, pending_text="Generating..."):
+    """
+    The "generate" button and its report as one fragment: clicking the
+    button reruns only this section, not the page that built `messages`.
+    """
+    if st.button(button_label):
+        request_report(messages)
+    show_report(messages, pending_text)
+
+
+@st.fragment(run_every=1.0)
+def _poll(job_id, pending_text):
+    # Renders the finished report in place instead of rerunning the page
+    job = get_queue().get(job_id)
+    if job is None or job.pending:
+        st.info(f"⏳ {pending_text}")
+    elif job.status == 'done':
+        st.write(job.result)
+    else:
+        st.error(f"Failed to generate report: {job.error}")
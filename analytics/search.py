@@ -0,0 +1,122 @@
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+
+# Letters that do not decompose into a base letter plus an accent
+_FOLD_EXTRA = str.maketrans({
+    'ø': 'o', 'ð': 'd', 'þ': 'th', 'ł': 'l', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ı': 'i', 'đ': 'd',
+})
+
+
+def fold(text):
+    """Lower-case, accent-free, single-spaced form used for matching ('Ødegaard' -> 'odegaard')."""
+    text = unicodedata.normalize('NFKD', str(text).lower()).translate(_FOLD_EXTRA)
+    text = ''.join(c if c.isalnum() else ' ' for c in text if not unicodedata.combining(c))
+    return ' '.join(text.split())
+
+
+def trigrams(folded):
+    """Trigrams of each word, padded so word starts weigh more ('sa' -> ' sa', 'sa ')."""
+    grams = set()
+    for word in folded.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NameIndex:
+    """
+    Fuzzy name search over a fixed list of names.
+
+    Built once: every name is folded and split into trigrams, and each
+    trigram maps to the array of name positions containing it. A query
+    scores candidates by the number of trigrams they share with it (one
+    bincount over the matching posting lists), normalises that to a
+    Jaccard similarity and boosts names with a word starting with the
+    query. Short queries (under three characters) use the sorted word
+    list as a prefix index instead.
+    """
+
+    def __init__(self, names, keys=None):
+        self.names = list(names)
+        self.keys = np.asarray(list(keys) if keys is not None else range(len(self.names)))
+        self.folded = [fold(n) for n in self.names]
+
+        postings = {}
+        sizes = np.zeros(len(self.names), dtype=np.int32)
+        words = []
+        for pos, folded in enumerate(self.folded):
+            grams = trigrams(folded)
+            sizes[pos] = len(grams)
+            for g in grams:
+                postings.setdefault(g, []).append(pos)
+            words.extend((w, pos) for w in folded.split())
+        self._postings = {g: np.array(p, dtype=np.int32) for g, p in postings.items()}
+        self._sizes = sizes
+        words.sort()
+        self._words = [w for w, _ in words]
+        self._word_pos = np.array([p for _, p in words], dtype=np.int32)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix_hits(self, prefix):
+        lo = bisect_left(self._words, prefix)
+        hi = bisect_left(self._words, prefix + '\uffff')
+        return np.unique(self._word_pos[lo:hi])
+
+    def search(self, query, limit=10, allowed=None):
+        """
+        Keys of the best matches for `query`, best first. `allowed` is an
+        optional boolean mask over the names restricting the results.
+        """
+        q = fold(query)
+        if not q:
+            return []
+        n = len(self.names)
+        prefix_hits = self._prefix_hits(q.split()[-1])
+
+        if len(q) < 3:
+            scores = np.zeros(n)
+            scores[prefix_hits] = 1.0 / (1.0 + self._sizes[prefix_hits])  # shorter names first
+        else:
+            grams = trigrams(q)
+            lists = [self._postings[g] for g in grams if g in self._postings]
+            if not lists and not len(prefix_hits):
+                return []
+            shared = np.bincount(np.concatenate(lists), minlength=n) if lists else np.zeros(n)
+            scores = shared / (len(grams) + self._sizes - shared)
+            # A single shared trigram is noise unless the query is that short
+            scores[shared < min(2, len(grams))] = 0
+            scores[prefix_hits] += 0.5
+
+        if allowed is not None:
+            scores = np.where(allowed, scores, 0)
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+        hits = hits[np.lexsort((hits, -scores[hits]))]
+        return self.keys[hits].tolist()
+
+
+def same_person(name, candidates):
+    """
+    Key of the candidate ((key, name), ...) that names the same person as
+    `name` in another source's spelling, or None. Names match when one's
+    words are all in the other's ('Gabriel Martinelli Silva' is 'Gabriel
+    Martinelli'); the candidate sharing the most words wins, and a tie is
+    no match.
+    """
+    words = set(fold(name).split())
+    best, best_shared, tied = None, 0, False
+    for key, other in candidates:
+        other = set(fold(other).split())
+        if not (words <= other or other <= words):
+            continue
+        shared = len(words & other)
+        if shared > best_shared:
+            best, best_shared, tied = key, shared, False
+        elif shared == best_shared:
+            tied = True
+    return None if tied else best
@@ -0,0 +1,240 @@
+"""
+Several seasons of player stats, and a player identity that holds across them.
+
+Prepared season tables sit next to each other as
+data/players_data/epl_player_stats_<season>.csv ('2024_25'). Names and clubs
+do not identify a player across them: players transfer, and sources spell a
+name differently from one year to the next ('Gabriel' / 'Gabriel
+Magalhães'). The identity index (IDS_PATH) gives every row of every season
+a PlayerId that stays the same across seasons. It is built incrementally:
+`update_index()` only ingests seasons it has not seen, matching each new row
+to the players of the other seasons in passes of decreasing certainty:
+
+    1. same name, nationality and club
+    2. same name and nationality (a transfer)
+    3. a variant of the name (same_person) with the same nationality
+    4. otherwise a new PlayerId
+
+Passes 1 and 2 are joins, and only match keys that are unique on both sides;
+pass 3 looks at the few rows left. Ids are never reused or renumbered, so
+the index only grows.
+
+`SeasonDeltas` joins two seasons on PlayerId, once for all players, and holds
+every player's year-over-year change in the per-90 values and percentiles of
+the stats shown on Player Analysis.
+
+Usage:
+    python -m analytics.seasons                  ingest new seasons into the index
+    python -m analytics.seasons rebuild          rebuild the index from every season
+"""
+import glob
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analytics.percentiles import percentile_matrix
+from analytics.players import PLAYERS_PATH, stat_values
+from analytics.profiles import RADAR_STATS_MAP
+from analytics.search import fold, same_person
+
+SEASONS_DIR = os.path.dirname(PLAYERS_PATH)
+SEASON_PATTERN = re.compile(r'epl_player_stats_(\d{4}_\d{2})\.csv$')
+IDS_PATH = os.path.join(SEASONS_DIR, 'player_ids.csv')
+
+# Season of the player table the pages show
+CURRENT_SEASON = SEASON_PATTERN.search(PLAYERS_PATH).group(1)
+
+# Stats compared year over year: every stat Player Analysis shows on a radar
+DELTA_STATS = list(dict.fromkeys(stat for stats in RADAR_STATS_MAP.values() for stat in stats))
+
+ID_COLS = ['Season', 'Row', 'PlayerId', 'Player Name', 'Nationality', 'ClubId']
+
+
+def season_paths(folder=SEASONS_DIR):
+    """{season: path} of every prepared season table, oldest first."""
+    paths = {}
+    for path in glob.glob(os.path.join(folder, 'epl_player_stats_*.csv')):
+        match = SEASON_PATTERN.search(path)
+        if match:
+            paths[match.group(1)] = path
+    return dict(sorted(paths.items()))
+
+
+def season_label(season):
+    """'2024_25' -> '2024-25'."""
+    return season.replace('_', '-')
+
+
+def previous_season(season, paths):
+    """The latest season of `paths` before `season`, or None."""
+    earlier = [s for s in paths if s < season]
+    return earlier[-1] if earlier else None
+
+
+def _empty_index():
+    return pd.DataFrame({col: pd.Series(dtype='int64' if col in ('Row', 'PlayerId', 'ClubId') else 'str')
+                         for col in ID_COLS})
+
+
+def load_index(path=IDS_PATH):
+    try:
+        # Seasons stay text ('2024_25')
+        return pd.read_csv(path, dtype={'Season': str})
+    except FileNotFoundError:
+        return _empty_index()
+
+
+def write_index(index, path=IDS_PATH):
+    index.to_csv(path, index=False)
+
+
+def _unique_join(new, known, keys):
+    """{new row: PlayerId} for keys that occur once in `new` and once in `known`."""
+    new = new.drop_duplicates(keys, keep=False)
+    known = known.drop_duplicates(keys, keep=False)
+    matched = new.reset_index().merge(known[keys + ['PlayerId']], on=keys)
+    return dict(zip(matched['index'], matched['PlayerId']))
+
+
+def ingest(index, season, df):
+    """
+    `index` with a row for every player of season table `df` (its rows in
+    file order), matched to the PlayerIds of the seasons already indexed.
+    """
+    new = pd.DataFrame({
+        'Row': np.arange(len(df)),
+        'Player Name': df['Player Name'].astype(str).to_numpy(),
+        'Nationality': df['Nationality'].astype(str).to_numpy(),
+        'ClubId': df['ClubId'].astype('int64').to_numpy(),
+    })
+    new['Key'] = new['Player Name'].map(fold)
+
+    # Each known player as seen in the indexed season closest to this one
+    # (seasons can be added out of order, e.g. older ones backfilled)
+    known = index[index['Season'] != season]
+    distance = (known['Season'].str[:4].astype(int) - int(season[:4])).abs()
+    known = known.assign(Distance=distance).sort_values(['Distance', 'Season', 'Row'], kind='stable')
+    known = known.drop_duplicates('PlayerId').assign(Key=lambda k: k['Player Name'].map(fold))
+
+    ids = np.full(len(new), -1, dtype=np.int64)
+    for keys in (['Key', 'Nationality', 'ClubId'], ['Key', 'Nationality']):
+        matched = _unique_join(new[ids < 0], known[~known['PlayerId'].isin(ids)], keys)
+        ids[list(matched)] = list(matched.values())
+
+    # Name variants among what is left, within the same nationality
+    right = known[~known['PlayerId'].isin(ids)]
+    candidates = {nat: list(zip(g['PlayerId'], g['Player Name'])) for nat, g in right.groupby('Nationality')}
+    taken = set(ids.tolist())
+    for row in np.flatnonzero(ids < 0):
+        pid = same_person(new.at[row, 'Player Name'], candidates.get(new.at[row, 'Nationality'], []))
+        if pid is not None and pid not in taken:
+            ids[row] = pid
+            taken.add(pid)
+
+    # Everyone else is new
+    unmatched = ids < 0
+    start = int(index['PlayerId'].max()) + 1 if len(index) else 1
+    ids[unmatched] = np.arange(start, start + unmatched.sum())
+
+    new['PlayerId'] = ids
+    new['Season'] = season
+    return pd.concat([index, new[ID_COLS]], ignore_index=True)
+
+
+def update_index(paths=None, path=IDS_PATH, rebuild=False, refresh=()):
+    """
+    Ingests every season of `paths` (all season tables) the index does not
+    have yet, and again the seasons in `refresh` (tables that were
+    rewritten); returns the index.
+    """
+    paths = season_paths() if paths is None else paths
+    index = _empty_index() if rebuild else load_index(path)
+    index = index[~index['Season'].isin(list(refresh))]
+    seen = set(index['Season'])
+    for season, season_path in paths.items():
+        if season not in seen:
+            index = ingest(index, season, pd.read_csv(season_path))
+    write_index(index, path)
+    return index
+
+
+def season_ids(index, season):
+    """PlayerId of every row of `season`'s table, in file order."""
+    rows = index[index['Season'] == season].sort_values('Row')
+    return rows['PlayerId'].to_numpy()
+
+
+class SeasonDeltas:
+    """
+    Year-over-year change of every player of the current season: per-90
+    values (as the pages show them) and position-pool percentiles of
+    DELTA_STATS, joined to the previous season on PlayerId.
+    """
+
+    def __init__(self, current, previous, current_ids, previous_ids, current_pcts=None, previous_pcts=None,
+                 previous_season=None):
+        self.previous_season = previous_season
+        current_pcts = percentile_matrix(current) if current_pcts is None else current_pcts
+        previous_pcts = percentile_matrix(previous) if previous_pcts is None else previous_pcts
+        stats = [s for s in DELTA_STATS if s in current.columns and s in previous.columns]
+
+        # Row of the previous season of every current player (-1: not there)
+        prev_row = pd.Series(np.arange(len(previous)), index=previous_ids)
+        prev_row = prev_row[~prev_row.index.duplicated()]
+        rows = prev_row.reindex(current_ids).fillna(-1).astype(int).to_numpy()
+        found = rows >= 0
+        take = np.where(found, rows, 0)
+
+        def aligned(frame):
+            values = frame.to_numpy(dtype=float)[take]
+            values[~found] = np.nan
+            return pd.DataFrame(values, index=current.index, columns=stats)
+
+        values = lambda df: pd.DataFrame({s: stat_values(df, s) for s in stats}).astype(float)
+        self.stats = stats
+        self.now = values(current)
+        self.before = aligned(values(previous))
+        self.pct_now = current_pcts[stats].astype(float)
+        self.pct_before = aligned(previous_pcts[stats])
+        self.club_before = pd.Series(np.where(found, previous['Club'].astype(str).to_numpy()[take], None),
+                                     index=current.index)
+        self.minutes_before = pd.Series(np.where(found, previous['Minutes'].to_numpy()[take], np.nan),
+                                        index=current.index)
+
+    def player(self, label, stats):
+        """
+        Per-stat table of player `label` (a row label of the current table):
+        value and percentile in both seasons and their changes. None when the
+        player did not play the previous season.
+        """
+        if pd.isna(self.minutes_before[label]):
+            return None
+        stats = [s for s in stats if s in self.stats]
+        table = pd.DataFrame({
+            'Previous': self.before.loc[label, stats],
+            'Current': self.now.loc[label, stats],
+            'Pct Previous': (100 * self.pct_before.loc[label, stats]).round().astype('Int64'),
+            'Pct Current': (100 * self.pct_now.loc[label, stats]).round().astype('Int64'),
+        })
+        table['Change'] = table['Current'] - table['Previous']
+        table['Pct Change'] = table['Pct Current'] - table['Pct Previous']
+        return table[['Previous', 'Current', 'Change', 'Pct Previous', 'Pct Current', 'Pct Change']]
+
+
+def main(argv):
+    if argv not in ([], ['rebuild']):
+        print(__doc__)
+        return 1
+    index = update_index(rebuild=argv == ['rebuild'])
+    # A player is new in the first season they appear in
+    first = index.sort_values('Season', kind='stable').drop_duplicates('PlayerId')['Season']
+    summary = pd.DataFrame({'Players': index['Season'].value_counts(), 'New': first.value_counts()})
+    print(summary.fillna(0).astype(int).sort_index().to_string())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,137 @@
+"""
+Shot-level data: one row per shot of the season, from Understat.
+
+data/scrape_memorable_matchs_data.py fetches the shots of every match and
+writes them with `write_shots()` to a Parquet file, sorted by team, player
+and match so each team's and player's shots are stored together. Text
+columns are categoricals and numbers are the narrowest type that holds them,
+so a season (~10k shots) is well under a megabyte and reads in a few
+milliseconds. `ShotTable` keeps the row positions of every team, opponent,
+player and match, so selecting an entity's shots is a take() of those rows
+rather than a scan of the table.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from analytics.search import same_person
+from analytics.teams import team_ids
+
+SHOTS_PATH = 'data/shots_data/epl_shots_2024_25.parquet'
+
+# Understat situations grouped for the filters on the pages
+SITUATIONS = {
+    'All': None,
+    'Open play': ['OpenPlay'],
+    'Set pieces': ['FromCorner', 'SetPiece', 'DirectFreekick'],
+    'Penalties': ['Penalty'],
+}
+
+# Entities a ShotTable is indexed by
+INDEX_COLS = ['TeamId', 'OpponentId', 'PlayerId', 'MatchId']
+
+SORT_COLS = ['TeamId', 'PlayerId', 'MatchId', 'Minute', 'ShotId']
+
+CATEGORY_COLS = ['Player', 'Venue', 'Result', 'Situation', 'ShotType', 'LastAction', 'Assist']
+
+
+def shots_frame(records):
+    """
+    The shot table from Understat shot records (`get_shot_data()['h'] +
+    ['a']` of each match), in storage order and dtypes.
+    """
+    raw = pd.DataFrame.from_records(records)
+    home = raw['h_a'] == 'h'
+    team = raw['h_team'].where(home, raw['a_team'])
+    opponent = raw['a_team'].where(home, raw['h_team'])
+
+    df = pd.DataFrame({
+        'ShotId': raw['id'].astype('int64'),
+        'MatchId': raw['match_id'].astype('int32'),
+        'Date': pd.to_datetime(raw['date']),
+        'TeamId': team_ids(team).to_numpy(),
+        'OpponentId': team_ids(opponent).to_numpy(),
+        'Venue': np.where(home, 'home', 'away'),
+        'PlayerId': raw['player_id'].astype('int32'),
+        'Player': raw['player'],
+        'Minute': raw['minute'].astype('int16'),
+        # Understat coordinates: 0-1 along the pitch towards the goal attacked, and across it
+        'X': raw['X'].astype('float32'),
+        'Y': raw['Y'].astype('float32'),
+        'xG': raw['xG'].astype('float32'),
+        'Result': raw['result'],
+        'Situation': raw['situation'],
+        'ShotType': raw['shotType'],
+        'LastAction': raw['lastAction'],
+        'Assist': raw['player_assisted'],
+    })
+    df = df.astype({col: 'category' for col in CATEGORY_COLS})
+    return df.sort_values(SORT_COLS, kind='stable', ignore_index=True)
+
+
+def write_shots(df, path=SHOTS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_parquet(path, index=False)
+
+
+def load_shots(path=SHOTS_PATH):
+    return pd.read_parquet(path)
+
+
+class ShotTable:
+    """
+    The season's shots with the row positions of every team (TeamId),
+    opponent (OpponentId), player (PlayerId) and match (MatchId).
+    """
+
+    def __init__(self, df):
+        self.frame = df
+        self._rows = {col: df.groupby(col, sort=False).indices for col in INDEX_COLS}
+        self._players = df[['TeamId', 'PlayerId', 'Player']].drop_duplicates(['TeamId', 'PlayerId'])
+
+    def __len__(self):
+        return len(self.frame)
+
+    def rows(self, column, key, situation='All'):
+        """Shots with `column` == `key`, from the situations grouped under `situation`."""
+        pos = self._rows[column].get(key, np.empty(0, dtype=np.intp))
+        shots = self.frame.take(pos)
+        if SITUATIONS[situation] is not None:
+            shots = shots[shots['Situation'].isin(SITUATIONS[situation])]
+        return shots
+
+    def player_id(self, name, team_id):
+        """Understat id of the player called `name` (Premier League spelling) at team `team_id`, or None."""
+        players = self._players[self._players['TeamId'] == team_id]
+        pid = same_person(name, zip(players['PlayerId'], players['Player']))
+        return None if pid is None else int(pid)
+
+
+def shot_summary(shots):
+    """'N shots · G goals · x.xx xG' for a caption."""
+    goals = int((shots['Result'] == 'Goal').sum())
+    return f"{len(shots)} shots · {goals} goals · {shots['xG'].sum():.2f} xG"
+
+
+def draw_shot_map(shots, color='#37003C'):
+    """The shots on the attacking half, sized by xG, goals filled; as PNG bytes."""
+    import io
+    import matplotlib.pyplot as plt
+    from mplsoccer import VerticalPitch
+
+    pitch = VerticalPitch(pitch_type='opta', half=True, pitch_color='#3D8B37', stripe_color='#44983E', line_color='white', stripe=True)
+    fig, ax = pitch.draw(figsize=(6, 5))
+
+    # Own goals are listed with the shots but were not shot by the team
+    shots = shots[shots['Result'] != 'OwnGoal']
+    goal = (shots['Result'] == 'Goal').to_numpy()
+    x, y = shots['X'].to_numpy() * 100, shots['Y'].to_numpy() * 100
+    size = 40 + 600 * shots['xG'].to_numpy()
+    pitch.scatter(x[~goal], y[~goal], s=size[~goal], facecolors='none', edgecolors='white', linewidths=1, alpha=0.8, ax=ax)
+    pitch.scatter(x[goal], y[goal], s=size[goal], c=color, edgecolors='white', linewidths=1, ax=ax)
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
@@ -0,0 +1,125 @@
+"""
+Squad profiles: the player table aggregated per club for the Team Dashboard.
+
+`SquadProfiles` builds every club's panel at once: one grouped aggregation
+of the player table per view, keyed on ClubId, the team registry id the
+player table's Club names are normalised to. The summary is joined on that
+id to each team's season totals from the long team table (TeamId), so the
+squad's goals can be set against the team's. Each view keeps the row
+positions of every club, so switching teams is a take() of those rows
+rather than a filter and aggregation of the player table.
+"""
+import numpy as np
+import pandas as pd
+
+from analytics.percentiles import usage_bucket
+
+# Players listed as the club's top contributors
+TOP_CONTRIBUTORS = 5
+# Nationalities listed by minutes; the rest are summed as 'Other'
+TOP_NATIONALITIES = 6
+# Output stats split by position
+POSITION_STATS = ['Minutes', 'Goals', 'Assists', 'Shots', 'Tackles', 'Interceptions']
+
+USAGE_NAMES = {'high': 'Regular (> 1500 min)', 'mid': 'Rotation (700–1500)', 'low': 'Fringe (< 700)'}
+
+
+def _columns(players, columns):
+    """`columns` of the player table, counts widened to int64 (the compact int8/int16 overflow when summed)."""
+    df = players[['ClubId', *columns]]
+    return df.astype({c: 'int64' for c in columns if pd.api.types.is_integer_dtype(df[c])})
+
+
+def _top_per_club(df, sort_cols, n):
+    """The first `n` rows of every club after sorting by `sort_cols` (descending)."""
+    df = df.sort_values(['ClubId', *sort_cols], ascending=[True] + [False] * len(sort_cols), kind='stable')
+    return df.groupby('ClubId', sort=False).head(n).reset_index(drop=True)
+
+
+def squad_summary(players, teams):
+    """
+    One row per club (indexed by ClubId): players used, minutes spread and
+    nationality count from the player table, and the team's season goals
+    from the team table.
+    """
+    players = _columns(players, ['Nationality', 'Minutes', 'Goals'])
+    bucket = pd.Series(usage_bucket(players['Minutes']), index=players.index)
+    club = players.groupby('ClubId', sort=True)
+    out = pd.DataFrame({
+        'Players': club.size(),
+        'Regulars': (bucket == 'high').groupby(players['ClubId']).sum(),
+        'Nationalities': club['Nationality'].nunique(),
+        'Player Goals': club['Goals'].sum(),
+    })
+    # Share of the squad's minutes played by its eleven most-used players
+    top11 = _top_per_club(players[['ClubId', 'Minutes']], ['Minutes'], 11).groupby('ClubId')['Minutes'].sum()
+    out['Top 11 Minutes %'] = (100 * top11 / club['Minutes'].sum()).round(1)
+    top_scorer = club['Goals'].max()
+
+    season = teams.groupby('TeamId')['GF'].sum().rename('Team Goals')
+    out = out.join(season)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out['Top Scorer Goals %'] = (100 * top_scorer / out['Team Goals']).round(1)
+    out.index.name = 'ClubId'
+    return out
+
+
+def minutes_frame(players):
+    """Every player's minutes with their usage group, most-used first within each club."""
+    out = _columns(players, ['Player Name', 'PosCat', 'Minutes'])
+    out['Usage'] = pd.Series(usage_bucket(out['Minutes']), index=out.index).map(USAGE_NAMES)
+    return out.sort_values(['ClubId', 'Minutes'], ascending=[True, False], kind='stable', ignore_index=True)
+
+
+def contributors_frame(players, n=TOP_CONTRIBUTORS):
+    """Each club's top `n` players by goals plus assists (ties: fewer minutes first)."""
+    out = _columns(players, ['Player Name', 'PosCat', 'Minutes', 'Goals', 'Assists'])
+    out['G+A'] = out['Goals'] + out['Assists']
+    out['G+A per90'] = (out['G+A'] / out['Minutes'].where(out['Minutes'] > 0) * 90).round(2)
+    out = out.sort_values(['ClubId', 'G+A', 'Minutes'], ascending=[True, False, True], kind='stable')
+    return out.groupby('ClubId', sort=False).head(n).reset_index(drop=True)
+
+
+def nationality_frame(players, n=TOP_NATIONALITIES):
+    """Players and share of minutes per nationality and club, the top `n` by minutes plus 'Other'."""
+    counts = _columns(players, ['Nationality', 'Minutes']).groupby(['ClubId', 'Nationality'], observed=True, sort=False).agg(
+        Players=('Minutes', 'size'), Minutes=('Minutes', 'sum')).reset_index()
+    counts['Nationality'] = counts['Nationality'].astype(str)
+    counts = counts.sort_values(['ClubId', 'Minutes', 'Players'], ascending=[True, False, False], kind='stable')
+    rank = counts.groupby('ClubId', sort=False).cumcount()
+    counts.loc[(rank >= n).to_numpy(), 'Nationality'] = 'Other'
+    out = counts.groupby(['ClubId', 'Nationality'], sort=False)[['Players', 'Minutes']].sum().reset_index()
+    out['Minutes %'] = (100 * out['Minutes'] / out.groupby('ClubId')['Minutes'].transform('sum')).round(1)
+    return out
+
+
+def position_frame(players, stats=POSITION_STATS):
+    """Each position's share (%) of its club's total of every stat in `stats`."""
+    by_pos = _columns(players, ['PosCat', *stats]).groupby(['ClubId', 'PosCat'], observed=True, sort=True)[stats].sum()
+    club = by_pos.groupby(level='ClubId').transform('sum')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = (100 * by_pos / club).round(1)
+    return shares.add_suffix(' %').reset_index().astype({'PosCat': str})
+
+
+class SquadProfiles:
+    """Every club's squad views (summary, minutes, contributors, nationalities, positions)."""
+
+    def __init__(self, players, teams):
+        self.summary = squad_summary(players, teams)
+        self._frames = {
+            'minutes': minutes_frame(players),
+            'contributors': contributors_frame(players),
+            'nationalities': nationality_frame(players),
+            'positions': position_frame(players),
+        }
+        self._rows = {name: f.groupby('ClubId', sort=False).indices for name, f in self._frames.items()}
+
+    def view(self, name, team_id):
+        """Rows of view `name` for club `team_id`, without the ClubId column."""
+        rows = self._rows[name].get(team_id, np.empty(0, dtype=np.intp))
+        return self._frames[name].take(rows).drop(columns='ClubId').reset_index(drop=True)
+
+    def club_summary(self, team_id):
+        """The club's summary row as a Series."""
+        return self.summary.loc[team_id]
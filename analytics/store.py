@@ -0,0 +1,193 @@
+"""
+Shared, memory-mapped copies of the prepared datasets.
+
+Several Streamlit processes on one host can attach to the same Arrow IPC
+files instead of each parsing the CSVs and holding its own copy. The files
+live in a versioned directory under `SHARED_DIR` (tmpfs when available):
+
+    <SHARED_DIR>/<version>/<name>.arrow
+    <SHARED_DIR>/<version>/<name>     other artifacts (the rendered TOTS pitch)
+    <SHARED_DIR>/CURRENT              -> "<version>"
+
+Besides the prepared tables, a version is a snapshot of everything derived
+from them that a first page view would otherwise compute: the percentile
+matrices (position and archetype pools), the rolling team form, the TOTS
+subgroup scores and the TOTS pitch image.
+
+The version stamp hashes the input files and SNAPSHOT_CODE, and readers
+only use a version that still matches them (`fresh_version()`): after a CSV
+is rewritten, processes build their own copies until the next publish.
+
+`publish()` writes a complete new version directory and then swaps CURRENT
+with an atomic rename, so readers only ever see a finished version. Readers
+memory-map the files; numeric columns and Arrow-backed strings reference the
+mapped pages directly, so every extra process shares the same physical memory.
+
+Usage:
+    python -m analytics.store publish
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+
+from analytics import manifest
+
+SHARED_DIR = os.environ.get(
+    'PL_SHARED_DIR',
+    '/dev/shm/pl-analytics' if os.path.isdir('/dev/shm') else os.path.join(tempfile.gettempdir(), 'pl-analytics')
+)
+
+CURRENT = 'CURRENT'
+
+
+def input_version(paths):
+    """Short content hash of the input files a dataset is built from (see analytics/manifest.py)."""
+    return manifest.version(paths)
+
+
+def current_version(root=SHARED_DIR):
+    """Version stamp of the published datasets, or None if nothing is published."""
+    try:
+        with open(os.path.join(root, CURRENT)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish(datasets, version, root=SHARED_DIR, files=None):
+    """
+    Writes `datasets` (name -> DataFrame) and `files` (name -> bytes) as
+    version `version` and makes it current.
+
+    Older versions except the previous one are removed; processes that still
+    have them mapped keep their pages until they re-attach.
+    """
+    os.makedirs(root, exist_ok=True)
+    previous = current_version(root)
+
+    staging = tempfile.mkdtemp(prefix='.staging-', dir=root)
+    os.chmod(staging, 0o755)
+    for name, df in datasets.items():
+        # A RangeIndex is kept as metadata, any other index as a column
+        table = pa.Table.from_pandas(df, preserve_index=None)
+        with pa.OSFile(os.path.join(staging, f'{name}.arrow'), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    for name, data in (files or {}).items():
+        with open(os.path.join(staging, name), 'wb') as f:
+            f.write(data)
+
+    target = os.path.join(root, version)
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    os.rename(staging, target)
+
+    tmp = os.path.join(root, f'.{CURRENT}.{os.getpid()}')
+    with open(tmp, 'w') as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(root, CURRENT))
+
+    for entry in os.listdir(root):
+        path = os.path.join(root, entry)
+        if os.path.isdir(path) and entry not in (version, previous) and not entry.startswith('.staging-'):
+            shutil.rmtree(path, ignore_errors=True)
+    return target
+
+
+def _arrow_types(dtype):
+    # Keep strings in Arrow memory instead of copying them into Python objects
+    if pa.types.is_string(dtype) or pa.types.is_large_string(dtype):
+        return pd.ArrowDtype(dtype)
+    return None
+
+
+def attach(name, version=None, root=SHARED_DIR):
+    """
+    Memory-maps dataset `name` of `version` (current by default) as a DataFrame.
+
+    The frame is backed by the shared mapping and must be treated as read-only.
+    """
+    version = version or current_version(root)
+    if version is None:
+        raise FileNotFoundError(f'No datasets published under {root}')
+    source = pa.memory_map(os.path.join(root, version, f'{name}.arrow'), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True, types_mapper=_arrow_types)
+
+
+def attach_file(name, version=None, root=SHARED_DIR):
+    """Contents of artifact `name` of `version` (current by default)."""
+    version = version or current_version(root)
+    if version is None:
+        raise FileNotFoundError(f'No datasets published under {root}')
+    with open(os.path.join(root, version, name), 'rb') as f:
+        return f.read()
+
+
+# Code that derives the snapshot: changing it must change the version
+SNAPSHOT_CODE = [
+    'analytics/players.py', 'analytics/percentiles.py', 'analytics/tots.py', 'analytics/team_data.py', 'analytics/form.py'
+]
+
+
+def input_paths():
+    """The files the published datasets are built from."""
+    from analytics import players
+    from analytics.teams import TEAM_NAMES, team_data_path
+
+    return [players.PLAYERS_PATH] + [team_data_path(t) for t in TEAM_NAMES]
+
+
+def snapshot_version():
+    """The version a snapshot built from the current inputs and code would get."""
+    return input_version(input_paths() + SNAPSHOT_CODE)
+
+
+def fresh_version(root=SHARED_DIR):
+    """The published version if it was built from the current inputs and code, else None."""
+    version = current_version(root)
+    return version if version is not None and version == snapshot_version() else None
+
+
+def build_datasets():
+    """Prepared and derived datasets published for the pages, with their version stamp."""
+    from analytics import form, percentiles, players, team_data, tots
+
+    table = players.load_players()
+    teams = team_data.load_team_table()
+    datasets = {
+        'players': table,
+        'teams': teams,
+        'team_form': form.rolling_team_form(teams),
+        'percentiles': percentiles.percentile_matrix(table),
+        'archetype_percentiles': percentiles.percentile_matrix(table, pool='archetype'),
+        'tots_scores': tots.score_table(tots.high_usage_scores(table)),
+    }
+    return datasets, snapshot_version()
+
+
+def build_files(datasets):
+    """Non-tabular artifacts of the snapshot."""
+    from analytics import tots
+
+    ranked = tots.ranked_scores(datasets['tots_scores'])
+    return {'tots.png': tots.draw_pitch(tots.pick_team(datasets['players'], ranked=ranked))}
+
+
+def main(argv):
+    if argv[:1] != ['publish']:
+        print(__doc__)
+        return 1
+    datasets, version = build_datasets()
+    files = build_files(datasets)
+    target = publish(datasets, version, files=files)
+    print(f'Published {", ".join([*datasets, *files])} as version {version} to {target}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
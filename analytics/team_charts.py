@@ -0,0 +1,127 @@
+import altair as alt
+
+from analytics.form import team_form_column
+from analytics.squads import USAGE_NAMES
+
+# Premier League colors
+PL_PRIMARY_COLOR = "#37003C"
+PL_WIN_COLOR = "#2ECC71"      # Green
+PL_DRAW_COLOR = "#000000"     # Black
+PL_LOSS_COLOR = "#E74C3C"     # Red
+PL_XG_COLOR = "#1F78B4"       # Blue for xG
+PL_XGA_COLOR = "#A6CEE3"      # Light blue for xGA
+
+OUTCOME_SCALE = alt.Scale(domain=['Win', 'Draw', 'Loss'], range=[PL_WIN_COLOR, PL_DRAW_COLOR, PL_LOSS_COLOR])
+
+# Each chart ships only the columns it encodes. Streamlit serialises a
+# chart's data into the page once per chart, so handing every chart the
+# whole team frame sends all of its columns eight times over.
+CHART_COLUMNS = {
+    'points': ['Round', 'TotalPoints', 'Outcome'],
+    'position': ['Round', 'Position'],
+    'match_points': ['Round', 'MatchPoints', 'Outcome'],
+    'goals_cumulative': ['Round', 'GoalsForCumulative', 'GoalsAgainstCumulative'],
+    'goals_per_round': ['Round', 'GF', 'GA'],
+    'xg': ['Round', 'xg', 'xga'],
+    'xg_cumulative': ['Round', 'cum_xG', 'cum_xGA'],
+    'xpts': ['Round', 'cum_xpts'],
+}
+
+
+def chart_data(df, chart):
+    """The columns of the team frame that `chart` needs."""
+    return df[CHART_COLUMNS[chart]]
+
+
+def points_chart(df):
+    # Both layers read one dataset attached to the layer chart
+    line = alt.Chart().mark_line(point=True).encode(
+        x='Round:O', y=alt.Y('TotalPoints:Q', title='Total Points'), color=alt.value(PL_PRIMARY_COLOR)
+    )
+    outcomes = alt.Chart().mark_circle(size=100).encode(
+        x='Round:O', y='TotalPoints:Q', color=alt.Color('Outcome:N', scale=OUTCOME_SCALE),
+        tooltip=['Round', 'TotalPoints', 'Outcome']
+    )
+    return alt.layer(line, outcomes, data=chart_data(df, 'points')).properties(height=350)
+
+
+def position_chart(df):
+    return alt.Chart(chart_data(df, 'position')).mark_line(point=True).encode(
+        x='Round:O', y=alt.Y('Position:Q', sort='descending', title='League Position (1 = Top)'),
+        color=alt.value(PL_PRIMARY_COLOR)
+    ).properties(height=300)
+
+
+def season_charts(df):
+    """(title, chart) pairs for the per-round sections of the dashboard."""
+    return [
+        ("Match Points by Round", alt.Chart(chart_data(df, 'match_points')).mark_bar().encode(
+            x='Round:O', y='MatchPoints:Q', color=alt.Color('Outcome:N', scale=OUTCOME_SCALE)
+        ).properties(height=300)),
+        ("Goals For vs. Goals Against (Cumulative)", alt.layer(
+            alt.Chart().mark_area(opacity=0.6).encode(x='Round:O', y='GoalsForCumulative:Q', color=alt.value(PL_WIN_COLOR)),
+            alt.Chart().mark_area(opacity=0.6).encode(x='Round:O', y='GoalsAgainstCumulative:Q', color=alt.value(PL_LOSS_COLOR)),
+            data=chart_data(df, 'goals_cumulative')
+        ).properties(height=300)),
+        # The fold stays in the browser: shipping GF/GA side by side is half
+        # the rows of the long format
+        ("Goals For & Against per Round", alt.Chart(chart_data(df, 'goals_per_round')).transform_fold(
+            ['GF', 'GA'], as_=['Type', 'Goals']
+        ).mark_bar().encode(
+            x='Round:O', y='Goals:Q',
+            color=alt.Color('Type:N', scale=alt.Scale(domain=['GF', 'GA'], range=[PL_WIN_COLOR, PL_LOSS_COLOR]))
+        ).properties(height=300)),
+        ("Expected Goals (xG) vs xGA", alt.layer(
+            alt.Chart().mark_bar().encode(x='Round:O', y='xg:Q', color=alt.value(PL_XG_COLOR)),
+            alt.Chart().mark_bar().encode(x='Round:O', y='xga:Q', color=alt.value(PL_XGA_COLOR)),
+            data=chart_data(df, 'xg')
+        ).properties(height=300)),
+        ("Cumulative xG & xGA", alt.layer(
+            alt.Chart().mark_line(point=True).encode(x='Round:O', y='cum_xG:Q', color=alt.value(PL_XG_COLOR)),
+            alt.Chart().mark_line(point=True).encode(x='Round:O', y='cum_xGA:Q', color=alt.value(PL_XGA_COLOR)),
+            data=chart_data(df, 'xg_cumulative')
+        ).properties(height=300)),
+        ("Expected Points (xPTS) Over Season", alt.Chart(chart_data(df, 'xpts')).mark_line(point=True).encode(
+            x='Round:O', y='cum_xpts:Q', color=alt.value(PL_WIN_COLOR)
+        ).properties(height=300)),
+    ]
+
+
+def form_charts(form, window):
+    """(title, chart) pairs of a team's rolling form (its rows of the team form frame) over `window` rounds."""
+    columns = {team_form_column(stat, window): stat for stat in ['xG', 'xGA', 'Points', 'xPts']}
+    data = form[['Round', *columns]].rename(columns=columns)
+    return [
+        (f"xG vs xGA (last {window} matches)", alt.layer(
+            alt.Chart().mark_line(point=True).encode(x='Round:O', y=alt.Y('xG:Q', title='xG / xGA'), color=alt.value(PL_XG_COLOR)),
+            alt.Chart().mark_line(point=True).encode(x='Round:O', y='xGA:Q', color=alt.value(PL_XGA_COLOR)),
+            data=data[['Round', 'xG', 'xGA']]
+        ).properties(height=300)),
+        (f"Points vs xPTS (last {window} matches)", alt.layer(
+            alt.Chart().mark_line(point=True).encode(x='Round:O', y=alt.Y('Points:Q', title='Points / xPTS'), color=alt.value(PL_PRIMARY_COLOR)),
+            alt.Chart().mark_line(point=True, strokeDash=[4, 3]).encode(x='Round:O', y='xPts:Q', color=alt.value(PL_WIN_COLOR)),
+            data=data[['Round', 'Points', 'xPts']]
+        ).properties(height=300)),
+    ]
+
+
+USAGE_SCALE = alt.Scale(domain=list(USAGE_NAMES.values()), range=[PL_PRIMARY_COLOR, PL_XG_COLOR, PL_XGA_COLOR])
+
+
+def squad_minutes_chart(minutes):
+    """Minutes of every player of a squad (its rows of the minutes view), most-used first."""
+    return alt.Chart(minutes[['Player Name', 'Minutes', 'Usage']]).mark_bar().encode(
+        x=alt.X('Minutes:Q'), y=alt.Y('Player Name:N', sort=None, title=None),
+        color=alt.Color('Usage:N', scale=USAGE_SCALE, legend=alt.Legend(orient='bottom', title=None)),
+        tooltip=['Player Name', 'Minutes', 'Usage']
+    ).properties(height=16 * len(minutes) + 40)
+
+
+def position_share_chart(positions):
+    """Each position's share of a squad's minutes and output (its rows of the positions view)."""
+    return alt.Chart(positions).transform_fold(
+        [c for c in positions.columns if c != 'PosCat'], as_=['Stat', 'Share']
+    ).mark_bar().encode(
+        x=alt.X('Stat:N', title=None, sort=None), y=alt.Y('Share:Q', title='Share of squad total (%)'),
+        color=alt.Color('PosCat:N', title='Position'), tooltip=['PosCat:N', 'Stat:N', 'Share:Q']
+    ).properties(height=300)
@@ -0,0 +1,89 @@
+import pandas as pd
+
+from analytics.backend import use_polars
+from analytics.teams import ID_TO_NAME, TEAM_NAMES, team_id, team_ids, team_data_path
+
+MEMORABLE_PATH = 'data/team_data/memorable_performances_2024_25.csv'
+
+
+def load_team_table(names=TEAM_NAMES, backend=None):
+    """
+    All merged team_data CSVs in one long frame with a TeamId column, and
+    Team set to the registry name of that id.
+    """
+    if use_polars(backend):
+        from analytics import polars_backend
+        table = polars_backend.load_team_table({team_id(name): team_data_path(name) for name in names})
+    else:
+        frames = []
+        for name in names:
+            df = pd.read_csv(team_data_path(name))
+            df.insert(0, 'TeamId', team_id(name))
+            frames.append(df)
+        table = pd.concat(frames, ignore_index=True)
+    # Files written before the registry carry E0 short names ("Man City")
+    table['Team'] = table['TeamId'].map(ID_TO_NAME)
+    return table
+
+
+def team_frame(table, name):
+    """One team's rows from the long table, in round order."""
+    return table[table['TeamId'] == team_id(name)].drop(columns='TeamId').reset_index(drop=True)
+
+
+def season_frame(df):
+    """A team's rows with match outcomes and the cumulative xG / xPts series."""
+    df = df.copy()
+    # Compute match outcomes
+    df['Outcome'] = df['MatchPoints'].map({3: 'Win', 1: 'Draw', 0: 'Loss'}) if 'MatchPoints' in df else df['result'].map({'w': 'Win','d': 'Draw','l': 'Loss'})
+
+    # Compute xG metrics
+    if 'xg' in df.columns and 'xga' in df.columns:
+        df['xGD'] = df['xg'] - df['xga']
+        df['cum_xG'] = df['xg'].cumsum()
+        df['cum_xGA'] = df['xga'].cumsum()
+
+    # Compute expected points
+    df['xpts'] = df.get('xpts', df['Outcome'].map({'Win':3,'Draw':1,'Loss':0}))
+    df['cum_xpts'] = df['xpts'].cumsum()
+    return df
+
+
+def season_metrics(latest):
+    """(label, value) pairs summarising the season from a team's last row."""
+    metrics = [
+        ("Total Points", latest.TotalPoints),
+        ("League Position", latest.Position),
+        ("Goals For", latest.GoalsForCumulative),
+        ("Goals Against", latest.GoalsAgainstCumulative)
+    ]
+    if hasattr(latest, "cum_xG"):
+        metrics.append(("xG (Total)", round(latest.cum_xG, 2)))
+    if hasattr(latest, "cum_xGA"):
+        metrics.append(("xGA (Total)", round(latest.cum_xGA, 2)))
+    return metrics
+
+
+def metrics_block(metrics):
+    """The season metrics as the text block of the team analysis prompt."""
+    return "\n".join(f"{name}: {value}" for name, value in metrics)
+
+
+def load_memorable(path=MEMORABLE_PATH):
+    """
+    Most memorable matches of every team (written by analytics/memorable.py,
+    ranked per team), with a TeamId column.
+    """
+    mem_df = pd.read_csv(path)
+    mem_df['TeamId'] = team_ids(mem_df['team'])
+    return mem_df.sort_values(['TeamId', 'rank'], kind='stable', ignore_index=True)
+
+
+def memorable_performances(mem_df, name):
+    """A team's memorable match rows, most memorable first."""
+    return mem_df[mem_df['TeamId'] == team_id(name)]
+
+
+def memorable_performance(mem_df, name):
+    """A team's most memorable match row."""
+    return memorable_performances(mem_df, name).iloc[0]
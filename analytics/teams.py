@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# Canonical team registry.
+# Each team has a stable integer id, the canonical (Understat) name used by the
+# pages and file names, and every alias seen in the other data sources
+# (football-data.co.uk E0.csv short names, Premier League player stats names).
+# Ids are never reused so files written with them stay valid when teams are
+# added for other seasons or leagues.
+REGISTRY = [
+    # id, league, canonical name, aliases
+    (1,  'EPL', 'Arsenal',                 []),
+    (2,  'EPL', 'Aston Villa',             []),
+    (3,  'EPL', 'Bournemouth',             ['AFC Bournemouth']),
+    (4,  'EPL', 'Brentford',               []),
+    (5,  'EPL', 'Brighton',                ['Brighton & Hove Albion', 'Brighton and Hove Albion']),
+    (6,  'EPL', 'Chelsea',                 []),
+    (7,  'EPL', 'Crystal Palace',          []),
+    (8,  'EPL', 'Everton',                 []),
+    (9,  'EPL', 'Fulham',                  []),
+    (10, 'EPL', 'Ipswich',                 ['Ipswich Town']),
+    (11, 'EPL', 'Leicester',               ['Leicester City']),
+    (12, 'EPL', 'Liverpool',               []),
+    (13, 'EPL', 'Manchester City',         ['Man City']),
+    (14, 'EPL', 'Manchester United',       ['Man United', 'Man Utd']),
+    (15, 'EPL', 'Newcastle United',        ['Newcastle']),
+    (16, 'EPL', 'Nottingham Forest',       ["Nott'm Forest", 'Nottm Forest']),
+    (17, 'EPL', 'Southampton',             []),
+    (18, 'EPL', 'Tottenham',               ['Tottenham Hotspur', 'Spurs']),
+    (19, 'EPL', 'West Ham',                ['West Ham United']),
+    (20, 'EPL', 'Wolverhampton Wanderers', ['Wolves']),
+]
+
+TEAM_IDS = {name: tid for tid, _, name, _ in REGISTRY}
+TEAM_NAMES = sorted(TEAM_IDS)
+ID_TO_NAME = {tid: name for name, tid in TEAM_IDS.items()}
+
+# Categorical dtype for team name columns, one category per canonical team
+TEAM_DTYPE = pd.CategoricalDtype(TEAM_NAMES)
+# Id 0 marks a missing team name
+_ID_TO_CODE = {0: -1, **{tid: TEAM_NAMES.index(name) for tid, name in ID_TO_NAME.items()}}
+
+
+def file_key(name):
+    """Lower-case, underscore key used for the team_csvs file names."""
+    return name.lower().replace(' ', '_').replace('/', '_')
+
+
+# Every spelling we may meet, including file keys, mapped to the team id
+ALIASES = {}
+for _tid, _league, _name, _aliases in REGISTRY:
+    for _alias in [_name, file_key(_name), *_aliases]:
+        ALIASES[_alias] = _tid
+        ALIASES[_alias.lower()] = _tid
+
+
+def team_id(alias):
+    """Integer id for any known spelling of a team name."""
+    try:
+        return ALIASES[alias]
+    except KeyError:
+        try:
+            return ALIASES[str(alias).strip().lower()]
+        except KeyError:
+            raise KeyError(f"Unknown team name: {alias!r}") from None
+
+
+def team_ids(names):
+    """
+    Vectorised `team_id` for a Series of names (0 for missing values).
+
+    Only the distinct spellings are looked up, the ids are then broadcast
+    back with the factorized codes, so the cost of the string matching
+    depends on the number of teams rather than the number of rows.
+    """
+    codes, uniques = pd.factorize(pd.Series(names), use_na_sentinel=True)
+    lookup = np.array([team_id(u) for u in uniques] + [0], dtype=np.int16)
+    return pd.Series(lookup[codes], index=getattr(names, 'index', None), name='TeamId')
+
+
+def team_names(names):
+    """Canonical names for a Series of aliases, as a categorical column."""
+    ids = team_ids(names)
+    return pd.Series(
+        pd.Categorical.from_codes(ids.map(_ID_TO_CODE).to_numpy(), dtype=TEAM_DTYPE),
+        index=ids.index
+    )
+
+
+def team_name(alias):
+    """Canonical name for a single alias."""
+    return ID_TO_NAME[team_id(alias)]
+
+
+def team_data_path(name):
+    """Merged per-team CSV read by the dashboards."""
+    return f"data/team_data/{team_name(name)}.csv"
+
+
+def team_logo_path(name):
+    return f"data/team_logos/{team_name(name)}.png"
+
@@ -0,0 +1,228 @@
+# Team of the Season: weighted percentile scores per position subgroup and
+# the 4-2-3-1 built from them
+
+import pandas as pd
+
+MIN_MINUTES = 2300
+
+
+# Helper for percentile
+def pct_rank(s, val, invert=False):
+    rank = s.rank(pct=True)[s == val].iloc[0]
+    return 1 - rank if invert else rank
+
+
+# metric groups
+# Each stat has a weight; sums of weights per group decide influence
+METRIC_GROUPS = {
+    'Goalkeeper': {
+        'core': {
+            'Saves %': 2.0,
+            'Clean Sheets': 2.5,
+            'Goals Prevented per90': 1,
+            'Goals Conceded per90': 2.0,
+            'High Claims per90': 1.0,
+            'Own Goals per90': 0.5
+        }
+    },
+    'Defender': {
+        'def': {
+            'Blocks per90': 3,
+            'Possession Won per90': 1,
+            'Tackles per90': 1.9,
+            'Interceptions per90': 2,
+            'Clearances' : 1.4,
+            'gDuels %': 1,
+            'aDuels %': 1,
+            'Assists per90': 1,
+            'Goals per90': 3.0,
+            'Passes%': 1.5,
+            'Passes per90': 2.5,
+        },
+        'att': {
+            'Assists per90': 4.5,
+            'Goals per90': 3.0,
+            'Passes%': 0.5,
+            'Passes per90': 0.5,
+            'Blocks per90': 0.5,
+            'Possession Won per90': 0.5,
+            'Tackles per90': 0.5,
+            'Interceptions per90': 0.5,
+            'gDuels %': 0.5,
+            'aDuels %': 0.5
+        }
+    },
+    'Midfielder': {
+        'def': {
+            'Touches per90': 1.0,
+            'Progressive Carries per90': 5.0,
+            'Fouls per90': 0.5,
+            'Shots per90': 0.5,
+            'Tackles per90' : 5.0,
+            'fThird Passes per90': 1.0,
+            'Passes%': 4.0,
+            'Assists per90': 1.0,
+            'Goals per90': 1.0,
+        },
+        'att': {
+            'Goals per90': 4.0,
+            'Assists per90': 4.0,
+            'Shots per90': 2.5,
+            'Passes%': 1.0,
+            'Touches per90': 0.5,
+            'Touches per90': 0.5
+        }
+    },
+    'Forward': {
+        'core': {
+            'Goals per90': 5.0,
+            'Shots per90': 1.0,
+            'Assists per90': 1.0,
+            'Big Chances Missed per90': 0.5
+        }
+    }
+}
+
+
+# Position coordinates (x, y)
+POSITIONS = {
+    'GK': (8, 40),
+    'CB1': (25, 30), 'CB2': (25, 50),
+    'LB': (30, 10), 'RB': (30, 70),
+    'CM1': (55, 20), 'CM2': (55, 60),
+    'CAM': (85, 40), 'LW': (85, 15), 'RW': (85, 65),
+    'ST': (110, 40)
+}
+
+
+def subgroup_scores(df_hi):
+    """
+    0-10 score of every high-usage player in each position subgroup
+    ('Defender_def', 'Midfielder_att', ...), best first, as (row label, score).
+    """
+    # Compute weighted scores by subgroup
+    subgroup_scores = {}
+
+    for pos, groups in METRIC_GROUPS.items():
+        dfp = df_hi[df_hi['PosCat'] == pos]
+
+        for group_name, metrics in groups.items():  # group_name: 'core', 'def', 'att'
+            key = f"{pos}_{group_name}"  # e.g., 'Defender_def'
+            scores = []
+
+            for idx, row in dfp.iterrows():
+                weighted_sum = 0.0
+                total_weight = 0.0
+
+                for stat, weight in metrics.items():
+                    if stat not in dfp.columns:
+                        continue
+                    invert = stat in ['Goals Conceded per90', 'Own Goals per90', 'Fouls per90', 'Big Chances Missed per90']
+                    pr = pct_rank(dfp[stat], row[stat], invert=invert)
+                    weighted_sum += pr * weight
+                    total_weight += weight
+
+                if total_weight > 0:
+                    avg_pct = weighted_sum / total_weight
+                    score10 = round(avg_pct * 10, 2)
+                    scores.append((idx, score10))
+
+            subgroup_scores[key] = sorted(scores, key=lambda x: x[1], reverse=True)
+    return subgroup_scores
+
+
+def high_usage_scores(df, min_minutes=MIN_MINUTES):
+    """subgroup_scores() of the players over `min_minutes`."""
+    return subgroup_scores(df[df['Minutes'] > min_minutes])
+
+
+def score_table(ranked):
+    """subgroup_scores() as a flat frame (subgroup, player row label, score), for the snapshot."""
+    rows = [(group, idx, score) for group, scores in ranked.items() for idx, score in scores]
+    return pd.DataFrame(rows, columns=['Subgroup', 'Player', 'Score'])
+
+
+def ranked_scores(table):
+    """Inverse of score_table()."""
+    ranked = {}
+    for group, idx, score in zip(table['Subgroup'], table['Player'].tolist(), table['Score'].tolist()):
+        ranked.setdefault(group, []).append((idx, score))
+    return ranked
+
+
+def pick_team(df, min_minutes=MIN_MINUTES, ranked=None):
+    """
+    The Best XI as ((role, player name), ...) in POSITIONS order; `ranked`
+    is high_usage_scores(df) when already computed.
+    """
+    if ranked is None:
+        ranked = high_usage_scores(df, min_minutes)
+
+    # Build Best XI using specialized subgroup scores
+    best11 = {}
+
+    # Goalkeeper
+    best11['GK'] = ranked['Goalkeeper_core'][0][0]
+
+    # Defensive Defenders
+    best11['Def (Defensive)'] = [idx for idx, _ in ranked['Defender_def'][:2]]
+
+    # Attacking Defenders
+    best11['Def (Attacking)'] = [idx for idx, _ in ranked['Defender_att'][:2]]
+
+    # Defensive Midfielders
+    best11['Mid (Defensive)'] = [idx for idx, _ in ranked['Midfielder_def'][:2]]
+
+    # Attacking Midfielders
+    best11['Mid (Attacking)'] = [idx for idx, _ in ranked['Midfielder_att'][:3]]
+
+    # Striker
+    best11['ST'] = ranked['Forward_core'][0][0]
+
+    # Assign each role to best11 players
+    assigned_positions = {
+        'GK': best11['GK'],
+        'CB1': best11['Def (Defensive)'][0],
+        'CB2': best11['Def (Defensive)'][1],
+        'LB': best11['Def (Attacking)'][1],
+        'RB': best11['Def (Attacking)'][0],
+        'CM1': best11['Mid (Defensive)'][0],
+        'CM2': best11['Mid (Defensive)'][1],
+        'CAM': best11['Mid (Attacking)'][1],
+        'LW': best11['Mid (Attacking)'][2],
+        'RW': best11['Mid (Attacking)'][0],
+        'ST': best11['ST']
+    }
+    return tuple((role, df.loc[idx, 'Player Name']) for role, idx in assigned_positions.items())
+
+
+# mplsoccer (and matplotlib) are imported here, not at module level: they
+# take well over a second to import and are only needed on a cache miss
+def draw_pitch(roster):
+    import io
+    import matplotlib.pyplot as plt
+    from mplsoccer import Pitch
+
+    pitch = Pitch(pitch_color='grass', 
+        line_color='white',
+        corner_arcs=True,
+        stripe=True,
+        pitch_type='statsbomb',
+        axis=False)
+    fig, ax = pitch.draw()
+
+    for role, name in roster:
+        x, y = POSITIONS[role]
+        pitch.annotate(text=name, xy=(x, y), xytext=(x, y), 
+                       ha='center', va='center', ax=ax, fontsize=7, color='black',
+                       arrowprops={'facecolor': 'black', 'linewidth':0})
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def roster_block(roster):
+    """'ROLE: Name' lines, as given to the AI summary."""
+    return "\n".join(f"{role}: {name}" for role, name in roster)
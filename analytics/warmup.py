@@ -0,0 +1,94 @@
+"""
+Background warm-up of everything a first page view would otherwise load.
+
+`start()` runs `warm()` once per process on a daemon thread: it imports the
+heavy chart libraries, renders one chart of each kind (plotly and Altair
+load templates and schemas on first use) and fills the shared dataset caches
+(analytics/datasets.py) from the published snapshot, so the first visitor
+to a page finds them ready. A page that asks for a dataset while the warm-up is still
+loading it waits for that load instead of starting its own.
+"""
+import gc
+import importlib
+import logging
+import threading
+import time
+
+# Imported by the page scripts; a cold import of each takes hundreds of ms
+# (streamlit.emojis is imported by set_page_config to check the page icon)
+MODULES = ['altair', 'plotly.express', 'pyarrow', 'streamlit.emojis',
+           'analytics.reports', 'analytics.team_charts', 'analytics.player_charts']
+
+_started = False
+_lock = threading.Lock()
+done = threading.Event()
+timings = {}
+
+
+def _image_plugins():
+    # st.image opens the team logos with Pillow, which registers its file
+    # format plugins on the first open
+    from PIL import Image
+    Image.init()
+
+
+def _render_charts():
+    from analytics import datasets
+    from analytics.player_charts import radar_figure
+    from analytics.profiles import radar_values
+    from analytics.team_charts import season_charts
+    from analytics.team_data import season_frame, team_frame
+    from analytics.teams import TEAM_NAMES
+
+    row = datasets.players().iloc[0]
+    radar_figure(radar_values(row, datasets.percentiles(), row['PosCat']), '#37003C').to_json()
+    for _, chart in season_charts(season_frame(team_frame(datasets.teams(), TEAM_NAMES[0]))):
+        chart.to_dict()
+
+
+def warm():
+    """Imports MODULES and loads every shared dataset; returns seconds per step."""
+    from analytics import datasets
+
+    steps = [(name, lambda name=name: importlib.import_module(name)) for name in MODULES] + [
+        ('players', datasets.players),
+        ('teams', datasets.teams),
+        ('team form', datasets.team_form),
+        ('squad profiles', datasets.squad_profiles),
+        ('memorable matches', datasets.memorable),
+        ('percentiles', datasets.percentiles),
+        ('player index', datasets.player_index),
+        ('tots team', datasets.tots_team),
+        ('tots pitch', datasets.tots_pitch),
+        ('image plugins', _image_plugins),
+        ('charts', _render_charts),
+    ]
+    for name, step in steps:
+        started = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - started
+    # Streamlit runs a full gc.collect() after every script run; moving the
+    # long-lived objects loaded above out of the collector's generations keeps
+    # that pass from walking all of them again on every rerun
+    gc.freeze()
+    return timings
+
+
+def _run():
+    # Cached functions called outside a script run log a harmless warning each
+    logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').setLevel(logging.ERROR)
+    logging.getLogger('streamlit.runtime.caching.cache_data_api').setLevel(logging.ERROR)
+    try:
+        warm()
+    finally:
+        done.set()
+
+
+def start():
+    """Starts the warm-up thread (once per process) and returns immediately."""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_run, name='warmup', daemon=True).start()
@@ -0,0 +1,132 @@
+"""
+Requests per second the JSON API sustains on one core.
+
+Starts `python -m analytics.api` pinned to a single CPU (where the OS
+allows it), warms it with one pass over every player and team URL, then
+has --clients keep-alive connections request random player and team
+lookups for --seconds. Reports throughput and latency percentiles for
+plain, gzip and If-None-Match (304) requests. Exits non-zero if plain
+lookups stay under MIN_RPS.
+
+Usage:
+    python benchmarks/api_throughput.py [--clients 8] [--seconds 5]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analytics.llm import percentiles  # noqa: E402
+from analytics.teams import TEAM_NAMES, file_key  # noqa: E402
+from benchmarks.interaction_time import free_port  # noqa: E402
+
+MIN_RPS = 300
+
+
+def start_api(port):
+    pin = (lambda: os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})) if hasattr(os, 'sched_setaffinity') else None
+    return subprocess.Popen(
+        [sys.executable, '-m', 'analytics.api', '--port', str(port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, preexec_fn=pin,
+    )
+
+
+def wait_until_up(port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.5)
+    raise TimeoutError('API did not start')
+
+
+def get(conn, path, headers):
+    conn.request('GET', path, headers=headers)
+    response = conn.getresponse()
+    return response, response.read()
+
+
+def run(port, paths, headers, clients, seconds):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        mine = []
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            status = get(conn, rng.choice(paths), headers)[0].status
+            mine.append(time.perf_counter() - started)
+            if status not in (200, 304):
+                errors.append(status)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return len(latencies) / elapsed, percentiles(latencies), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    port = free_port()
+    api = start_api(port)
+    try:
+        wait_until_up(port)
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        version = json.loads(get(conn, '/v1/version', {})[1])
+        paths = [f'/v1/players/{i}' for i in range(version['players'])]
+        paths += [f'/v1/teams/{file_key(t)}' for t in TEAM_NAMES]
+
+        started = time.perf_counter()
+        for path in paths:
+            get(conn, path, {})
+        print(f'Cold pass: {len(paths)} lookups in {time.perf_counter() - started:.2f} s')
+
+        etag = get(conn, paths[0], {})[0].getheader('ETag')
+        rows = [
+            ('plain', {}),
+            ('gzip', {'Accept-Encoding': 'gzip'}),
+            ('304', {'If-None-Match': etag}),
+        ]
+        plain_rps = 0.0
+        for name, headers in rows:
+            rps, pct, errors = run(port, paths, headers, args.clients, args.seconds)
+            plain_rps = plain_rps or rps
+            print(f'{name:6s} {rps:8.0f} req/s   p50 {pct["p50"] * 1000:6.2f} ms   p95 {pct["p95"] * 1000:6.2f} ms   '
+                  f'p99 {pct["p99"] * 1000:6.2f} ms   errors {len(errors)}')
+    finally:
+        api.terminate()
+        api.wait()
+
+    if plain_rps < MIN_RPS:
+        print(f'\nPlain lookups at {plain_rps:.0f} req/s (minimum {MIN_RPS})')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Archetype clustering time (analytics/archetypes.py).
+
+Times `archetypes.assign()` on the real player table and on a synthetic
+table of about --rows players: the real table stacked with every stat
+jittered by up to ±--jitter of its value, so the copies are distinct
+players with the same spread of profiles. Every run is repeated --repeat
+times and the best time is kept. The mini-batch updates do not grow with
+the table, so only the final assignment pass should scale with --rows.
+
+Also prints how many players of the real table keep the archetype they
+were given in a synthetic run (the copy of the real rows), as a check that
+the clusters found on the larger table are the same roles.
+
+Usage:
+    python benchmarks/archetypes.py [--rows 100000] [--jitter 0.1] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from analytics import archetypes, players  # noqa: E402
+
+
+def best_time(step, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = step()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def synthetic(df, rows, jitter, seed=0):
+    """`df` stacked to about `rows` rows, every feature of the copies scaled by 1 ± jitter."""
+    copies = max(1, -(-rows // len(df)))
+    out = pd.concat([df] * copies, ignore_index=True)
+    rng = np.random.default_rng(seed)
+    features = sorted({f for fs in archetypes.FEATURES.values() for f in fs})
+    for col in features:
+        values = pd.to_numeric(out[col], errors='coerce').to_numpy(dtype=float)
+        # The first copy stays as it is
+        scale = 1 + rng.uniform(-jitter, jitter, len(out))
+        scale[:len(df)] = 1
+        out[col] = values * scale
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help='players in the synthetic table')
+    parser.add_argument('--jitter', type=float, default=0.1, help='relative noise added to the copies')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = players.load_players()
+    print(f'{"table":10s} {"players":>9s} {"ms":>9s}')
+    real_time, real = best_time(lambda: archetypes.assign(df), args.repeat)
+    print(f'{"real":10s} {len(df):>9,d} {real_time * 1000:9.1f}')
+
+    big = synthetic(df, args.rows, args.jitter)
+    big_time, labels = best_time(lambda: archetypes.assign(big), args.repeat)
+    print(f'{"synthetic":10s} {len(big):>9,d} {big_time * 1000:9.1f}')
+
+    # Archetype names can differ between runs, so compare the partitions:
+    # the share of real players whose synthetic label is the majority label of their real archetype
+    pairs = pd.DataFrame({'real': real.to_numpy(), 'big': labels.iloc[:len(df)].to_numpy()})
+    majority = pairs.groupby('real')['big'].agg(lambda s: s.value_counts().iloc[0]).sum()
+    print(f'\nreal players in the same archetype on the synthetic table: {majority / len(df):.1%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
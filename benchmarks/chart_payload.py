@@ -0,0 +1,72 @@
+"""
+Chart payload of the Team Dashboard, per team view.
+
+Starts the app headless, opens the Team Dashboard and selects every team in
+turn, adding up the websocket bytes of the chart elements the server sends
+for each view (spec plus Arrow-serialised data, as the browser receives it).
+
+Usage:
+    python benchmarks/chart_payload.py [--port 8599] [--verbose]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analytics.teams import TEAM_NAMES  # noqa: E402
+from benchmarks.interaction_time import TEAM_LABEL, free_port, start_app  # noqa: E402
+from tools.fake_llm_server import serve  # noqa: E402
+from tools.st_client import StreamlitSession, wait_until_healthy  # noqa: E402
+
+CHART_ELEMENTS = ('vega_lite_chart', 'arrow_vega_lite_chart')
+
+
+def measure(base_url):
+    sizes = {}
+    with StreamlitSession(base_url) as session:
+        session.open_page('Team_Dashboard')
+        for team in TEAM_NAMES:
+            result = session.select(TEAM_LABEL, team)
+            sizes[team] = (
+                sum(result.element_bytes[k] for k in CHART_ELEMENTS),
+                result.bytes,
+            )
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=0, help='port for the app (default: any free port)')
+    parser.add_argument('--verbose', action='store_true', help='show every team')
+    args = parser.parse_args()
+
+    port = args.port or free_port()
+    llm = serve(port=0)
+    with tempfile.TemporaryDirectory() as reports_dir:
+        app = start_app(port, llm.server_port, reports_dir)
+        try:
+            base_url = f'http://127.0.0.1:{port}'
+            wait_until_healthy(base_url)
+            sizes = measure(base_url)
+        finally:
+            app.terminate()
+            app.wait()
+            llm.shutdown()
+
+    if args.verbose:
+        for team, (charts, total) in sizes.items():
+            print(f'{team:28s} charts {charts / 1024:7.1f} KiB   page {total / 1024:7.1f} KiB')
+    charts = [c for c, _ in sizes.values()]
+    totals = [t for _, t in sizes.values()]
+    print(f'Team Dashboard, {len(sizes)} team views: '
+          f'charts {statistics.mean(charts) / 1024:.1f} KiB/view, '
+          f'whole page {statistics.mean(totals) / 1024:.1f} KiB/view')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+pandas vs Polars for the shared data transforms (PL_DATA_BACKEND).
+
+Times, for both backends, the steps that build the datasets:
+
+    players       read the player CSV, add PosCat and the per90 columns
+    percentiles   the pooled percentile matrix of the prepared table
+    teams         read and stack the 20 team CSVs
+    league        the league frame (per-team cumulative series)
+
+on the real tables and on a player table stacked --scale times (written to
+a temporary CSV, so reading is part of the timing) to stand in for
+multi-league data. Every step is run --repeat times and the best time is
+kept. The two backends' outputs are compared for every step: they must be
+equal up to one ulp (Polars parses long decimals exactly, pandas' default
+CSV parser can be one ulp off).
+
+Usage:
+    python benchmarks/data_backend.py [--scale 100] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from analytics import league, percentiles, players, team_data  # noqa: E402
+
+BACKENDS = ['pandas', 'polars']
+
+
+def best_time(step, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = step()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def same(a, b):
+    try:
+        pd.testing.assert_frame_equal(a, b, check_exact=False, rtol=1e-15, atol=0)
+        return True
+    except AssertionError:
+        return False
+
+
+def run(label, steps, repeat):
+    """steps: [(name, backend -> callable)]; prints one row per step."""
+    for name, make in steps:
+        times, results = {}, {}
+        for backend in BACKENDS:
+            times[backend], results[backend] = best_time(make(backend), repeat)
+        check = 'ok' if same(*results.values()) else 'DIFFERENT'
+        print(f'{label:10s} {name:12s} {len(results["pandas"]):>9,d} '
+              f'{times["pandas"] * 1000:10.1f} {times["polars"] * 1000:10.1f} '
+              f'{times["pandas"] / times["polars"]:8.1f}x  {check}')
+        if check != 'ok':
+            yield name
+
+
+def steps(players_path):
+    table = players.load_players(players_path)
+    teams = team_data.load_team_table()
+    return [
+        ('players', lambda b: lambda: players.load_players(players_path, backend=b)),
+        ('percentiles', lambda b: lambda: percentiles.percentile_matrix(table, backend=b)),
+        ('teams', lambda b: lambda: team_data.load_team_table(backend=b)),
+        ('league', lambda b: lambda: league.league_frame(teams, backend=b)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=100, help='copies of the player table in the synthetic run')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    import polars as pl
+    print(f'{os.cpu_count()} CPUs, Polars {pl.__version__} on {pl.thread_pool_size()} threads\n')
+    print(f'{"table":10s} {"step":12s} {"rows":>9s} {"pandas ms":>10s} {"polars ms":>10s} {"speedup":>8s}  output')
+
+    failed = list(run('real', steps(players.PLAYERS_PATH), args.repeat))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'players.csv')
+        raw = pd.read_csv(players.PLAYERS_PATH)
+        pd.concat([raw] * args.scale, ignore_index=True).to_csv(path, index=False)
+        # The team tables do not grow with the player table
+        failed += run(f'{args.scale}x', steps(path)[:2], args.repeat)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
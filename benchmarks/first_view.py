@@ -0,0 +1,99 @@
+"""
+First page view vs warm page view, with and without the startup warm-up.
+
+Starts the app twice, headless, each time with an empty shared store
+(PL_SHARED_DIR in a temp directory):
+
+    cold    `streamlit run PL.py`, nothing published
+    warmed  `python -m analytics.store publish`, then `python serve.py`
+
+and, --settle seconds after the server is healthy (the time a real server
+has before its first visitor), opens every page in a fresh tab, once
+(first view) and then --repeat more times in new tabs (warm views). The
+report compares each page's first-view server time with its warm median.
+
+Usage:
+    python benchmarks/first_view.py [--settle 10] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.interaction_time import free_port  # noqa: E402
+from tools.fake_llm_server import serve  # noqa: E402
+from tools.st_client import StreamlitSession, wait_until_healthy  # noqa: E402
+
+PAGES = ['Team_Dashboard', 'Player_Analysis', 'Player_Comparison', 'TOTS']
+
+
+def start(mode, port, llm_port, shared_dir, reports_dir):
+    env = dict(
+        os.environ,
+        LLM_BASE_URL=f'http://127.0.0.1:{llm_port}/v1',
+        API_KEY='fake',
+        PL_REPORTS_DIR=reports_dir,
+        PL_SHARED_DIR=shared_dir,
+    )
+    options = ['--server.headless', 'true', '--server.port', str(port), '--browser.gatherUsageStats', 'false']
+    if mode == 'warmed':
+        subprocess.run([sys.executable, '-m', 'analytics.store', 'publish'], cwd=ROOT, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        command = [sys.executable, 'serve.py', *options]
+    else:
+        command = [sys.executable, '-m', 'streamlit', 'run', 'PL.py', *options]
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def view(base_url, page):
+    with StreamlitSession(base_url) as session:
+        result = session.open_page(page)
+    if result.exceptions:
+        raise RuntimeError(f'{page}: {result.exceptions[0]}')
+    return result.seconds
+
+
+def measure(mode, llm_port, settle, repeat):
+    port = free_port()
+    with tempfile.TemporaryDirectory() as shared_dir, tempfile.TemporaryDirectory() as reports_dir:
+        app = start(mode, port, llm_port, shared_dir, reports_dir)
+        try:
+            base_url = f'http://127.0.0.1:{port}'
+            wait_until_healthy(base_url)
+            time.sleep(settle)
+            first = {page: view(base_url, page) for page in PAGES}
+            warm = {page: statistics.median(view(base_url, page) for _ in range(repeat)) for page in PAGES}
+        finally:
+            app.terminate()
+            app.wait()
+    return first, warm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settle', type=float, default=10.0, help='seconds between server start and the first view')
+    parser.add_argument('--repeat', type=int, default=5, help='warm views per page')
+    args = parser.parse_args()
+
+    llm = serve(port=0)
+    try:
+        results = {mode: measure(mode, llm.server_port, args.settle, args.repeat) for mode in ('cold', 'warmed')}
+    finally:
+        llm.shutdown()
+
+    print(f'{"page":20s} {"mode":>7s} {"first ms":>9s} {"warm ms":>8s} {"first/warm":>11s}')
+    for page in PAGES:
+        for mode, (first, warm) in results.items():
+            print(f'{page:20s} {mode:>7s} {first[page] * 1000:9.0f} {warm[page] * 1000:8.0f} '
+                  f'{first[page] / warm[page]:10.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Cold-start import budget for the landing page and every page script.
+
+For each script, the module-level imports are extracted with `ast` and run
+in a fresh interpreter under `python -X importtime`. The cumulative time of
+the top-level imports is the script's cold-start import cost; the median of
+several runs is compared against BUDGETS_MS and the script exits non-zero
+if any page goes over.
+
+Usage:
+    python benchmarks/import_budget.py [--runs N] [--verbose]
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Milliseconds of cumulative import time allowed per script
+# (openai alone is ~450 ms and mplsoccer ~1.5 s, so importing either at
+# page level is caught)
+BUDGETS_MS = {
+    'PL.py': 600,
+    'pages/Team_Dashboard.py': 1200,
+    'pages/Player_Analysis.py': 1150,
+    'pages/Player_Comparison.py': 1150,
+    'pages/TOTS.py': 1100,
+    'pages/Market_Analysis.py': 1200,
+    'pages/League_Overview.py': 1200,
+}
+
+
+def module_imports(path):
+    """Source of the import statements at module level (not inside functions)."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    return '\n'.join(
+        ast.unparse(node) for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def parse_importtime(stderr):
+    """Sum of cumulative microseconds of top-level imports, and the per-module breakdown."""
+    total = 0
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nested imports are indented by two more spaces per level
+        if len(name) - len(name.lstrip()) == 1:
+            total += int(cumulative_us)
+            modules.append((name.strip(), int(cumulative_us)))
+    return total, modules
+
+
+def measure(path, runs):
+    code = module_imports(os.path.join(ROOT, path))
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    totals = []
+    modules = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=ROOT, env=env, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f'{path}: imports failed\n{proc.stderr[-2000:]}')
+        total, modules = parse_importtime(proc.stderr)
+        totals.append(total)
+    return statistics.median(totals) / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--verbose', action='store_true', help='show the slowest imports per page')
+    args = parser.parse_args()
+
+    failed = []
+    for path, budget in BUDGETS_MS.items():
+        ms, modules = measure(path, args.runs)
+        status = 'ok' if ms <= budget else 'OVER BUDGET'
+        print(f'{path:32s} {ms:8.0f} ms  (budget {budget} ms)  {status}')
+        if args.verbose:
+            for name, us in sorted(modules, key=lambda m: -m[1])[:5]:
+                print(f'    {name:40s} {us / 1000:8.0f} ms')
+        if ms > budget:
+            failed.append(path)
+
+    if failed:
+        print(f'\nImport budget exceeded: {", ".join(failed)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
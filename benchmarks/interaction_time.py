@@ -0,0 +1,119 @@
+"""
+Server time per interaction, whole-page rerun vs fragment rerun.
+
+Starts the app with `streamlit run` (and a local fake LLM endpoint so the
+AI buttons never leave the machine), then drives it over the browser's
+websocket protocol. Every interaction is sent twice: once as a full-page
+rerun, which is what a click cost before the page was split into
+fragments, and once scoped to the fragment holding the widget, which is
+what it costs now. The time is measured from sending the rerun request to
+receiving "script finished".
+
+Usage:
+    python benchmarks/interaction_time.py [--repeat N] [--port 8599]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tools.fake_llm_server import serve  # noqa: E402
+from tools.st_client import StreamlitSession, wait_until_healthy  # noqa: E402
+
+TEAM_LABEL = "Select a Premier League Team (2024-25):"
+
+# (page, interaction kind, widget label, values to alternate between)
+SCENARIOS = [
+    ('Team_Dashboard', 'click', "📝 Generate Team Analysis", None),
+    ('Player_Analysis', 'click', "📝 Generate Analysis", None),
+    ('Player_Comparison', 'click', "📝 Generate Comparison", None),
+    ('TOTS', 'click', "📝 Generate TOTS Description", None),
+    ('Market_Analysis', 'select', TEAM_LABEL, ['Arsenal', 'Chelsea']),
+]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_app(port, llm_port, reports_dir):
+    env = dict(
+        os.environ,
+        LLM_BASE_URL=f'http://127.0.0.1:{llm_port}/v1',
+        API_KEY='fake',
+        PL_REPORTS_DIR=reports_dir,
+    )
+    return subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'PL.py',
+         '--server.headless', 'true', '--server.port', str(port),
+         '--browser.gatherUsageStats', 'false'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def interact(session, kind, label, values, i, full):
+    widget = session.widgets[label]
+    fragment_id = '' if full else widget.fragment_id
+    if kind == 'click':
+        return session.click(label, fragment_id=fragment_id)
+    return session.select(label, values[i % len(values)], fragment_id=fragment_id)
+
+
+def measure(base_url, repeat):
+    rows = []
+    with StreamlitSession(base_url) as session:
+        for page, kind, label, values in SCENARIOS:
+            session.open_page(page)
+            timings = {}
+            for full in (True, False):
+                # One untimed interaction warms caches and the report job
+                interact(session, kind, label, values, 0, full)
+                times = []
+                for i in range(repeat):
+                    result = interact(session, kind, label, values, i + 1, full)
+                    if result.exceptions:
+                        raise RuntimeError(f'{page}: {result.exceptions[0]}')
+                    times.append(result.seconds * 1000)
+                timings[full] = times
+            rows.append((page, label, timings[True], timings[False],
+                         bool(session.widgets[label].fragment_id)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--port', type=int, default=0, help='port for the app (default: any free port)')
+    args = parser.parse_args()
+
+    port = args.port or free_port()
+    llm = serve(port=0)
+    with tempfile.TemporaryDirectory() as reports_dir:
+        app = start_app(port, llm.server_port, reports_dir)
+        try:
+            base_url = f'http://127.0.0.1:{port}'
+            wait_until_healthy(base_url)
+            rows = measure(base_url, args.repeat)
+        finally:
+            app.terminate()
+            app.wait()
+            llm.shutdown()
+
+    print(f'{"page":20s} {"interaction":36s} {"full page":>12s} {"fragment":>12s} {"speedup":>8s}')
+    for page, label, full, frag, in_fragment in rows:
+        full_ms, frag_ms = statistics.median(full), statistics.median(frag)
+        note = '' if in_fragment else '  (not in a fragment)'
+        print(f'{page:20s} {label:36s} {full_ms:9.1f} ms {frag_ms:9.1f} ms {full_ms / frag_ms:7.1f}x{note}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+Load test: concurrent simulated users against one Streamlit process.
+
+Starts the app headless (with the fake LLM endpoint, so AI reports never
+leave the machine) and, for each concurrency level in --sessions, runs that
+many simulated browser tabs at once (tools/st_client.py). Every tab goes
+through the same flows a user would:
+
+    dashboard   open Team Dashboard, pick two teams
+    analysis    open Player Analysis, pick a team and a player
+    comparison  open Player Comparison, pick a position and three players,
+                generate the AI comparison
+    tots        open Team Of The Season
+
+--iterations times. Choices come from a random generator seeded per tab,
+so two runs do exactly the same work, and one untimed pass warms the
+caches first. For every level it reports rerun latency percentiles
+(overall and per flow), reruns per second and the server's memory (RSS of
+the app process, sampled every 100 ms). --json writes the results, and
+--compare prints the change against a previous --json file.
+
+Usage:
+    python benchmarks/load_test.py [--sessions 1,5,10,20] [--iterations 3] [--json out.json] [--compare old.json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analytics.llm import percentiles  # noqa: E402
+from benchmarks.interaction_time import TEAM_LABEL, free_port, start_app  # noqa: E402
+from tools.fake_llm_server import serve  # noqa: E402
+from tools.st_client import StreamlitSession, wait_until_healthy  # noqa: E402
+
+
+def dashboard(session, rng):
+    yield session.open_page('Team_Dashboard')
+    for _ in range(2):
+        yield session.select(TEAM_LABEL, rng.choice(session.widgets[TEAM_LABEL].options))
+
+
+def analysis(session, rng):
+    yield session.open_page('Player_Analysis')
+    yield session.select('Select Team:', rng.choice(session.widgets['Select Team:'].options))
+    yield session.select('Select Player:', rng.choice(session.widgets['Select Player:'].options))
+
+
+def comparison(session, rng):
+    yield session.open_page('Player_Comparison')
+    yield session.select('Position', rng.choice(session.widgets['Position'].options))
+    label = next(label for label in session.widgets if label.startswith('Players (up to'))
+    yield session.select(label, rng.sample(session.widgets[label].options, 3))
+    yield session.click('📝 Generate Comparison')
+
+
+def tots(session, rng):
+    yield session.open_page('TOTS')
+
+
+FLOWS = {'dashboard': dashboard, 'analysis': analysis, 'comparison': comparison, 'tots': tots}
+
+
+def run_user(base_url, seed, iterations, record):
+    """One tab doing every flow `iterations` times; record(flow, seconds, error) per rerun."""
+    rng = random.Random(seed)
+    with StreamlitSession(base_url) as session:
+        session.open_page()
+        for _ in range(iterations):
+            for name, flow in FLOWS.items():
+                for result in flow(session, rng):
+                    record(name, result.seconds, result.exceptions[0] if result.exceptions else None)
+
+
+class MemorySampler:
+    """Peak and last RSS of a process, sampled in a background thread (Linux /proc)."""
+
+    def __init__(self, pid, interval=0.1):
+        self.pid = pid
+        self.interval = interval
+        self.peak = self.last = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def rss(self):
+        try:
+            with open(f'/proc/{self.pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.last = self.rss()
+            self.peak = max(self.peak, self.last)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self.last = self.rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_level(base_url, sessions, iterations, pid, seed):
+    times = defaultdict(list)
+    errors = []
+    lock = threading.Lock()
+
+    def record(flow, seconds, error):
+        with lock:
+            times[flow].append(seconds)
+            if error:
+                errors.append(f'{flow}: {error}')
+
+    def user(i):
+        try:
+            run_user(base_url, seed * 1000 + i, iterations, record)
+        except Exception as e:
+            with lock:
+                errors.append(f'session {i}: {e!r}')
+
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(sessions)]
+    with MemorySampler(pid) as memory:
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+    every = [s for values in times.values() for s in values]
+    return {
+        'sessions': sessions,
+        'reruns': len(every),
+        'seconds': elapsed,
+        'reruns_per_s': len(every) / elapsed,
+        'latency': percentiles(every),
+        'flows': {flow: percentiles(values) for flow, values in times.items()},
+        'rss_peak_mb': memory.peak / 2**20,
+        'rss_end_mb': memory.last / 2**20,
+        'errors': errors,
+    }
+
+
+def report(levels, previous=None):
+    before = {level['sessions']: level for level in (previous or {}).get('levels', [])}
+
+    def change(level, value, key):
+        old = before.get(level['sessions'])
+        if old is None:
+            return ''
+        old_value = key(old)
+        return f' {(value / old_value - 1) * 100:+11.0f}%' if old_value else ''
+
+    print(f'{"sessions":>8s} {"reruns":>7s} {"reruns/s":>9s} {"p50 ms":>8s} {"p95 ms":>8s} {"p99 ms":>8s} '
+          f'{"peak RSS":>9s} {"errors":>6s}' + (f' {"p95 vs prev":>12s}' if before else ''))
+    for level in levels:
+        lat = level['latency']
+        p95 = lat['p95'] * 1000
+        print(f'{level["sessions"]:8d} {level["reruns"]:7d} {level["reruns_per_s"]:9.1f} {lat["p50"] * 1000:8.0f} '
+              f'{p95:8.0f} {lat["p99"] * 1000:8.0f} {level["rss_peak_mb"]:7.0f}MB {len(level["errors"]):6d}'
+              f'{change(level, p95, lambda old: old["latency"]["p95"] * 1000)}')
+    print('\np95 rerun latency by flow (ms):')
+    flows = list(FLOWS)
+    print(f'{"sessions":>8s} ' + ' '.join(f'{flow:>11s}' for flow in flows))
+    for level in levels:
+        print(f'{level["sessions"]:8d} ' + ' '.join(
+            f'{level["flows"][flow]["p95"] * 1000:11.0f}' if flow in level['flows'] else f'{"-":>11s}' for flow in flows
+        ))
+    for level in levels:
+        for error in level['errors'][:5]:
+            print(f'  [{level["sessions"]} sessions] {error}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', default='1,5,10,20', help='comma-separated concurrency levels')
+    parser.add_argument('--iterations', type=int, default=3, help='passes through every flow per session')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--llm-delay', type=float, default=1.0, help='seconds the fake LLM takes per report')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='results of an earlier run (--json) to compare against')
+    args = parser.parse_args()
+    levels = [int(n) for n in args.sessions.split(',')]
+
+    port = free_port()
+    llm = serve(port=0, delay=args.llm_delay)
+    results = []
+    with tempfile.TemporaryDirectory() as reports_dir:
+        app = start_app(port, llm.server_port, reports_dir)
+        try:
+            base_url = f'http://127.0.0.1:{port}'
+            wait_until_healthy(base_url)
+            # Untimed warm-up: imports, dataset loads and st.cache entries
+            run_level(base_url, 1, 1, app.pid, args.seed)
+            for sessions in levels:
+                results.append(run_level(base_url, sessions, args.iterations, app.pid, args.seed))
+                print(f'{sessions} sessions done', file=sys.stderr)
+        finally:
+            app.terminate()
+            app.wait()
+            llm.shutdown()
+
+    out = {
+        'config': {'iterations': args.iterations, 'seed': args.seed, 'llm_delay': args.llm_delay,
+                   'cpus': os.cpu_count(), 'python': sys.version.split()[0]},
+        'levels': results,
+    }
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        if previous.get('config') != out['config']:
+            print(f'Note: compared run used different settings: {previous.get("config")}\n')
+    report(results, previous)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(out, f, indent=1)
+    return 1 if any(level['errors'] for level in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Memorable-match detection time over many seasons (analytics/memorable.py).
+
+Builds the match frame of the current season and stacks it --seasons times
+as separate seasons (dates moved back a year per copy), with one shot row
+per goal, its minute drawn at random within the half E0.csv says it was
+scored in (the scraped shots only cover one season). Then times, best of
+--repeat runs:
+
+    score     score_matches(): every component of every team and match
+    top       memorable_matches(): the top --top per team and season, described
+
+Usage:
+    python benchmarks/memorable.py [--seasons 30] [--top 3] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from analytics import market, memorable, team_data  # noqa: E402
+
+
+def best_time(step, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = step()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def goal_shots(matches, seed=0):
+    """One shot row per goal of `matches`, its minute drawn within the half it was scored in."""
+    rng = np.random.default_rng(seed)
+    # Both sides of a match share its id
+    match_id = pd.factorize(pd.MultiIndex.from_arrays(
+        [matches['Date'], np.minimum(matches['TeamId'], matches['OpponentId'])]))[0]
+    rows = matches.assign(MatchId=match_id).reset_index(drop=True)
+    rows = rows.loc[rows.index.repeat(rows['GF'])]
+    first_half = rows.groupby(level=0).cumcount().to_numpy() < rows['HTGF'].to_numpy()
+    return pd.DataFrame({
+        'ShotId': np.arange(len(rows)),
+        'MatchId': rows['MatchId'].to_numpy(),
+        'Date': rows['Date'].to_numpy(),
+        'TeamId': rows['TeamId'].to_numpy(),
+        'OpponentId': rows['OpponentId'].to_numpy(),
+        'Minute': np.where(first_half, rng.integers(1, 46, len(rows)), rng.integers(46, 96, len(rows))),
+        'Result': 'Goal',
+    })
+
+
+def stacked(matches, seasons):
+    """`matches` repeated as `seasons` seasons, each a year earlier than the last."""
+    copies = []
+    for i in range(seasons):
+        copy = matches.copy()
+        copy['Season'] = f'{2024 - i}-{(25 - i) % 100:02d}'
+        copy['Date'] = copy['Date'] - pd.DateOffset(years=i)
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=30)
+    parser.add_argument('--top', type=int, default=memorable.TOP_N)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    e0 = pd.read_csv(market.E0_PATH, parse_dates=['Date'], dayfirst=True)
+    matches = stacked(memorable.match_frame(e0, team_data.load_team_table()), args.seasons)
+    shot_rows = goal_shots(matches)
+
+    print(f'{args.seasons} seasons, {len(matches):,d} team matches, {len(shot_rows):,d} goals\n')
+    score_time, scored = best_time(lambda: memorable.score_matches(matches, shot_rows), args.repeat)
+    top_time, top = best_time(lambda: memorable.memorable_matches(scored, args.top), args.repeat)
+    print(f'{"score":8s} {score_time * 1000:9.1f} ms')
+    print(f'{"top":8s} {top_time * 1000:9.1f} ms   ({len(top):,d} memorable matches)')
+    print(f'{"total":8s} {(score_time + top_time) * 1000:9.1f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
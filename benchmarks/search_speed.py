@@ -0,0 +1,69 @@
+"""
+Player search latency against a large name list.
+
+Builds a NameIndex over the real player names plus synthetic ones (real
+first names crossed with real surnames) up to --names entries, then times
+typical queries: exact, misspelt, accent-free, partial and two-letter
+prefixes. Exits non-zero if the slowest query's median is over BUDGET_MS.
+
+Usage:
+    python benchmarks/search_speed.py [--names 100000] [--repeat 50]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from analytics.players import load_players  # noqa: E402
+from analytics.search import NameIndex  # noqa: E402
+
+BUDGET_MS = 5.0
+
+QUERIES = ['Mohamed Salah', 'odegard', 'Martinez', 'bruno fern', 'van dijk', 'haal', 'sa', 'De Bruyne', 'cucurela']
+
+
+def build_names(n, seed=0):
+    real = load_players()['Player Name'].tolist()
+    firsts = [name.split()[0] for name in real]
+    lasts = [name.split()[-1] for name in real]
+    rng = random.Random(seed)
+    return real + [f'{rng.choice(firsts)} {rng.choice(lasts)}' for _ in range(max(0, n - len(real)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--names', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    names = build_names(args.names)
+    started = time.perf_counter()
+    index = NameIndex(names)
+    print(f'Indexed {len(index)} names in {time.perf_counter() - started:.2f} s')
+
+    worst = 0.0
+    for query in QUERIES:
+        times = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            hits = index.search(query)
+            times.append((time.perf_counter() - started) * 1000)
+        median = statistics.median(times)
+        worst = max(worst, median)
+        top = names[hits[0]] if hits else '-'
+        print(f'{query!r:18s} median {median:6.2f} ms  max {max(times):6.2f} ms  top: {top}')
+
+    if worst > BUDGET_MS:
+        print(f'\nSlowest query takes {worst:.2f} ms (budget {BUDGET_MS} ms)')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
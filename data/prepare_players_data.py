@@ -1,17 +1,26 @@
 import pandas as pd
+import os
+import sys
 
-df = pd.read_csv("data/players_data/epl_player_stats_24_25.csv")
-
-df.loc[df["Club"] == "Brighton", "Club"] = "Brighton & Hove Albion"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics import archetypes, manifest, players, seasons, teams
 
-df.loc[df["Club"] == "Brighton & Hove Albion", "Club"] = "Brighton"
+df = pd.read_csv("data/players_data/epl_player_stats_24_25.csv")
 
-df.loc[df["Club"] == "Ipswich Town", "Club"] = "Ipswich"
+# Resolve every club spelling ("Brighton & Hove Albion", "Ipswich Town", ...)
+# to the canonical registry name and id
+df["ClubId"] = teams.team_ids(df["Club"])
+df["Club"] = teams.team_names(df["Club"])
 
-df.loc[df["Club"] == "Leicester City", "Club"] = "Leicester"
+# Role archetype of every player, clustered on their per-90 profile within
+# their position (analytics/archetypes.py)
+df["Archetype"] = archetypes.assign(players.prepare_players(df, compact=False))
 
-df.loc[df["Club"] == "Tottenham Hotspur", "Club"] = "Tottenham"
+df.to_csv("data/players_data/epl_player_stats_2024_25.csv")
 
-df.loc[df["Club"] == "West Ham United", "Club"] = "West Ham"
+# Give this season's players their cross-season ids: other seasons keep
+# theirs, this one is matched to them again since its table was rewritten
+seasons.update_index(refresh=["2024_25"])
 
-df.to_csv("data/players_data/epl_player_stats_2024_25.csv")
\ No newline at end of file
+# Record the new content hashes: caches built from the old files are now stale
+manifest.update(["data/players_data/epl_player_stats_2024_25.csv", seasons.IDS_PATH])
@@ -1,16 +1,14 @@
 from understatapi import UnderstatClient
 import pandas as pd
+import os
+import sys
 
-understat = UnderstatClient()
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics import teams
 
-teams = [
-    "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton",
-    "Chelsea", "Crystal Palace", "Everton", "Fulham", "Liverpool",
-    "Manchester City", "Manchester United", "Newcastle United", "Nottingham Forest", "Southampton",
-    "Tottenham", "West Ham", "Wolverhampton Wanderers", "Leicester", "Ipswich"
-]
+understat = UnderstatClient()
 
-for team_name in teams:
+for team_name in teams.TEAM_NAMES:
     print(f'Processing {team_name}...')
 
     try:
@@ -47,8 +45,8 @@ for team_name in teams:
 
         df = df[['gw', 'xg', 'xga', 'npxg', 'npxga', 'xpts', 'result', 'pts', 'xgd', 'cum_xg', 'cum_xga', 'cum_pts']]
 
-        # Sanitize filename (remove special characters, spaces to underscores)
-        file_name = team_name.lower().replace(' ', '_').replace('/', '_') + '_stats.csv'
+        # Registry file key (lower case, spaces to underscores)
+        file_name = teams.file_key(team_name) + '_stats.csv'
         df.to_csv(file_name, index=False)
 
         print(f'Done: {file_name}')
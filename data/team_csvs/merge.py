@@ -1,15 +1,13 @@
 import pandas as pd
+import os
+import sys
 
-teams = [
-    "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton",
-    "Chelsea", "Crystal Palace", "Everton", "Fulham", "Liverpool",
-    "Manchester City", "Manchester United", "Newcastle United", "Nottingham Forest", "Southampton",
-    "Tottenham", "West Ham", "Wolverhampton Wanderers", "Leicester", "Ipswich"
-]
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from analytics import teams
 
-for team in teams:
-    # build filenames
-    key = team.lower().replace(' ', '_').replace('/', '_')
+for team in teams.TEAM_NAMES:
+    # build filenames from the registry key
+    key = teams.file_key(team)
     raw_file   = f"data/team_csvs/{key}_data.csv"   # e.g. arsenal_data.csv
     stats_file = f"data/team_csvs/{key}_stats.csv"  # e.g. arsenal_stats.csv
 
@@ -35,8 +33,13 @@ for team in teams:
         # optionally drop the duplicate 'gw' column if you don't need both
         df_combined.drop(columns=['gw'], inplace=True)
 
-        # save combined file
-        out_file = f"data/team_data/{key}_combined.csv"
+        # one name per club: the registry name (the file name says which
+        # team it is, so a TeamId column from teams_data.py is not kept)
+        df_combined.drop(columns=['TeamId'], errors='ignore', inplace=True)
+        df_combined['Team'] = team
+
+        # save combined file under the name the dashboards read
+        out_file = teams.team_data_path(team)
         df_combined.to_csv(out_file, index=False)
         print(f"✓ {team}: wrote {out_file}")
 
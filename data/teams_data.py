@@ -1,5 +1,9 @@
 import pandas as pd
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics import teams
 
 # 1. Load raw match data and parse dates
 df = pd.read_csv('data/E0.csv', parse_dates=['Date'], dayfirst=True)
@@ -13,24 +17,29 @@ away.columns = ['Date','Team','Opponent','GF','GA','FTR']
 
 matches = pd.concat([home, away], ignore_index=True)
 
+# Resolve E0 short names ("Man United", "Wolves", ...) to registry ids
+matches['TeamId'] = teams.team_ids(matches['Team'])
+matches['Team'] = teams.team_names(matches['Team'])
+matches['Opponent'] = teams.team_names(matches['Opponent'])
+
 # 3. Sort per team by Date, then assign Round = occurrence index
-matches = matches.sort_values(['Team','Date']).reset_index(drop=True)
-matches['Round'] = matches.groupby('Team').cumcount() + 1
+matches = matches.sort_values(['TeamId','Date']).reset_index(drop=True)
+matches['Round'] = matches.groupby('TeamId').cumcount() + 1
 
 # 4. Calculate match points and cumulative stats
 matches['MatchPoints'] = matches.apply(
     lambda r: 3 if r.GF > r.GA else (1 if r.GF == r.GA else 0), axis=1
 )
-matches['TotalPoints']            = matches.groupby('Team')['MatchPoints'].cumsum()
-matches['GoalsForCumulative']     = matches.groupby('Team')['GF'].cumsum()
-matches['GoalsAgainstCumulative'] = matches.groupby('Team')['GA'].cumsum()
+matches['TotalPoints']            = matches.groupby('TeamId')['MatchPoints'].cumsum()
+matches['GoalsForCumulative']     = matches.groupby('TeamId')['GF'].cumsum()
+matches['GoalsAgainstCumulative'] = matches.groupby('TeamId')['GA'].cumsum()
 
 # 5. Compute league position at each Round
 positions = []
 for rnd in sorted(matches['Round'].unique()):
     snap = (
         matches[matches['Round']==rnd]
-        .groupby('Team')
+        .groupby('TeamId')
         .agg({
             'TotalPoints'           : 'max',
             'GoalsForCumulative'    : 'max',
@@ -45,15 +54,15 @@ for rnd in sorted(matches['Round'].unique()):
     )
     snap['Position'] = range(1, len(snap)+1)
     snap['Round']    = rnd
-    positions.append(snap[['Round','Team','Position']])
+    positions.append(snap[['Round','TeamId','Position']])
 
 league = pd.concat(positions)
 
 # 6. Merge back to get full detailed table
 detailed = matches.merge(
-    league, on=['Round','Team'], how='left'
+    league, on=['Round','TeamId'], how='left'
 )[[
-    'Round','Team','MatchPoints','TotalPoints',
+    'Round','TeamId','Team','MatchPoints','TotalPoints',
     'GF','GA','GoalsForCumulative',
     'GoalsAgainstCumulative','Position'
 ]]
@@ -61,9 +70,9 @@ detailed = matches.merge(
 # 7. Export one CSV per team
 out_dir = 'data/team_csvs'
 os.makedirs(out_dir, exist_ok=True)
-for team, df_team in detailed.groupby('Team'):
+for team_id, df_team in detailed.groupby('TeamId'):
     df_team = df_team.sort_values('Round')
-    safe_name = team.replace('/', '_')
-    df_team.to_csv(f"{out_dir}/{safe_name}_data.csv", index=False)
+    key = teams.file_key(teams.ID_TO_NAME[team_id])
+    df_team.to_csv(f"{out_dir}/{key}_data.csv", index=False)
 
 print(f"Per-team CSVs saved to {out_dir}")
@@ -0,0 +1,81 @@
+import streamlit as st
+import altair as alt
+
+from analytics import caches, datasets, league
+
+# Page configuration
+st.set_page_config(
+    page_title="League Overview",
+    page_icon="🏆",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Premier League colors
+PL_PRIMARY_COLOR = "#37003C"
+
+
+# Built once per version of the team data from the shared long team table;
+# every chart on the page is a projection of this one frame
+@caches.cache_data(show_spinner=False)
+def load_league(version):
+    return league.league_frame(datasets.teams())
+
+
+frame = load_league(datasets.version('teams'))
+
+# Header
+st.markdown(f"<h1 style='text-align: center; color: {PL_PRIMARY_COLOR};'>🏆 League Overview</h1>", unsafe_allow_html=True)
+st.markdown("---")
+
+
+# Switching metric or view only redraws this section
+@st.fragment
+def overview(frame):
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        metric = st.selectbox("Metric:", list(league.METRICS))
+    with col2:
+        view = st.radio("View:", ["Small multiples", "All teams in one chart"], horizontal=True)
+
+    column = league.METRICS[metric]
+    data = league.metric_data(frame, column)
+    y = alt.Y(f'{column}:Q', title=metric, sort='descending' if column == 'Position' else 'ascending')
+
+    if view == "Small multiples":
+        chart = alt.Chart(data).mark_line(color=PL_PRIMARY_COLOR).encode(
+            x=alt.X('Round:Q', title=None), y=y,
+            tooltip=['Team', 'Round', alt.Tooltip(f'{column}:Q', format='.2f', title=metric)]
+        ).properties(width=180, height=120).facet(
+            facet=alt.Facet('Team:N', title=None), columns=5
+        )
+    else:
+        # One line mark for every team; click a legend entry to highlight a team
+        highlight = alt.selection_point(fields=['Team'], bind='legend')
+        chart = alt.Chart(data).mark_line().encode(
+            x='Round:Q', y=y,
+            color=alt.Color('Team:N', legend=alt.Legend(columns=2, symbolLimit=0)),
+            opacity=alt.condition(highlight, alt.value(1.0), alt.value(0.15)),
+            tooltip=['Team', 'Round', alt.Tooltip(f'{column}:Q', format='.2f', title=metric)]
+        ).add_params(highlight).properties(height=500)
+    st.altair_chart(chart, use_container_width=True)
+
+
+overview(frame)
+st.markdown("---")
+
+# Section: Final table with expected numbers
+st.subheader("Final Table")
+st.dataframe(league.standings(frame), hide_index=True, use_container_width=True)
+
+# Footer
+st.markdown("""
+    <br><br>
+    <div style='text-align: center; color: #37003C;'>
+        Built with passion for Premier League fans ⚽️
+    </div>
+""", unsafe_allow_html=True)
+st.markdown(
+    "<div style='text-align:center; margin-top:50px; color:gray;'>© 2025 Houssem Aridhi</div>",
+    unsafe_allow_html=True
+)
@@ -0,0 +1,174 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+
+from analytics import caches, manifest, market
+from analytics.teams import TEAM_NAMES, team_data_path
+
+# Page configuration
+st.set_page_config(
+    page_title="Market Analysis",
+    page_icon="💷",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Premier League colors
+PL_PRIMARY_COLOR = "#37003C"
+PL_WIN_COLOR = "#2ECC71"      # Green
+PL_DRAW_COLOR = "#000000"     # Black
+PL_LOSS_COLOR = "#E74C3C"     # Red
+PL_XG_COLOR = "#1F78B4"       # Blue for Understat
+
+# Odds are loaded per bookmaker, so each selection only reads its own columns.
+# Every load is keyed by the content hash of the files it reads, so rewriting
+# E0.csv or a team CSV only invalidates the loads built from it
+@caches.cache_data
+def bookmaker_odds(book, mkt, closing, version):
+    return market.load_bookmaker_odds(book, mkt, closing)
+
+@caches.cache_data
+def odds_coverage(books, closing, version):
+    return market.odds_coverage(list(books), '1X2', closing)
+
+@caches.cache_data
+def load_matches(version):
+    return market.load_matches()
+
+@caches.cache_data
+def load_team_frames(teams, version):
+    return {t: pd.read_csv(team_data_path(t)) for t in teams}
+
+@caches.cache_data
+def load_comparison(books, closing, odds_version, teams_version):
+    probs = market.market_probabilities(
+        list(books), '1X2', closing, loader=lambda b, m, c: bookmaker_odds(b, m, c, odds_version)
+    )
+    long = market.team_market_frame(load_matches(odds_version), probs)
+    return market.compare_with_understat(long, load_team_frames(tuple(TEAM_NAMES), teams_version))
+
+# Header
+st.markdown(f"<h1 style='text-align: center; color: {PL_PRIMARY_COLOR};'>💷 Market Expectation vs Reality</h1>", unsafe_allow_html=True)
+st.markdown("---")
+
+# Bookmaker selection
+col1, col2 = st.columns([3, 1])
+with col2:
+    closing = st.toggle("Closing odds", value=False)
+available = market.available_bookmakers(closing=closing)
+odds_version = manifest.version([market.E0_PATH])
+priced, n_matches = odds_coverage(tuple(available), closing, odds_version)
+
+# Bookmakers with blank odds for part of the season are flagged in the list
+def bookmaker_label(b):
+    if priced[b] < n_matches:
+        return f"{market.BOOKMAKERS[b]} (odds for {priced[b]}/{n_matches} matches)"
+    return market.BOOKMAKERS[b]
+
+with col1:
+    default = [b for b in ['PS', 'B365', 'Avg'] if b in available]
+    books = st.multiselect(
+        "Bookmakers:", available, default=default,
+        format_func=bookmaker_label
+    )
+
+if not books:
+    st.info("Select at least one bookmaker.")
+    st.stop()
+
+teams_version = manifest.version([team_data_path(t) for t in TEAM_NAMES])
+compared = load_comparison(tuple(books), closing, odds_version, teams_version)
+summary = market.season_summary(compared)
+
+# Only matches every selected bookmaker priced are compared
+n_compared = compared['Match'].nunique()
+if n_compared == 0:
+    st.info("The selected bookmakers have no match with odds from all of them.")
+    st.stop()
+if n_compared < n_matches:
+    st.caption(f"Compared over the {n_compared} of {n_matches} matches that every selected bookmaker has odds for.")
+
+# Team and timeline bookmaker only change this section, so switching them
+# reruns the fragment instead of reloading odds for the whole page
+@st.fragment
+def team_section(compared, summary, books):
+    # Team selector
+    selected_team = st.selectbox("Select a Premier League Team (2024-25):", TEAM_NAMES)
+    book = st.selectbox(
+        "Bookmaker for the timeline:", books,
+        format_func=lambda b: market.BOOKMAKERS[b]
+    )
+
+    team_df = compared[(compared['Team'] == selected_team) & (compared['Bookmaker'] == book)]
+    if team_df.empty:
+        st.info(f"No {selected_team} match was priced by every selected bookmaker.")
+        return
+    team_df = team_df.assign(Outcome=team_df['Points'].map({3: 'Win', 1: 'Draw', 0: 'Loss'}))
+
+    # KPIs
+    latest = team_df.iloc[-1]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Points", int(latest.cum_points))
+    col2.metric("Market xPts", round(latest.cum_market_xpts, 2))
+    col3.metric("Understat xPts", round(latest.cum_xpts, 2))
+    col4.metric("Points vs Market", round(latest.cum_points - latest.cum_market_xpts, 2))
+    st.markdown("---")
+
+    # Section: Cumulative points against both expectations
+    st.subheader("Points vs Market and Understat Expectations")
+    timeline = team_df[['Round', 'cum_points', 'cum_market_xpts', 'cum_xpts']].rename(columns={
+        'cum_points': 'Points', 'cum_market_xpts': 'Market xPts', 'cum_xpts': 'Understat xPts'
+    }).melt('Round', var_name='Series', value_name='Value')
+    timeline_chart = alt.Chart(timeline).mark_line(point=True).encode(
+        x='Round:O', y=alt.Y('Value:Q', title='Cumulative Points'),
+        color=alt.Color('Series:N', scale=alt.Scale(
+            domain=['Points', 'Market xPts', 'Understat xPts'],
+            range=[PL_PRIMARY_COLOR, PL_WIN_COLOR, PL_XG_COLOR]
+        )),
+        tooltip=['Round', 'Series', alt.Tooltip('Value:Q', format='.2f')]
+    ).properties(height=350)
+    st.altair_chart(timeline_chart, use_container_width=True)
+
+    # Section: Pre-match win probability per round
+    st.subheader("Pre-Match Win Probability by Round")
+    prob_chart = alt.Chart(team_df[['Round', 'Opponent', 'Venue', 'pWin', 'Outcome']]).mark_bar().encode(
+        x='Round:O', y=alt.Y('pWin:Q', title='Win Probability', scale=alt.Scale(domain=[0, 1])),
+        color=alt.Color('Outcome:N', scale=alt.Scale(domain=['Win', 'Draw', 'Loss'], range=[PL_WIN_COLOR, PL_DRAW_COLOR, PL_LOSS_COLOR])),
+        tooltip=['Round', 'Opponent', 'Venue', alt.Tooltip('pWin:Q', format='.0%'), 'Outcome']
+    ).properties(height=300)
+    st.altair_chart(prob_chart, use_container_width=True)
+    st.markdown("---")
+
+    # Section: League-wide over/under-performance
+    st.subheader("Points Above Expectation (Whole League)")
+    league = summary[summary['Bookmaker'] == book]
+    league_chart = alt.Chart(league[['Team', 'vsMarket', 'vsUnderstat']]).transform_fold(
+        ['vsMarket', 'vsUnderstat'], as_=['Against', 'Difference']
+    ).mark_bar().encode(
+        x=alt.X('Team:N', sort='-y'), y=alt.Y('Difference:Q', title='Points - Expected Points'),
+        xOffset='Against:N',
+        color=alt.Color('Against:N', scale=alt.Scale(domain=['vsMarket', 'vsUnderstat'], range=[PL_WIN_COLOR, PL_XG_COLOR]))
+    ).properties(height=350)
+    st.altair_chart(league_chart, use_container_width=True)
+
+
+team_section(compared, summary, books)
+
+# Section: Bookmaker margins
+st.subheader("Average Bookmaker Margin")
+margins = compared.groupby('Bookmaker', as_index=False)['Margin'].mean()
+margins['Bookmaker'] = margins['Bookmaker'].map(market.BOOKMAKERS)
+margins['Margin'] = (margins['Margin'] * 100).round(2).astype(str) + '%'
+st.dataframe(margins, hide_index=True)
+
+# Footer
+st.markdown("""
+    <br><br>
+    <div style='text-align: center; color: #37003C;'>
+        Built with passion for Premier League fans ⚽️
+    </div>
+""", unsafe_allow_html=True)
+st.markdown(
+    "<div style='text-align:center; margin-top:50px; color:gray;'>© 2025 Houssem Aridhi</div>",
+    unsafe_allow_html=True
+)
@@ -1,15 +1,13 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-from openai import OpenAI
-import os
-from dotenv import load_dotenv
 
-# Load .env file from current directory
-load_dotenv()
-
-api_key = os.getenv("API_KEY")
+from analytics import datasets, prompts
+from analytics.reports import report_section
+from analytics.percentiles import MIN_POOL, usage_bucket
+from analytics.form import FORM_STATS, WINDOWS
+from analytics.player_charts import form_figure, radar_figure
+from analytics.profiles import POOL_LABELS, RADAR_STATS_MAP, USAGE_LABELS, key_metrics, radar_summary, radar_values
+from analytics.seasons import season_label
+from analytics.shots import SITUATIONS, shot_summary
 
 # Page configuration
 st.set_page_config(
@@ -19,39 +17,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Load and prepare data
-@st.cache_data
-def load_data():
-    df = pd.read_csv('data/players_data/epl_player_stats_2024_25.csv')
-    
-    # Map detailed positions to categories
-    def map_pos(p):
-        p = str(p).upper()
-        if 'GKP' in p:
-            return 'Goalkeeper'
-        if any(tag in p for tag in ['DEF']):
-            return 'Defender'
-        if any(tag in p for tag in ['MID']):
-            return 'Midfielder'
-        if any(tag in p for tag in ['FWD']):
-            return 'Forward'
-        return 'Other'
-    df['PosCat'] = df['Position'].apply(map_pos)
-
-    # Create per90 columns for relevant stats
-    per90_cols = [
-        'Goals','Assists','Shots','Touches','Passes','Successful Passes','Through Balls',
-        'Progressive Carries','fThird Passes','Successful fThird Passes','Tackles','Interceptions',
-        'Blocks','Clearances','Clearances Off Line','Possession Won','Ground Duels','Aerial Duels',
-        'Fouls','Saves','Penalties Saved','Own Goals','Goals Conceded','Punches','High Claims'
-    ]
-    for col in per90_cols:
-        if col in df.columns and df['Minutes'].dtype in [np.float64, np.int64]:
-            df[col + ' per90'] = df[col] / df['Minutes'] * 90
-
-    return df
-
-df = load_data()
+# Prepared player table, shared read-only across sessions and processes
+df = datasets.players()
 
 # Theme color
 PRIMARY = '#37003C'
@@ -60,120 +27,74 @@ PRIMARY = '#37003C'
 st.markdown(f"<h1 style='text-align:center; color:{PRIMARY};'>🔍 Player Analysis</h1>", unsafe_allow_html=True)
 st.markdown("---")
 
+# Global search: picking a match fills in the team, position and player below
+def jump_to_player():
+    i = st.session_state['search_pick']
+    if i is not None:
+        st.session_state['team'] = df.at[i, 'Club']
+        st.session_state['pos'] = df.at[i, 'PosCat']
+        st.session_state['player'] = df.at[i, 'Player Name']
+    st.session_state['search_query'] = ''
+
+query = st.text_input('🔎 Search any player:', key='search_query', placeholder='e.g. Odegaard, Salah, van Dijk')
+if query:
+    hits = datasets.player_index().search(query, limit=10)
+    if hits:
+        st.selectbox(
+            'Matches:', hits, index=None, key='search_pick', on_change=jump_to_player,
+            format_func=lambda i: f"{df.at[i, 'Player Name']} — {df.at[i, 'Club']} ({df.at[i, 'PosCat']})",
+            placeholder=f"{len(hits)} best matches, pick one"
+        )
+    else:
+        st.caption('No player matches that search.')
+
 # Team selector
 teams = sorted(df['Club'].unique())
-team = st.selectbox('Select Team:', teams)
+team = st.selectbox('Select Team:', teams, key='team')
 
 df_team = df[df['Club'] == team]
 
 # Position selector
 pos_order = ['Goalkeeper','Defender','Midfielder','Forward']
 avail = [p for p in pos_order if p in df_team['PosCat'].unique()]
-pos = st.selectbox('Select Position:', avail)
+pos = st.selectbox('Select Position:', avail, key='pos')
 
 df_pos = df_team[df_team['PosCat'] == pos]
 
 # Player selector
-player = st.selectbox('Select Player:', sorted(df_pos['Player Name']))
+player = st.selectbox('Select Player:', sorted(df_pos['Player Name']), key='player')
 row = df_pos[df_pos['Player Name'] == player].iloc[0]
 
-# Stat map per position
-stats_map = {
-    'Goalkeeper': [
-        'Saves','Saves %','Penalties Saved','Goals Prevented',
-        'Clean Sheets','Punches','High Claims','Goals Conceded','Own Goals'
-    ],
-    'Defender': [
-        'Tackles','Interceptions','Blocks','Clearances','Possession Won',
-        'gDuels %','aDuels %','Goals','Assists','Passes','Passes%','Own Goals'
-    ],
-    'Midfielder': [
-        'Goals','Assists','Touches','Shots','Passes','Passes%',
-        'Through Balls','Progressive Carries','fThird Passes','fThird Passes %',
-        'Tackles','Interceptions','gDuels %','aDuels %','Fouls'
-    ],
-    'Forward': [
-        'Goals','Assists','Shots','Conversion %','Big Chances Missed','Hit Woodwork',
-        'Passes','Passes%','fThird Passes','fThird Passes %'
-    ]
-}
-
-# Compute percentiles
-def fmt_val(col):
-    # Decide which minutes bucket this player is in
-    mins = row['Minutes']
-    if mins > 1500:
-        mask_mins = (df['Minutes'] > 1500)
-    elif mins >= 700:
-        mask_mins = (df['Minutes'] >= 700) & (df['Minutes'] <= 1500)
-    else:
-        mask_mins = (df['Minutes'] < 700)
-
-    # Pool: same position and same usage bucket
-    pool = df[(df['PosCat'] == pos) & mask_mins]
-
-    # Fallback if pool too small
-    if len(pool) < 5:  
-        # broaden to entire position
-        pool = df[df['PosCat'] == pos]
-
-    # Choose per90 or raw column
-    per90_col = col + ' per90'
-    use_col = per90_col if per90_col in df.columns else col
-
-    # Get value and series
-    val = row[use_col]
-    series = pool[use_col]
-
-    # Format numeric vs. string
-    try:
-        num_val = float(val)
-        val_str = f"{num_val:.2f}"
-    except:
-        val_str = str(val)
-
-    # Compute percentile: invert for “less is better” stats
-    try:
-        if col in ['Goals Conceded', 'Own Goals', 'Fouls', 'Hit Woodwork', 'Big Chances Missed']:
-            pct = 100 - int(series.rank(pct=True, ascending=True)[row.name] * 100)
-        else:
-            pct = int(series.rank(pct=True)[row.name] * 100)
-    except:
-        pct = None
-
-    return f"{val_str} (P{pct if pct is not None else 'N/A'})"
-
-
 # Display header info
 st.markdown(f"<h2 style='color:{PRIMARY};'>{player} — {pos}</h2>", unsafe_allow_html=True)
 st.write(f"**Nationality:** {row['Nationality']}  |  **Appearances:** {row['Appearances']}  |  **Minutes:** {row['Minutes']} |  **Yellow Cards:** {row['Yellow Cards']} |  **Red Cards:** {row['Red Cards']}")
 st.markdown("---")
 
-# Determine usage bucket
-mins = row['Minutes']
-if mins > 1500:
-    bucket = "🔴 High‑usage (> 1500 min)"
-    bucket_expl = "This player is a regular starter—percentiles compare to other > 1500 min players."
-elif mins >= 700:
-    bucket = "🟡 Medium‑usage (700–1500 min)"
-    bucket_expl = "This player is a semi‑regular—percentiles compare to other 700–1500 min players."
+# Percentile pool: position and usage, or the player's role archetype
+pool = st.radio("Compare with:", list(POOL_LABELS), format_func=POOL_LABELS.get, horizontal=True, key='pool')
+pcts = datasets.percentiles(pool)
+
+# Determine usage bucket (or the archetype the player is compared within)
+if pool == 'archetype':
+    bucket = f"🧩 {row['Archetype']}"
+    n_archetype = (df['Archetype'] == row['Archetype']).sum()
+    # Archetypes too small to rank within are ranked against the whole position
+    if n_archetype < MIN_POOL:
+        bucket_expl = (f"Only {n_archetype} players share this role archetype, so percentiles compare to "
+                       f"all {(df['PosCat'] == pos).sum()} players of the position.")
+    else:
+        bucket_expl = f"Percentiles compare to the {n_archetype} players of this role archetype."
 else:
-    bucket = "🟢 Low‑usage (< 700 min)"
-    bucket_expl = "This player is a rotational/young player/got injured—percentiles compare to other < 700 min players."
+    bucket, bucket_expl = USAGE_LABELS[usage_bucket([row['Minutes']])[0]]
 
 # Display the bucket info
 st.markdown(f"<h4 style='color:{PRIMARY};'>{bucket}</h4>", unsafe_allow_html=True)
 st.caption(bucket_expl)
 st.markdown("---")
 
-# Display key metrics table
-stats = stats_map.get(pos, [])
-d = {}
-
-for col in stats:
-    per90_col = col + ' per90'
-    label = f"{col} (per90)" if per90_col in df.columns else col
-    d[label] = fmt_val(col)
+# Display key metrics table: "X.XX (PYY)" per stat, percentiles from the
+# precomputed matrix (position and usage pool)
+d = key_metrics(row, pcts, pos)
 
 st.subheader('Key Metrics')
 for label, val in d.items():
@@ -198,59 +119,12 @@ for label, val in d.items():
     """, unsafe_allow_html=True)
 
 
-# Define your radar stats per position
-radar_stats_map = {
-    'Goalkeeper': ['Saves %', 'Clean Sheets', 'Goals Prevented', 'Goals Conceded', 'High Claims'],
-    'Defender':   ['Tackles', 'Interceptions', 'Blocks', 'gDuels %', 'aDuels %','Passes%','Goals','Assists'],
-    'Midfielder': ['Goals', 'Assists','Shots','fThird Passes', 'Passes%', 'Touches', 'Progressive Carries', 'Through Balls','Fouls'],
-    'Forward':    ['Goals', 'Shots', 'Assists','Passes%', 'Big Chances Missed']
-}
-
-# Build a dict of percentiles using fmt_val
-radar_stats = radar_stats_map.get(pos, [])
-radar_vals = {}
-for stat in radar_stats:
-    # fmt_val returns "X.XX (PYY)"; split out the numeric percentile
-    txt = fmt_val(stat)
-    try:
-        pct = int(txt.split('(P')[-1].strip(')'))
-    except:
-        pct = 0
-    radar_vals[stat] = pct / 100  # scale 0–1 for radar
-
-# Build a small DataFrame for the radar
-categories = list(radar_vals.keys())
-values = list(radar_vals.values())
-
-# Close the loop for radar
-categories += [categories[0]]
-values += [values[0]]
-
-radar_df = pd.DataFrame({
-    'Metric': categories,
-    'Percentile': values
-})
+# Radar percentiles (0–1) for the position's radar stats
+radar_vals = radar_values(row, pcts, pos)
 
 st.subheader(f"{player} Performance Radar")
 
-fig = px.line_polar(
-    radar_df,
-    r='Percentile',
-    theta='Metric',
-    line_close=True,
-    template=None
-)
-fig.update_traces(fill='toself', line_color=PRIMARY)
-fig.update_layout(
-    polar=dict(
-        radialaxis=dict(range=[0,1], showticklabels=False, ticks=''),
-        angularaxis=dict(tickfont_size=14)
-    ),
-    showlegend=False,
-    margin=dict(l=120, r=120, t=100, b=100),
-    width=600,
-    height=600
-)
+fig = radar_figure(radar_vals, PRIMARY)
 
 col1, col2, col3 = st.columns([2, 6, 2])
 
@@ -260,27 +134,66 @@ with col2:
         use_container_width=False
     )
 
-nlp_stats_map = radar_stats_map
-
-client = OpenAI(
-    api_key=api_key,
-    base_url="https://openrouter.ai/api/v1"
-)
+# Shot map (images cached per player and filter)
+# Changing the situation only redraws the shot map, not the whole page
+@st.fragment
+def shot_map_section(shot_table, shooter):
+    situation = st.selectbox("Situation:", list(SITUATIONS), key="shot_situation")
+    st.caption(shot_summary(shot_table.rows("PlayerId", shooter, situation)))
+    col1, col2, col3 = st.columns([2, 3, 2])
+    with col2:
+        st.image(datasets.shot_map("PlayerId", shooter, situation))
+
+
+st.subheader(f"{player} Shot Map")
+shot_table = datasets.shots()
+shooter = shot_table.player_id(player, row['ClubId']) if shot_table is not None else None
+if shot_table is None:
+    st.caption("No shot data yet: run data/scrape_memorable_matchs_data.py to fetch it.")
+elif shooter is None:
+    st.caption("No shots recorded for this player.")
+else:
+    shot_map_section(shot_table, shooter)
+
+# Form: rolling per-90 over the last 5 and 10 appearances, precomputed for every player
+# Changing the metric only redraws the form chart
+@st.fragment
+def form_section(player_form, form_id):
+    form_stat = st.selectbox("Form metric:", FORM_STATS, index=FORM_STATS.index("xG"), key="form_stat")
+    st.plotly_chart(form_figure(player_form.rows(form_id), form_stat, WINDOWS, PRIMARY), use_container_width=True)
+
+
+st.subheader(f"{player} Form")
+player_form = datasets.player_form()
+form_id = player_form.player_id(player, row['ClubId']) if player_form is not None else None
+if player_form is None:
+    st.caption("No match-by-match data yet: run data/scrape_memorable_matchs_data.py to fetch it.")
+elif form_id is None:
+    st.caption("No appearances recorded for this player.")
+else:
+    form_section(player_form, form_id)
+
+# Season over season: the previous season's row of the same player, joined for
+# every player at once through the cross-season identity index
+st.subheader(f"{player} Season over Season")
+deltas = datasets.season_deltas()
+changes = deltas.player(row.name, RADAR_STATS_MAP[pos]) if deltas is not None else None
+if deltas is None:
+    st.caption("Only one season of player stats so far: add earlier seasons to data/players_data and run python -m analytics.seasons.")
+elif changes is None:
+    st.caption(f"{player} did not play in the {season_label(deltas.previous_season)} season.")
+else:
+    st.caption(f"Compared with {season_label(deltas.previous_season)} ({deltas.club_before[row.name]}, "
+               f"{int(deltas.minutes_before[row.name])} min). Values per 90 where the radar shows them; "
+               "percentiles within position and usage.")
+    st.dataframe(changes.round(2), use_container_width=True)
 
-chosen = nlp_stats_map.get(pos, [])
-stats_summary = "\n".join(f"{stat}: {fmt_val(stat)}" for stat in chosen)
+stats_summary = radar_summary(row, pcts, pos)
 
 st.subheader(f"{player} AI-Powered Analysis")
 st.markdown("---")
-if st.button("📝 Generate Analysis"):
-    with st.spinner("Generating..."):
-        messages = [
-            {"role": "system", "content": "You are an expert football analyst and scout."},
-            {"role": "user", "content": f"Here are percentile stats for {player}, a {pos}:\n\n{stats_summary}\n\nWrite a 3‑4 sentence analysis and scouting report."}
-        ]
-        resp = client.chat.completions.create(model="deepseek/deepseek-r1:free", messages=messages)
-        report = resp.choices[0].message.content.strip()
-        st.write(report)
+messages = prompts.player_analysis(player, pos, stats_summary)
+report_section(messages, "📝 Generate Analysis", "Generating...")
 
 
 
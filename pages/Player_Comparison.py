@@ -1,16 +1,11 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
 import plotly.express as px
-from openai import OpenAI
-import os
-from dotenv import load_dotenv
 
-# Load .env file from current directory
-load_dotenv()
-
-api_key = os.getenv("API_KEY")
+from analytics import datasets, prompts
+from analytics.reports import report_section
+from analytics.percentiles import MIN_POOL, lookup, usage_bucket
+from analytics.profiles import POOL_LABELS, stat_value
 
 # Page setup
 st.set_page_config(
@@ -22,34 +17,8 @@ st.set_page_config(
 
 PRIMARY = '#37003C'
 
-# Load data
-@st.cache_data
-def load_data():
-    df = pd.read_csv('data/players_data/epl_player_stats_2024_25.csv')
-
-    def map_pos(p):
-        p = str(p).upper()
-        if 'GKP' in p: return 'Goalkeeper'
-        if 'DEF' in p: return 'Defender'
-        if 'MID' in p: return 'Midfielder'
-        if 'FWD' in p: return 'Forward'
-        return 'Other'
-    
-    df['PosCat'] = df['Position'].apply(map_pos)
-
-    per90_cols = [
-        'Goals','Assists','Shots','Touches','Passes','Successful Passes','Through Balls',
-        'Progressive Carries','fThird Passes','Successful fThird Passes','Tackles','Interceptions',
-        'Blocks','Clearances','Clearances Off Line','Possession Won','Ground Duels','Aerial Duels',
-        'Fouls','Saves','Penalties Saved','Own Goals','Goals Conceded','Punches','High Claims'
-    ]
-    for col in per90_cols:
-        if col in df.columns and df['Minutes'].dtype in [np.float64, np.int64]:
-            df[col + ' per90'] = df[col] / df['Minutes'] * 90
-
-    return df
-
-df = load_data()
+# Prepared player table, shared read-only across sessions and processes
+df = datasets.players()
 
 radar_stats_map = {
     'Goalkeeper': ['Saves %', 'Clean Sheets', 'Goals Prevented', 'Goals Conceded', 'High Claims'],
@@ -58,91 +27,100 @@ radar_stats_map = {
     'Forward': ['Goals', 'Shots', 'Assists','Passes%', 'Big Chances Missed']
 }
 
+MAX_PLAYERS = 10
+USAGE_ICONS = {'high': '🔴', 'mid': '🟡', 'low': '🟢'}
+
 # --- SELECTION ---
 st.markdown(f"<h1 style='text-align:center; color:{PRIMARY};'>📊 Player Comparison</h1>", unsafe_allow_html=True)
 st.markdown("---")
 
-teams = sorted(df['Club'].unique())
-
-col1, col2 = st.columns(2)
+pos_order = ['Goalkeeper','Defender','Midfielder','Forward']
+avail = [p for p in pos_order if p in df['PosCat'].unique()]
 
+col1, col2 = st.columns([1, 3])
 with col1:
-    team1 = st.selectbox("Team 1", teams, key="team1")
-    df1_team = df[df['Club'] == team1]
-    player1 = st.selectbox("Player 1", sorted(df1_team['Player Name']), key="player1")
-    row1 = df1_team[df1_team['Player Name'] == player1].iloc[0]
-    pos = row1['PosCat']
-    mins1 = row1['Minutes']
-    bucket = 'high' if mins1 > 1500 else 'mid' if mins1 >= 700 else 'low'
+    pos = st.selectbox("Position", avail)
+    pool = st.radio("Compare with:", list(POOL_LABELS), format_func=POOL_LABELS.get, key='cmp_pool')
+# Percentile matrix of the chosen pool, shared the same way
+pcts = datasets.percentiles(pool)
+
+# Players of this position, regulars first; options are row labels of df
+df_pos = df[df['PosCat'] == pos].sort_values('Minutes', ascending=False, kind='stable')
+# A new position starts from its two most-used players
+if st.session_state.get('players_pos') != pos:
+    st.session_state['players'] = df_pos.index[:2].tolist()
+    st.session_state['players_pos'] = pos
+
+def player_label(i):
+    return f"{df.at[i, 'Player Name']} ({df.at[i, 'Club']})"
+
+# Search matches are added to the comparison from a callback, before the multiselect is drawn
+def add_player():
+    i = st.session_state['cmp_pick']
+    if i is not None and i not in st.session_state['players'] and len(st.session_state['players']) < MAX_PLAYERS:
+        st.session_state['players'] = st.session_state['players'] + [i]
+    st.session_state['cmp_query'] = ''
 
 with col2:
-    team2 = st.selectbox("Team 2", teams, key="team2")
-    df2_team = df[(df['Club'] == team2) & (df['PosCat'] == pos)]
-    if bucket == 'high':
-        df2_team = df2_team[df2_team['Minutes'] > 1500]
-    elif bucket == 'mid':
-        df2_team = df2_team[(df2_team['Minutes'] >= 700) & (df2_team['Minutes'] <= 1500)]
-    else:
-        df2_team = df2_team[df2_team['Minutes'] < 700]
-
-    player2 = st.selectbox("Player 2", sorted(df2_team['Player Name']), key="player2")
-    row2 = df2_team[df2_team['Player Name'] == player2].iloc[0]
-
-st.markdown(f"### Position: {pos}  |  Usage Bucket: {'🔴' if bucket=='high' else '🟡' if bucket=='mid' else '🟢'}", unsafe_allow_html=True)
+    chosen = st.multiselect(
+        f"Players (up to {MAX_PLAYERS})", df_pos.index.tolist(), key='players',
+        format_func=player_label, max_selections=MAX_PLAYERS
+    )
+    query = st.text_input(f"🔎 Search {pos.lower()}s to add:", key='cmp_query')
+    if query:
+        hits = datasets.player_index().search(query, limit=10, allowed=(df['PosCat'] == pos).to_numpy())
+        if hits:
+            st.selectbox('Matches:', hits, index=None, key='cmp_pick', on_change=add_player,
+                         format_func=player_label, placeholder=f"{len(hits)} best matches, pick one to add")
+        else:
+            st.caption(f"No {pos.lower()} matches that search.")
+
+if not chosen:
+    st.info("Select at least one player.")
+    st.stop()
+
+rows = df.loc[chosen]
+names = rows['Player Name'].tolist()
+# Same name at two clubs: tell them apart
+if len(set(names)) < len(names):
+    names = [f"{n} ({c})" for n, c in zip(names, rows['Club'])]
+buckets = usage_bucket(rows['Minutes'])
+
+st.markdown(f"### Position: {pos}  |  Usage: " + "  ".join(f"{n} {USAGE_ICONS[b]}" for n, b in zip(names, buckets)), unsafe_allow_html=True)
+if pool == 'archetype':
+    # Archetypes too small to rank within are ranked against the whole position
+    sizes = df['Archetype'].value_counts()
+    st.caption("Percentiles compare each player with players of the same role archetype: "
+               + "; ".join(f"{n}: {a}" + (f" (only {sizes[a]} players, so against the whole position)"
+                                          if sizes[a] < MIN_POOL else "")
+                           for n, a in zip(names, rows['Archetype'])) + ".")
+else:
+    st.caption("Percentiles compare each player with players of the same position and usage (🔴 > 1500 min, 🟡 700–1500, 🟢 < 700).")
 st.markdown("---")
 
-# --- KEY METRICS ---
 stats = radar_stats_map[pos]
 
+# Percentiles of every chosen player for every stat in one lookup against
+# the precomputed matrix; adding a player costs a row, not a ranking pass
+pct = lookup(pcts, chosen, stats)
+
+# --- KEY METRICS ---
 st.subheader("Key Metrics Comparison")
-col1, col2 = st.columns(2)
-for stat in stats:
-    for r, label, c in [(row1, player1, col1), (row2, player2, col2)]:
-        per90_col = stat + ' per90'
-        use_col = per90_col if per90_col in df.columns else stat
-        try:
-            val = f"{r[use_col]:.2f}"
-        except:
-            val = str(r[use_col])
-        c.write(f"**{label}** — {stat}: {val}")
+table = pd.DataFrame(
+    [[f"{stat_value(row, stat)} (P{int(p * 100)})" for stat, p in zip(stats, pcts_row)]
+     for (_, row), pcts_row in zip(rows.iterrows(), pct)],
+    index=names, columns=stats
+)
+st.dataframe(table, use_container_width=True)
 
 # --- RADAR CHART ---
 st.subheader("Comparative Performance Radar")
-def get_radar_vals(row, pos):
-    mins = row['Minutes']
-    if mins > 1500:
-        mask = (df['Minutes'] > 1500)
-    elif mins >= 700:
-        mask = (df['Minutes'] >= 700) & (df['Minutes'] <= 1500)
-    else:
-        mask = (df['Minutes'] < 700)
-    pool = df[(df['PosCat'] == pos) & mask]
-
-    out = []
-    for stat in radar_stats_map[pos]:
-        col = stat + ' per90' if stat + ' per90' in df.columns else stat
-        try:
-            pct = 100 - pool[col].rank(pct=True, ascending=True)[row.name]*100 if stat in ['Goals Conceded', 'Own Goals','Hit Woodwork', 'Fouls', 'Big Chances Missed'] else pool[col].rank(pct=True)[row.name]*100
-        except:
-            pct = 0
-        out.append(pct/100)
-    return out
-
-vals1 = get_radar_vals(row1, pos)
-vals2 = get_radar_vals(row2, pos)
-categories = radar_stats_map[pos] + [radar_stats_map[pos][0]]
-
-# Prepare a DataFrame for both players
-metrics = radar_stats_map[pos]
-# Close the loop (append first metric at end)
-cat_loop = metrics + [metrics[0]]
-vals1_loop = vals1 + [vals1[0]]
-vals2_loop = vals2 + [vals2[0]]
-
+# Close each player's loop (append first metric at end)
+cat_loop = stats + [stats[0]]
 radar_df = pd.DataFrame({
-    'Metric': cat_loop * 2,
-    'Percentile': vals1_loop + vals2_loop,
-    'Player': [player1] * len(cat_loop) + [player2] * len(cat_loop)
+    'Metric': cat_loop * len(names),
+    'Percentile': [v for vals in pct.tolist() for v in vals + [vals[0]]],
+    'Player': [n for n in names for _ in cat_loop]
 })
 
 fig = px.line_polar(
@@ -152,10 +130,7 @@ fig = px.line_polar(
     color='Player',
     line_close=True,
     template=None,
-    color_discrete_map={
-        player1: '#1f77b4',  # blue
-        player2: '#ff7f0e'   # orange
-    }
+    color_discrete_sequence=px.colors.qualitative.D3
 )
 fig.update_traces(fill='toself')
 fig.update_layout(
@@ -174,29 +149,16 @@ with col2:
     st.plotly_chart(fig, use_container_width=False)
 
 # --- LLM COMPARATIVE ANALYSIS ---
-client = OpenAI(api_key=api_key, base_url="https://openrouter.ai/api/v1")
-
-def fmt_stat(row, stat):
-    per90_col = stat + ' per90'
-    col = per90_col if per90_col in df.columns else stat
-    try:
-        val = f"{row[col]:.2f}"
-    except:
-        val = str(row[col])
-    return f"{stat}: {val}"
-
-sum1 = "\n".join([fmt_stat(row1, s) for s in radar_stats_map[pos]])
-sum2 = "\n".join([fmt_stat(row2, s) for s in radar_stats_map[pos]])
-
-st.subheader(f"{player1} vs {player2} AI-Powered Comparative Analysis")
-if st.button("📝 Generate Comparison"):
-    with st.spinner("Generating..."):
-        messages = [
-            {"role": "system", "content": "You are a professional football analyst."},
-            {"role": "user", "content": f"Compare these two {pos}s based on their stats:\n\n{player1}:\n{sum1}\n\n{player2}:\n{sum2}\n\nWrite a 3-5 sentence comparative report outlining strengths, differences, and who may fit better in a high-intensity pressing team."}
-        ]
-        response = client.chat.completions.create(model="deepseek/deepseek-r1:free", messages=messages)
-        st.write(response.choices[0].message.content.strip())
+summaries = "\n\n".join(
+    f"{name}:\n" + "\n".join(f"{stat}: {stat_value(row, stat)}" for stat in stats)
+    for name, (_, row) in zip(names, rows.iterrows())
+)
+
+if len(names) > 1:
+    title = ' vs '.join(names) if len(names) <= 3 else f"{len(names)} {pos}s"
+    st.subheader(f"{title} AI-Powered Comparative Analysis")
+    messages = prompts.player_comparison(names, pos, summaries)
+    report_section(messages, "📝 Generate Comparison", "Generating...")
 
 
 
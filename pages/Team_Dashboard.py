@@ -1,14 +1,13 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
-from openai import OpenAI
-import os
-from dotenv import load_dotenv
 
-# Load .env file from current directory
-load_dotenv()
-
-api_key = os.getenv("API_KEY")
+from analytics import datasets, prompts
+from analytics.reports import report_section
+from analytics.shots import SITUATIONS, shot_summary
+from analytics.form import WINDOWS
+from analytics.team_charts import form_charts, points_chart, position_chart, position_share_chart, season_charts, squad_minutes_chart
+from analytics.team_data import memorable_performances, metrics_block, season_frame, season_metrics, team_frame
+from analytics.teams import TEAM_NAMES, team_id, team_logo_path
 
 # Set page configuration
 st.set_page_config(
@@ -55,39 +54,17 @@ st.markdown(f"""
 st.markdown(f"<h1 style='text-align: center; color: {PL_PRIMARY_COLOR};'>📈 Team Dashboard</h1>", unsafe_allow_html=True)
 st.markdown("---")
 
-# Teams list
-teams = sorted([
-    "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton",
-    "Chelsea", "Crystal Palace", "Everton", "Fulham", "Liverpool",
-    "Manchester City", "Manchester United", "Newcastle United", "Nottingham Forest", "Southampton",
-    "Tottenham", "West Ham", "Wolverhampton Wanderers", "Leicester", "Ipswich"
-])
-
-# Team selector
-selected_team = st.selectbox("Select a Premier League Team (2024-25):", teams)
+# Team selector (canonical names from the team registry)
+selected_team = st.selectbox("Select a Premier League Team (2024-25):", TEAM_NAMES)
 
 # Display team logo (centered using columns, bigger size)
-logo_path = f"data/team_logos/{selected_team}.png"
+logo_path = team_logo_path(selected_team)
 col1, col2, col3 = st.columns([2, 1, 2])  # Side-middle-side layout
 with col2:
     st.image(logo_path, width=220)
 
-# Load team data CSV
-csv_path = f"data/team_data/{selected_team}.csv"
-df = pd.read_csv(csv_path)
-
-# Compute match outcomes
-df['Outcome'] = df['MatchPoints'].map({3: 'Win', 1: 'Draw', 0: 'Loss'}) if 'MatchPoints' in df else df['result'].map({'w': 'Win','d': 'Draw','l': 'Loss'})
-
-# Compute xG metrics
-if 'xg' in df.columns and 'xga' in df.columns:
-    df['xGD'] = df['xg'] - df['xga']
-    df['cum_xG'] = df['xg'].cumsum()
-    df['cum_xGA'] = df['xga'].cumsum()
-
-# Compute expected points
-df['xpts'] = df.get('xpts', df['Outcome'].map({'Win':3,'Draw':1,'Loss':0}))
-df['cum_xpts'] = df['xpts'].cumsum()
+# Team rows from the shared long team table
+df = season_frame(team_frame(datasets.teams(), selected_team))
 
 # Display KPIs
 latest = df.iloc[-1]
@@ -100,57 +77,69 @@ col5.metric("xG (Total)", round(latest.cum_xG,2) if 'cum_xG' in latest else "N/A
 col6.metric("xGA (Total)", round(latest.cum_xGA,2) if 'cum_xGA' in latest else "N/A")
 st.markdown("---")
 
+# Charts get only the columns they plot (see analytics/team_charts.py)
 # Section: Points Over Season
 st.subheader("Points Over Season")
-points_line = alt.Chart(df).mark_line(point=True).encode(
-    x='Round:O', y=alt.Y('TotalPoints:Q', title='Total Points'), color=alt.value(PL_PRIMARY_COLOR)
-)
-outcome_points = alt.Chart(df).mark_circle(size=100).encode(
-    x='Round:O', y='TotalPoints:Q', color=alt.Color('Outcome:N', scale=alt.Scale(domain=['Win','Draw','Loss'], range=[PL_WIN_COLOR,PL_DRAW_COLOR,PL_LOSS_COLOR])),
-    tooltip=['Round','TotalPoints','Outcome']
-)
-st.altair_chart((points_line+outcome_points).properties(height=350), use_container_width=True)
+st.altair_chart(points_chart(df), use_container_width=True)
 
 # Section: League Position Over Season
 st.subheader("League Position Over Season")
-position_chart = alt.Chart(df).mark_line(point=True).encode(
-    x='Round:O', y=alt.Y('Position:Q', sort='descending', title='League Position (1 = Top)'), color=alt.value(PL_PRIMARY_COLOR)
-).properties(height=300)
-st.altair_chart(position_chart, use_container_width=True)
+st.altair_chart(position_chart(df), use_container_width=True)
 
 # Other Sections: Match Points, Goals, xG & xGA, xPTS
 st.markdown("---")
-for title, chart in [
-    ("Match Points by Round", alt.Chart(df).mark_bar().encode(
-        x='Round:O', y='MatchPoints:Q', color=alt.Color('Outcome:N', scale=alt.Scale(domain=['Win','Draw','Loss'], range=[PL_WIN_COLOR,PL_DRAW_COLOR,PL_LOSS_COLOR]))
-    ).properties(height=300)),
-    ("Goals For vs. Goals Against (Cumulative)", alt.layer(
-        alt.Chart(df).mark_area(opacity=0.6).encode(x='Round:O', y='GoalsForCumulative:Q', color=alt.value(PL_WIN_COLOR)),
-        alt.Chart(df).mark_area(opacity=0.6).encode(x='Round:O', y='GoalsAgainstCumulative:Q', color=alt.value(PL_LOSS_COLOR))
-    ).properties(height=300)),
-    ("Goals For & Against per Round", alt.Chart(df).transform_fold(['GF','GA'], as_=['Type','Goals']).mark_bar().encode(
-        x='Round:O', y='Goals:Q', color=alt.Color('Type:N', scale=alt.Scale(domain=['GF','GA'], range=[PL_WIN_COLOR,PL_LOSS_COLOR]))
-    ).properties(height=300)),
-    ("Expected Goals (xG) vs xGA", alt.layer(
-        alt.Chart(df).mark_bar().encode(x='Round:O', y='xg:Q', color=alt.value(PL_XG_COLOR)),
-        alt.Chart(df).mark_bar().encode(x='Round:O', y='xga:Q', color=alt.value(PL_XGA_COLOR))
-    ).properties(height=300)),
-    ("Cumulative xG & xGA", alt.layer(
-        alt.Chart(df).mark_line(point=True).encode(x='Round:O', y='cum_xG:Q', color=alt.value(PL_XG_COLOR)),
-        alt.Chart(df).mark_line(point=True).encode(x='Round:O', y='cum_xGA:Q', color=alt.value(PL_XGA_COLOR))
-    ).properties(height=300)),
-    ("Expected Points (xPTS) Over Season", alt.Chart(df).mark_line(point=True).encode(
-        x='Round:O', y='cum_xpts:Q', color=alt.value(PL_WIN_COLOR)
-    ).properties(height=300))
-]:
+for title, chart in season_charts(df):
     st.subheader(title)
     st.altair_chart(chart, use_container_width=True)
     st.markdown("---")
 
-# Section: Most Memorable Performance
+# Section: Form (rolling windows of every team, computed once with the team table)
+# Switching the window only reruns this section, not the whole dashboard
+@st.fragment
+def form_section(selected_team):
+    st.subheader("Form")
+    window = st.radio("Window:", WINDOWS, format_func=lambda w: f"Last {w} matches", horizontal=True, key="form_window")
+    for title, chart in form_charts(team_frame(datasets.team_form(), selected_team), window):
+        st.markdown(f"**{title}**")
+        st.altair_chart(chart, use_container_width=True)
+
+    st.subheader("Form Table")
+    st.dataframe(datasets.form_table(window), use_container_width=True)
+
+
+form_section(selected_team)
+st.markdown("---")
+
+# Section: Squad Profile (every club aggregated once from the player table)
+st.subheader("Squad Profile")
+squads = datasets.squad_profiles()
+club = team_id(selected_team)
+summary = squads.club_summary(club)
+col1, col2, col3, col4, col5 = st.columns(5)
+col1.metric("Players Used", int(summary['Players']))
+col2.metric("Regulars (> 1500 min)", int(summary['Regulars']))
+col3.metric("Nationalities", int(summary['Nationalities']))
+col4.metric("Top 11 Share of Minutes", f"{summary['Top 11 Minutes %']}%")
+col5.metric("Top Scorer Share of Goals", f"{summary['Top Scorer Goals %']}%")
+
+col1, col2 = st.columns(2)
+with col1:
+    st.markdown("**Minutes Distribution**")
+    st.altair_chart(squad_minutes_chart(squads.view('minutes', club)), use_container_width=True)
+with col2:
+    st.markdown("**Top Contributors**")
+    st.dataframe(squads.view('contributors', club), hide_index=True, use_container_width=True)
+    st.markdown("**Nationality Mix**")
+    st.dataframe(squads.view('nationalities', club), hide_index=True, use_container_width=True)
+
+st.markdown("**Output by Position**")
+st.altair_chart(position_share_chart(squads.view('positions', club)), use_container_width=True)
+st.markdown("---")
+
+# Section: Most Memorable Performance (detected from every match, see analytics/memorable.py)
 st.subheader("Most Memorable Performance")
-mem_df = pd.read_csv("data/team_data/memorable_performances_2024_25.csv")
-row = mem_df[mem_df['team']==selected_team].iloc[0]
+matches = memorable_performances(datasets.memorable(), selected_team)
+row = matches.iloc[0]
 
 # Improved memory card layout
 st.markdown(f"""
@@ -169,53 +158,46 @@ st.markdown(f"""
   <div class='row'>
     <div class='col'>⚽️ <strong>Shots:</strong><span>{row['shots']} ({row['shots_on_target']} on target)</span></div>
     <div class='col'>🚫 <strong>Against:</strong><span>{row['shots_against']} ({row['shots_on_target_against']} on target)</span></div>
-    <div class='col'>📊 <strong>PPDA:</strong><span>{row['ppda']}</span></div>
-    <div class='col'>⚡ <strong>Opp PPDA:</strong><span>{row['ppda_against']}</span></div>
+    <div class='col'>⏱️ <strong>Half time:</strong><span>{row['ht_score']}</span></div>
+    <div class='col'>📊 <strong>xPTS:</strong><span>{row['xpts']}</span></div>
   </div>
 </div>
 """, unsafe_allow_html=True)
-
-# Initialize OpenRouter client for DeepSeek‑R1 (free tier)
-client = OpenAI(
-    api_key=api_key,
-    base_url="https://openrouter.ai/api/v1"
-)
+if len(matches) > 1:
+    st.markdown("**Also memorable:**")
+    for _, other in matches.iloc[1:].iterrows():
+        st.markdown(f"- {pd.to_datetime(other['date']).strftime('%d %b %Y')}: {other['description']}")
+
+# Section: Shot Map (images cached per team and filter)
+# Changing a filter only redraws the shot map, not the charts above it
+@st.fragment
+def shot_map_section(shot_table, club):
+    col1, col2 = st.columns(2)
+    side = col1.selectbox("Shots:", ["For", "Against"], key="shot_side")
+    situation = col2.selectbox("Situation:", list(SITUATIONS), key="shot_situation")
+    column = "TeamId" if side == "For" else "OpponentId"
+    st.caption(shot_summary(shot_table.rows(column, club, situation)))
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.image(datasets.shot_map(column, club, situation))
+
+
+st.subheader("Shot Map")
+shot_table = datasets.shots()
+if shot_table is None:
+    st.caption("No shot data yet: run data/scrape_memorable_matchs_data.py to fetch it.")
+else:
+    shot_map_section(shot_table, team_id(selected_team))
 
 # --- Build a simple metrics summary for the team ---
-metrics = [
-    ("Total Points", latest.TotalPoints),
-    ("League Position", latest.Position),
-    ("Goals For", latest.GoalsForCumulative),
-    ("Goals Against", latest.GoalsAgainstCumulative)
-]
-if hasattr(latest, "cum_xG"):
-    metrics.append(("xG (Total)", round(latest.cum_xG, 2)))
-if hasattr(latest, "cum_xGA"):
-    metrics.append(("xGA (Total)", round(latest.cum_xGA, 2)))
-
-metrics_block = "\n".join(f"{name}: {value}" for name, value in metrics)
+block = metrics_block(season_metrics(latest))
 
 st.markdown("---")
 st.subheader(f"{selected_team} AI-Powered Analysis")
-if st.button("📝 Generate Team Analysis"):
-    with st.spinner("Analyzing team performance…"):
-        messages = [
-            {"role": "system", "content": "You are an expert football analyst and scout."},
-            {"role": "user", "content": (
-                f"Here are the key season stats for {selected_team} in 2024‑25:\n\n"
-                f"{metrics_block}\n\n"
-                "Write a concise scouting report (3 paragraphs of 2-3 sentences) highlighting strengths, style of play, and areas to improve."
-            )}
-        ]
-        try:
-            resp = client.chat.completions.create(
-                model="deepseek/deepseek-r1:free",
-                messages=messages
-            )
-            report = resp.choices[0].message.content.strip()
-            st.write(report)
-        except Exception as e:
-            st.error(f"Failed to generate report: {e}")
+messages = prompts.team_analysis(selected_team, block)
+# Generated in the background (DeepSeek-R1 via OpenRouter) so the page stays usable;
+# the button only reruns this section
+report_section(messages, "📝 Generate Team Analysis", "Analyzing team performance…")
 
 
 # Footer
@@ -0,0 +1,34 @@
+"""
+Starts the app with its caches warmed in the background.
+
+Same as `streamlit run PL.py`, except that the shared datasets, the percentile
+matrix, the TOTS team and pitch, and the chart libraries are loaded on a
+background thread while the server starts (analytics/warmup.py), so the first
+visitor gets a warm page. Publish a snapshot first (`python -m analytics.store
+publish`) and the warm-up only memory-maps it instead of rebuilding from the CSVs.
+
+Usage:
+    python serve.py [streamlit run options, e.g. --server.port 8501]
+"""
+import os
+import sys
+
+from streamlit.web import cli
+
+from analytics import store, warmup
+
+
+def main():
+    published = store.current_version()
+    if published is None:
+        print('No snapshot published; warming up from the CSVs (python -m analytics.store publish)', file=sys.stderr)
+    elif published != store.snapshot_version():
+        print(f'Published snapshot {published} is older than the data or code; re-run python -m analytics.store publish',
+              file=sys.stderr)
+    warmup.start()
+    sys.argv = ['streamlit', 'run', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'PL.py'), *sys.argv[1:]]
+    return cli.main()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions endpoint.
+
+Answers POST .../chat/completions with a canned reply after an optional
+delay, and reports how many requests it received on GET /stats. Point the
+app at it with:
+
+    python tools/fake_llm_server.py --port 8001 --delay 2
+    LLM_BASE_URL=http://127.0.0.1:8001/v1 API_KEY=fake streamlit run PL.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    requests = 0
+    lock = threading.Lock()
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._send(200, {'requests': type(self).requests})
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send(404, {'error': 'not found'})
+            return
+        with type(self).lock:
+            type(self).requests += 1
+        time.sleep(self.delay)
+
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        reply = f"Fake analysis ({len(prompt)} prompt characters)."
+        self._send(200, {
+            'id': f'chatcmpl-fake-{type(self).requests}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'fake'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': reply},
+                'finish_reason': 'stop',
+            }],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+        })
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port=8001, delay=0.0):
+    """Starts the server in a background thread and returns it."""
+    handler = type('Handler', (FakeLLMHandler,), {'delay': delay, 'requests': 0, 'lock': threading.Lock()})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--delay', type=float, default=0.0, help='seconds to wait before answering')
+    args = parser.parse_args()
+
+    server = serve(args.port, args.delay)
+    print(f'Fake LLM endpoint on http://127.0.0.1:{server.server_port}/v1')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Minimal headless client for a running Streamlit server.
+
+Speaks the same websocket protocol as the browser (BackMsg / ForwardMsg
+protobufs on /_stcore/stream), so reruns measured with it include
+everything the server does for a real user: script execution, widget
+handling, fragment reruns and message serialisation. Used by the
+interaction benchmark and the load-testing harness.
+
+    session = StreamlitSession('http://127.0.0.1:8501')
+    session.open_page('Team_Dashboard')
+    session.select('Select a Premier League Team (2024-25):', 'Chelsea')
+    session.click('📝 Generate Team Analysis')   # fragment rerun if inside one
+    print(session.last_run.seconds)
+"""
+import time
+import urllib.request
+from collections import Counter
+from dataclasses import dataclass, field
+
+from websockets.sync.client import connect
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+# Element types whose state is kept between reruns, and the WidgetState field they use
+_STATEFUL = {
+    'selectbox': 'string_value',
+    'multiselect': 'string_array_value',
+    'radio': 'string_value',
+    'text_input': 'string_value',
+    'checkbox': 'bool_value',
+}
+
+
+@dataclass
+class Widget:
+    id: str
+    kind: str
+    label: str
+    fragment_id: str = ''
+    options: list = field(default_factory=list)
+
+
+@dataclass
+class RunResult:
+    seconds: float
+    status: str
+    fragment_id: str = ''
+    messages: int = 0
+    bytes: int = 0
+    exceptions: list = field(default_factory=list)
+    element_bytes: Counter = field(default_factory=Counter)   # wire bytes per element type
+
+
+def wait_until_healthy(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(base_url.rstrip('/') + '/_stcore/health', timeout=2) as r:
+                if r.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f'Streamlit server at {base_url} did not become healthy')
+
+
+class StreamlitSession:
+    """One simulated browser tab."""
+
+    def __init__(self, base_url='http://127.0.0.1:8501', timeout=120):
+        ws_url = base_url.replace('http://', 'ws://').replace('https://', 'wss://').rstrip('/')
+        self.timeout = timeout
+        self._conn = connect(ws_url + '/_stcore/stream', max_size=None, open_timeout=timeout)
+        self._ws = self._conn.__enter__()
+        self.pages = {}
+        self.page_hash = ''
+        self.widgets = {}
+        self._state = {}
+        self.last_run = None
+        self.history = []
+
+    def close(self):
+        self._conn.__exit__(None, None, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- reruns ---------------------------------------------------------
+
+    def rerun(self, triggers=(), fragment_id=''):
+        """Sends one rerun request and waits until the server reports it finished."""
+        msg = BackMsg()
+        cs = msg.rerun_script
+        cs.query_string = ''
+        cs.page_script_hash = self.page_hash
+        if fragment_id:
+            cs.fragment_id = fragment_id
+        states = list(self._state.values()) + list(triggers)
+        cs.widget_states.widgets.extend(states)
+
+        started = time.perf_counter()
+        self._ws.send(msg.SerializeToString())
+        result = self._receive(started, fragment_id)
+        self.last_run = result
+        self.history.append(result)
+        return result
+
+    def _receive(self, started, fragment_id):
+        n_msgs = n_bytes = 0
+        exceptions = []
+        element_bytes = Counter()
+        if not fragment_id:
+            self.widgets = {}
+        while True:
+            raw = self._ws.recv(timeout=self.timeout)
+            n_msgs += 1
+            n_bytes += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof('type')
+
+            if kind in ('new_session', 'navigation'):
+                self._record_pages(getattr(fwd, kind).app_pages)
+            elif kind == 'delta':
+                self._record_delta(fwd.delta, exceptions)
+                if fwd.delta.WhichOneof('type') == 'new_element':
+                    element_bytes[fwd.delta.new_element.WhichOneof('type')] += len(raw)
+            elif kind == 'script_finished':
+                status = ForwardMsg.ScriptFinishedStatus.Name(fwd.script_finished)
+                if status == 'FINISHED_EARLY_FOR_RERUN':
+                    continue
+                return RunResult(time.perf_counter() - started, status, fragment_id,
+                                 n_msgs, n_bytes, exceptions, element_bytes)
+
+    def _record_pages(self, app_pages):
+        for page in app_pages:
+            name = page.url_pathname or page.page_name
+            if name:
+                self.pages[name] = page.page_script_hash
+            if page.is_default and not self.page_hash:
+                self.page_hash = page.page_script_hash
+
+    def _record_delta(self, delta, exceptions):
+        if delta.WhichOneof('type') != 'new_element':
+            return
+        element = delta.new_element
+        kind = element.WhichOneof('type')
+        if kind == 'exception':
+            exceptions.append(element.exception.message)
+            return
+        proto = getattr(element, kind)
+        # Widgets are the elements with an id and a label (charts have ids too)
+        if not getattr(proto, 'id', '') or not hasattr(proto, 'label'):
+            return
+        options = list(getattr(proto, 'options', [])) if kind in _STATEFUL else []
+        self.widgets[proto.label] = Widget(proto.id, kind, proto.label, delta.fragment_id, options)
+
+    # -- user actions ---------------------------------------------------
+
+    def open_page(self, name=''):
+        """Loads the app (first call) and switches to page `name`."""
+        if not self.pages:
+            self.rerun()
+        if name:
+            try:
+                self.page_hash = self.pages[name]
+            except KeyError:
+                raise KeyError(f'Unknown page {name!r}; known: {sorted(self.pages)}') from None
+            self._state = {}
+            return self.rerun()
+        return self.last_run
+
+    def _widget(self, label):
+        try:
+            return self.widgets[label]
+        except KeyError:
+            raise KeyError(f'No widget labelled {label!r}; have: {sorted(self.widgets)}') from None
+
+    def select(self, label, value, fragment_id=None):
+        """
+        Changes a selectbox/radio/multiselect/text input/checkbox and reruns,
+        scoped to the widget's fragment unless `fragment_id` says otherwise
+        ('' forces a full-page rerun).
+        """
+        w = self._widget(label)
+        state = WidgetState(id=w.id)
+        value_field = _STATEFUL[w.kind]
+        if value_field == 'string_array_value':
+            state.string_array_value.data.extend(value)
+        else:
+            setattr(state, value_field, value)
+        self._state[w.id] = state
+        return self.rerun(fragment_id=w.fragment_id if fragment_id is None else fragment_id)
+
+    def click(self, label, fragment_id=None):
+        """Presses a button; only its fragment reruns if it lives in one."""
+        w = self._widget(label)
+        return self.rerun([WidgetState(id=w.id, trigger_value=True)],
+                          fragment_id=w.fragment_id if fragment_id is None else fragment_id)